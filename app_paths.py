@@ -0,0 +1,19 @@
+import os
+
+
+APP_NAME = "translator_app"
+
+
+def cache_dir():
+    """Return the per-user cache directory for the app, creating it if needed"""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    path = os.path.join(base, APP_NAME)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def cache_path(filename):
+    """Return the full path of a file inside the app cache directory"""
+    return os.path.join(cache_dir(), filename)
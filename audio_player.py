@@ -0,0 +1,251 @@
+import io
+import queue
+import threading
+import time
+
+from lazy_imports import LazyModule
+from metrics import METRICS
+
+pygame = LazyModule("pygame")
+
+
+class PygameOutput:
+    """One reserved mixer channel, with the next clip queued on it.
+
+    Only the mixer is used: no display or event subsystem, so nothing here
+    needs the main thread and the process environment is left alone.
+    """
+
+    def __init__(self, frequency=22050, buffer=1024):
+        self.frequency = frequency
+        # Smaller than the old 4096 so a stop is heard at once
+        self.buffer = buffer
+        self.channel = None
+
+    def open(self):
+        if not pygame.mixer.get_init():
+            pygame.mixer.init(
+                frequency=self.frequency, size=-16, channels=2, buffer=self.buffer
+            )
+        pygame.mixer.set_reserved(1)
+        self.channel = pygame.mixer.Channel(0)
+
+    def decode(self, data):
+        return pygame.mixer.Sound(file=io.BytesIO(data))
+
+    def length(self, sound):
+        return sound.get_length()
+
+    def play(self, sound):
+        self.channel.play(sound)
+
+    def queue(self, sound):
+        """Start sound the moment the playing one ends, with no gap"""
+        self.channel.queue(sound)
+
+    def playing(self):
+        """The sound now playing, or None"""
+        return self.channel.get_sound()
+
+    def stop(self):
+        self.channel.stop()
+
+    def close(self):
+        if self.channel is not None:
+            self.channel.stop()
+
+
+class Clip:
+    """Encoded audio waiting in the player, and who to tell about it"""
+
+    def __init__(self, data, tag=None, on_start=None, on_end=None):
+        self.data = data
+        self.tag = tag
+        self.on_start = on_start
+        self.on_end = on_end
+        self.sound = None  # decoded ahead of playback
+        self.length = None
+        self.started = None
+
+
+class AudioPlayer:
+    """Plays encoded clips (MP3, WAV, OGG) from memory on a single thread.
+
+    ``play``, ``enqueue`` and ``stop`` only queue a command and wake the
+    player thread, so they return at once from any thread. Clips are
+    decoded as soon as they are enqueued; while one plays, the next one is
+    already queued on the mixer channel and starts without a gap. The thread
+    sleeps on the command queue until a command arrives or the playing clip
+    is due to end (its decoded length is known), then re-checks every 5 ms
+    until the mixer reports the clip finished.
+    ``on_start(clip)`` and ``on_end(completed)`` run on the player thread;
+    ``completed`` is False for clips that were stopped or failed to decode.
+    The output is opened on first use, keeping audio out of startup.
+    """
+
+    def __init__(self, output=None, on_error=None):
+        self.output = output or PygameOutput()
+        self.on_error = on_error or (lambda e: print(f"Audio error: {e}"))
+        self._commands = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._closed = False
+
+        # Owned by the player thread
+        self._playlist = []
+        self._current = None
+        self._next = None  # handed to output.queue
+
+        self.played = 0
+        self.stopped = 0
+        self.gapless = 0
+        self.decode_seconds = 0.0
+
+    # ----------------------- COMMANDS -----------------------
+    def play(self, data, tag=None, on_start=None, on_end=None):
+        """Stop everything and play data"""
+        clip = Clip(data, tag, on_start, on_end)
+        self._send("play", clip)
+        return clip
+
+    def enqueue(self, data, tag=None, on_start=None, on_end=None):
+        """Play data after the clips already queued"""
+        clip = Clip(data, tag, on_start, on_end)
+        self._send("enqueue", clip)
+        return clip
+
+    def stop(self, tag=None):
+        """Stop and drop the clips with this tag, or all clips"""
+        self._send("stop", tag)
+
+    def close(self):
+        with self._lock:
+            if self._thread is None or self._closed:
+                self._closed = True
+                return
+            self._closed = True
+        self._commands.put(("close", None))
+        self._thread.join(timeout=2)
+
+    def _send(self, command, argument):
+        with self._lock:
+            if self._closed:
+                return
+            if self._thread is None:
+                self.output.open()
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        self._commands.put((command, argument))
+
+    # ----------------------- PLAYER THREAD -----------------------
+    def _run(self):
+        while True:
+            try:
+                try:
+                    command, argument = self._commands.get(timeout=self._time_left())
+                except queue.Empty:
+                    command = None
+                self._collect_ended()
+                if command == "close":
+                    self._drop(None)
+                    self.output.close()
+                    return
+                if command is not None:
+                    getattr(self, "_" + command)(argument)
+            except Exception as e:
+                self.on_error(e)
+
+    def _time_left(self):
+        """Seconds until the playing clip should end; None when idle"""
+        if self._current is None:
+            return None
+        left = self._current.started + self._current.length - time.perf_counter()
+        # Woken a little early: look again shortly
+        return max(left, 0.005)
+
+    def _play(self, clip):
+        self._drop(None)
+        self._enqueue(clip)
+
+    def _enqueue(self, clip):
+        start = time.perf_counter()
+        try:
+            with METRICS.span("audio.decode"):
+                clip.sound = self.output.decode(clip.data)
+            clip.length = self.output.length(clip.sound)
+        except Exception as e:
+            self._finish(clip, False)
+            self.on_error(e)
+            return
+        finally:
+            self.decode_seconds += time.perf_counter() - start
+        clip.data = None  # the decoded sound is all that is needed now
+        self._playlist.append(clip)
+        self._advance()
+
+    def _stop(self, tag):
+        self._drop(tag)
+        self._advance()
+
+    def _drop(self, tag):
+        """Stop and finish every clip with tag (all clips for None)"""
+
+        def matches(clip):
+            return tag is None or clip.tag == tag
+
+        dropped = [clip for clip in self._playlist if matches(clip)]
+        self._playlist = [clip for clip in self._playlist if not matches(clip)]
+        on_channel = [c for c in (self._current, self._next) if c is not None]
+        if any(matches(clip) for clip in on_channel):
+            self.output.stop()
+            self._current = self._next = None
+            dropped += [clip for clip in on_channel if matches(clip)]
+            # The channel is cleared as a whole; clips of other tags on it
+            # go back to the front of the playlist
+            self._playlist[:0] = [clip for clip in on_channel if not matches(clip)]
+        if dropped:
+            self.stopped += len(dropped)
+        for clip in dropped:
+            self._finish(clip, False)
+
+    def _advance(self):
+        if self._current is None and self._playlist:
+            self._current = self._playlist.pop(0)
+            self.output.play(self._current.sound)
+            self._started(self._current)
+        if self._current is not None and self._next is None and self._playlist:
+            self._next = self._playlist.pop(0)
+            self.output.queue(self._next.sound)
+
+    def _collect_ended(self):
+        """Finish clips the channel has moved past"""
+        while self._current is not None and (
+            self.output.playing() is not self._current.sound
+        ):
+            ended = self._current
+            self._finish(ended, True)
+            self.played += 1
+            self._current, self._next = self._next, None
+            if self._current is not None:
+                # Already started by the channel queue when the last one ended
+                self.gapless += 1
+                self._started(self._current, ended.started + ended.length)
+            self._advance()
+
+    def _started(self, clip, at=None):
+        clip.started = time.perf_counter() if at is None else at
+        if clip.on_start is not None:
+            clip.on_start(clip)
+
+    def _finish(self, clip, completed):
+        clip.sound = None
+        if clip.on_end is not None:
+            clip.on_end(completed)
+
+    def stats(self):
+        return {
+            "played": self.played,
+            "stopped": self.stopped,
+            "gapless_starts": self.gapless,
+            "decode_seconds": self.decode_seconds,
+        }
@@ -0,0 +1,339 @@
+"""Headless batch translation of TXT, CSV and JSONL files.
+
+Records are streamed from the input, translated on a bounded thread pool and
+written back in input order, so memory stays constant however large the file
+is. Progress is checkpointed next to the output; rerunning the same command
+after an interruption resumes where it stopped.
+
+    python batch_translate.py input.txt --to Hindi
+    python batch_translate.py data.csv --to French --column text
+    python batch_translate.py data.jsonl --from English --to German --field text
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import languages
+from translation_service import TranslationService
+
+FORMATS = ("txt", "csv", "jsonl")
+
+
+# ----------------------- LANGUAGES -----------------------
+def resolve_language(catalog, value, allow_auto=False):
+    """Resolve a language name (or code) to its code, or exit with an error"""
+    code = catalog.code(value)
+    if code is None or (code == "auto" and not allow_auto):
+        sys.exit(f"Unsupported language: {value}")
+    return code
+
+
+def load_catalog():
+    try:
+        return languages.LanguageCatalog(languages.load_languages())
+    except Exception as e:
+        print(
+            f"Could not fetch supported languages ({e}), using fallback",
+            file=sys.stderr,
+        )
+        return languages.load_cached_catalog() or languages.fallback_catalog()
+
+
+# ----------------------- RECORD FORMATS -----------------------
+class TextFormat:
+    """One record per line; blank lines are passed through untouched"""
+
+    has_header = False
+
+    def __init__(self, args):
+        pass
+
+    def records(self, f):
+        for line in f:
+            yield line, line.rstrip("\r\n")
+
+    def render(self, record, translation):
+        ending = record[len(record.rstrip("\r\n")) :]
+        return translation + ending
+
+
+class CsvFormat:
+    """Translate one column and append the result as a new column"""
+
+    has_header = True
+
+    def __init__(self, args):
+        self.column = args.column
+        self.output_column = args.output_field
+        self.index = None
+
+    def header(self, f):
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return None, reader
+        if self.column not in header:
+            sys.exit(f"Column '{self.column}' not found in CSV header")
+        self.index = header.index(self.column)
+        return self._row(header + [self.output_column]), reader
+
+    def records(self, reader):
+        for row in reader:
+            text = row[self.index] if self.index < len(row) else ""
+            yield row, text
+
+    def render(self, record, translation):
+        return self._row(record + [translation])
+
+    @staticmethod
+    def _row(row):
+        out = io.StringIO()
+        csv.writer(out).writerow(row)
+        return out.getvalue()
+
+
+class JsonlFormat:
+    """Translate one field of each JSON object and store it in another"""
+
+    has_header = False
+
+    def __init__(self, args):
+        self.field = args.field
+        self.output_field = args.output_field
+
+    def records(self, f):
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            yield record, str(record.get(self.field) or "")
+
+    def render(self, record, translation):
+        record[self.output_field] = translation
+        return json.dumps(record, ensure_ascii=False) + "\n"
+
+
+FORMAT_CLASSES = {"txt": TextFormat, "csv": CsvFormat, "jsonl": JsonlFormat}
+
+
+# ----------------------- CHECKPOINTS -----------------------
+def load_checkpoint(path, args):
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError):
+        return None
+    # Only resume the exact same job
+    if checkpoint.get("job") != job_signature(args):
+        return None
+    return checkpoint
+
+
+def save_checkpoint(path, args, records, offset):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"job": job_signature(args), "records": records, "offset": offset}, f)
+    os.replace(tmp, path)
+
+
+def job_signature(args):
+    return {
+        "input": os.path.abspath(args.input),
+        "source": args.source,
+        "target": args.target,
+        "format": args.format,
+        "column": args.column,
+        "field": args.field,
+    }
+
+
+# ----------------------- PROGRESS -----------------------
+class Throughput:
+    """Track records/s and chars/s and print them periodically"""
+
+    def __init__(self, interval=2.0, stream=sys.stderr, unit="records"):
+        self.interval = interval
+        self.unit = unit
+        self.stream = stream
+        self.start = time.perf_counter()
+        self.last_report = self.start
+        self.records = 0
+        self.chars = 0
+        self.errors = 0
+
+    def add(self, chars):
+        self.records += 1
+        self.chars += chars
+        now = time.perf_counter()
+        if now - self.last_report >= self.interval:
+            self.last_report = now
+            self.report()
+
+    def report(self, final=False):
+        elapsed = max(time.perf_counter() - self.start, 1e-9)
+        label = "done" if final else "progress"
+        print(
+            f"[{label}] {self.records} {self.unit}, {self.chars} chars, "
+            f"{self.errors} errors in {elapsed:.1f}s: "
+            f"{self.records / elapsed:.1f} {self.unit}/s, "
+            f"{self.chars / elapsed:.0f} chars/s",
+            file=self.stream,
+        )
+
+
+# ----------------------- MAIN LOOP -----------------------
+def run(args, translate):
+    """Stream args.input through translate(text) into args.output"""
+    fmt = FORMAT_CLASSES[args.format](args)
+    checkpoint_path = args.checkpoint or args.output + ".checkpoint"
+    checkpoint = None if args.restart else load_checkpoint(checkpoint_path, args)
+    if checkpoint and not (
+        os.path.exists(args.output)
+        and os.path.getsize(args.output) >= checkpoint["offset"]
+    ):
+        print(
+            "Output is missing or shorter than the checkpoint; starting over",
+            file=sys.stderr,
+        )
+        checkpoint = None
+    done = checkpoint["records"] if checkpoint else 0
+
+    out = open(args.output, "r+b" if checkpoint else "wb")
+    if checkpoint:
+        # Drop anything written after the last checkpoint
+        out.seek(checkpoint["offset"])
+        out.truncate()
+        print(f"Resuming after {done} records", file=sys.stderr)
+
+    progress = Throughput()
+    window = deque()
+    last_checkpoint = time.monotonic()
+
+    def translate_record(text):
+        if not text.strip():
+            return text, False
+        try:
+            return translate(text), False
+        except Exception as e:
+            # Keep the original so the record is never silently blanked
+            print(f"Translation error: {e}", file=sys.stderr)
+            return text, True
+
+    def write_next():
+        nonlocal done, last_checkpoint
+        record, text, future = window.popleft()
+        translation, failed = future.result()
+        out.write(fmt.render(record, translation).encode("utf-8"))
+        done += 1
+        progress.errors += failed
+        progress.add(len(text))
+        if time.monotonic() - last_checkpoint >= args.checkpoint_interval:
+            out.flush()
+            save_checkpoint(checkpoint_path, args, done, out.tell())
+            last_checkpoint = time.monotonic()
+
+    with open(args.input, encoding="utf-8", newline="") as f:
+        source = f
+        if fmt.has_header:
+            header, source = fmt.header(f)
+            if header is not None and not checkpoint:
+                out.write(header.encode("utf-8"))
+
+        with ThreadPoolExecutor(max_workers=args.workers) as pool:
+            for index, (record, text) in enumerate(fmt.records(source)):
+                if index < done:
+                    continue
+                window.append((record, text, pool.submit(translate_record, text)))
+                # Keep a bounded number of records in flight
+                if len(window) >= args.workers * 4:
+                    write_next()
+            while window:
+                write_next()
+
+    out.close()
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    progress.report(final=True)
+    return progress
+
+
+def default_output(path, target_code):
+    stem, ext = os.path.splitext(path)
+    return f"{stem}.{target_code}{ext}"
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Translate TXT, CSV or JSONL files without the GUI"
+    )
+    parser.add_argument("input", help="file to translate")
+    parser.add_argument(
+        "-o", "--output", help="output file (default: <input>.<code>.<ext>)"
+    )
+    parser.add_argument(
+        "--from", dest="source", default="Auto", help="source language (default: Auto)"
+    )
+    parser.add_argument(
+        "--to", dest="target", required=True, help="target language name or code"
+    )
+    parser.add_argument(
+        "--format", choices=FORMATS, help="input format (default: from extension)"
+    )
+    parser.add_argument("--column", default="text", help="CSV column to translate")
+    parser.add_argument("--field", default="text", help="JSONL field to translate")
+    parser.add_argument(
+        "--output-field",
+        default="translation",
+        help="CSV column / JSONL field for the result",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=4, help="concurrent upstream requests"
+    )
+    parser.add_argument(
+        "--checkpoint", help="checkpoint file (default: <output>.checkpoint)"
+    )
+    parser.add_argument(
+        "--checkpoint-interval",
+        type=float,
+        default=1.0,
+        help="seconds between checkpoints",
+    )
+    parser.add_argument(
+        "--restart", action="store_true", help="ignore any existing checkpoint"
+    )
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.format is None:
+        ext = os.path.splitext(args.input)[1].lower().lstrip(".")
+        args.format = ext if ext in FORMATS else "txt"
+
+    catalog = load_catalog()
+    source_code = resolve_language(catalog, args.source, allow_auto=True)
+    target_code = resolve_language(catalog, args.target)
+    args.output = args.output or default_output(args.input, target_code)
+
+    service = TranslationService()
+    try:
+        run(args, lambda text: service.translate(text, source_code, target_code))
+    except KeyboardInterrupt:
+        print("Interrupted; rerun the same command to resume", file=sys.stderr)
+        return 130
+    finally:
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""Start, gap and stop latency of the old and new speech playback paths.
+
+The old path writes each clip to a temp file, sleeps 0.1 s, loads it with
+pygame.mixer.music and polls get_busy() every 0.1 s. The new one is
+AudioPlayer: clips decoded from memory, the next one queued on the mixer
+channel, and one timed wake-up per clip instead of polling. Clips are generated
+WAV tones and SDL's dummy audio driver is used unless SDL_AUDIODRIVER is
+set, so no sound card is needed.
+Usage: python benchmarks/bench_audio_player.py [--clips 6] [--seconds 0.4] [--stops 8]
+"""
+
+import argparse
+import io
+import math
+import os
+import struct
+import sys
+import tempfile
+import threading
+import time
+import wave
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from audio_player import AudioPlayer, pygame  # noqa: E402
+
+RATE = 22050
+
+
+def tone(seconds, frequency=440):
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(RATE)
+        f.writeframes(
+            b"".join(
+                struct.pack(
+                    "<h", int(8000 * math.sin(2 * math.pi * frequency * i / RATE))
+                )
+                for i in range(int(RATE * seconds))
+            )
+        )
+    return buffer.getvalue()
+
+
+def ms(seconds):
+    return f"{seconds * 1000:7.1f} ms"
+
+
+# ----------------------- OLD PATH -----------------------
+def old_speak(clips, stop, starts, stopped_at=None):
+    """The previous playback loop, one clip at a time"""
+    for data in clips:
+        if stop.is_set():
+            return
+        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
+            f.write(data)
+        time.sleep(0.1)  # "ensure the file is written"
+        pygame.mixer.music.load(f.name)
+        pygame.mixer.music.play()
+        starts.append(time.perf_counter())
+        while pygame.mixer.music.get_busy() and not stop.is_set():
+            time.sleep(0.1)
+        if stop.is_set():
+            pygame.mixer.music.stop()
+            if stopped_at is not None:
+                stopped_at.append(time.perf_counter())
+        pygame.mixer.music.unload()
+        os.remove(f.name)
+
+
+def bench_old(clips, seconds, stops):
+    stop, starts = threading.Event(), []
+    requested = time.perf_counter()
+    old_speak(clips, stop, starts)
+    gaps = [b - a - seconds for a, b in zip(starts, starts[1:])]
+
+    latencies = []
+    for trial in range(stops):
+        stop, trial_starts, stopped_at = threading.Event(), [], []
+        thread = threading.Thread(
+            target=old_speak, args=(clips, stop, trial_starts, stopped_at)
+        )
+        thread.start()
+        while not trial_starts:
+            time.sleep(0.001)
+        time.sleep(seconds * (trial + 1) / (stops + 1))
+        stopped = time.perf_counter()
+        # Playback ends when the polling loop notices
+        stop.set()
+        thread.join()
+        latencies.append(stopped_at[0] - stopped)
+    return starts[0] - requested, gaps, latencies
+
+
+# ----------------------- NEW PATH -----------------------
+def bench_new(clips, seconds, stops):
+    player = AudioPlayer()
+    starts, done = [], threading.Event()
+
+    def on_start(clip):
+        starts.append(time.perf_counter())
+
+    def on_end(completed):
+        if len(starts) == len(clips):
+            done.set()
+
+    requested = time.perf_counter()
+    for data in clips:
+        player.enqueue(data, on_start=on_start, on_end=on_end)
+    done.wait()
+    # Start times are when the player noticed; the audio itself has no gap
+    gaps = [b - a - seconds for a, b in zip(starts, starts[1:])]
+
+    latencies = []
+    for trial in range(stops):
+        started, stopped_at = threading.Event(), []
+
+        def on_stopped(completed):
+            if not completed and not stopped_at:
+                stopped_at.append(time.perf_counter())
+
+        for data in clips:
+            player.enqueue(data, on_start=lambda clip: started.set(), on_end=on_stopped)
+        started.wait()
+        time.sleep(seconds * (trial + 1) / (stops + 1))
+        stopped = time.perf_counter()
+        player.stop()
+        while not stopped_at:
+            time.sleep(0.0005)
+        latencies.append(stopped_at[0] - stopped)
+    stats = player.stats()
+    player.close()
+    return starts[0] - requested, gaps, latencies, stats
+
+
+def report(label, first, gaps, latencies):
+    print(
+        f"{label}  first audio {ms(first)}, "
+        f"gap between clips {ms(sum(gaps) / len(gaps))} (max {ms(max(gaps))}), "
+        f"stop {ms(sum(latencies) / len(latencies))} (max {ms(max(latencies))})"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clips", type=int, default=6)
+    parser.add_argument(
+        "--seconds", type=float, default=0.4, help="length of each clip"
+    )
+    parser.add_argument("--stops", type=int, default=8, help="stop trials")
+    args = parser.parse_args()
+
+    clips = [tone(args.seconds, 330 + 55 * i) for i in range(args.clips)]
+    pygame.mixer.init(frequency=RATE, size=-16, channels=2, buffer=1024)
+
+    report("old", *bench_old(clips, args.seconds, args.stops))
+    *results, stats = bench_new(clips, args.seconds, args.stops)
+    report("new", *results)
+    print(f"     {stats['gapless_starts']} clips started from the channel queue")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Upstream calls under bursty load with and without the request coalescer.
+
+A stub upstream with fixed latency translates each line; bursts of
+concurrent callers translate short strings drawn from a small vocabulary,
+so both identical in-flight requests and distinct short ones occur.
+Usage: python benchmarks/bench_coalescer.py [requests] [threads] [latency_ms]
+"""
+
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from request_coalescer import RequestCoalescer  # noqa: E402
+
+
+class StubUpstream:
+    def __init__(self, latency):
+        self.latency = latency
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def translate(self, text, source_code, target_code):
+        with self.lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        return "\n".join(line[::-1] for line in text.split("\n"))
+
+
+def run(label, translate, upstream, texts, threads):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(lambda t: translate(t, "en", "hi"), texts))
+    elapsed = time.perf_counter() - start
+    assert results == [t[::-1] for t in texts], "results were mixed up"
+    print(
+        f"{label:<10} {len(texts)} requests in {elapsed:6.3f}s, "
+        f"{upstream.calls:4d} upstream calls "
+        f"({upstream.calls / elapsed:7.1f} calls/s)"
+    )
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    latency = (float(sys.argv[3]) if len(sys.argv) > 3 else 30) / 1000
+
+    rng = random.Random(42)
+    vocabulary = [f"short phrase number {i}" for i in range(count // 4)]
+    texts = [rng.choice(vocabulary) for _ in range(count)]
+
+    upstream = StubUpstream(latency)
+    run("direct", upstream.translate, upstream, texts, threads)
+
+    upstream = StubUpstream(latency)
+    coalescer = RequestCoalescer(upstream.translate)
+    run("coalesced", coalescer.translate, upstream, texts, threads)
+    print(f"coalescer stats: {coalescer.stats()}")
+
+
+if __name__ == "__main__":
+    main()
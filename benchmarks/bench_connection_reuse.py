@@ -0,0 +1,87 @@
+"""Compare per-call GoogleTranslator clients with the pooled, keep-alive ones.
+
+Runs against a local stand-in for the Google endpoint, so no network access
+is needed. Usage: python benchmarks/bench_connection_reuse.py [requests]
+"""
+
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import requests  # noqa: E402
+import deep_translator.google as google_module  # noqa: E402
+from deep_translator import GoogleTranslator  # noqa: E402
+
+from translator_pool import TranslatorPool  # noqa: E402
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with StandInHandler.lock:
+            StandInHandler.connections += 1
+
+    def do_GET(self):
+        body = b'<html><div class="t0">translated</div></html>'
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def run(label, translate, count):
+    StandInHandler.connections = 0
+    start = time.perf_counter()
+    for i in range(count):
+        translate(f"hello {i}")
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:<10} {count} requests in {elapsed:.3f}s "
+        f"({elapsed / count * 1000:.2f} ms/req), "
+        f"{StandInHandler.connections} TCP connections"
+    )
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/m"
+
+    def fresh(text):
+        client = GoogleTranslator(source="en", target="hi")
+        client._base_url = base_url
+        return client.translate(text)
+
+    google_module.requests = requests
+    run("per-call", fresh, count)
+
+    pool = TranslatorPool()
+
+    def pooled(text):
+        with pool.client("en", "hi") as client:
+            client._base_url = base_url
+            return client.translate(text)
+
+    run("pooled", pooled, count)
+    print(f"pool stats: {pool.stats()}")
+
+    pool.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Throughput and UI-side latency of the async TranslationEngine.
+
+Runs a stub translation service (fixed upstream latency) through the engine
+and drains results with a TkBridge on a fake main loop, so no display or
+network is needed.
+Usage: python benchmarks/bench_engine.py [requests] [latency_ms]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from tk_bridge import TkBridge  # noqa: E402
+from translation_engine import TranslationEngine  # noqa: E402
+
+
+class StubService:
+    def __init__(self, latency):
+        self.latency = latency
+
+    def translate(self, text, source_code, target_code, on_progress=None):
+        time.sleep(self.latency)
+        return text[::-1]
+
+    def detect(self, text):
+        time.sleep(self.latency / 2)
+        return "en"
+
+
+class FakeRoot:
+    """Minimal stand-in for Tk: runs ``after`` callbacks from a loop"""
+
+    def __init__(self):
+        self._timers = []
+
+    def after(self, delay_ms, callback, *args):
+        self._timers.append((time.perf_counter() + delay_ms / 1000, callback, args))
+
+    def run_until(self, done):
+        while not done():
+            self._timers.sort(key=lambda t: t[0])
+            due, callback, args = self._timers.pop(0)
+            time.sleep(max(0.0, due - time.perf_counter()))
+            callback(*args)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 20) / 1000
+
+    for limit in (1, 4, 8):
+        engine = TranslationEngine(
+            StubService(latency), limits={"translate": limit}, max_workers=8
+        )
+        root = FakeRoot()
+        bridge = TkBridge(root)
+        received = []
+
+        start = time.perf_counter()
+        for i in range(count):
+            submitted = time.perf_counter()
+            future = engine.submit(engine.translate(f"text {i}", "en", "fr"))
+            bridge.deliver(
+                future,
+                lambda result, t=submitted: received.append(time.perf_counter() - t),
+            )
+        root.run_until(lambda: len(received) == count)
+        elapsed = time.perf_counter() - start
+
+        received.sort()
+        print(
+            f"translate limit {limit}: {count / elapsed:7.1f} req/s, "
+            f"p50 {received[len(received) // 2] * 1000:7.1f} ms, "
+            f"max {received[-1] * 1000:7.1f} ms"
+        )
+        bridge.stop()
+        engine.close()
+
+    # Cancelling a queued job must not run it
+    engine = TranslationEngine(StubService(latency), limits={"translate": 1})
+    futures = [engine.submit(engine.translate("x", "en", "fr")) for _ in range(10)]
+    for future in futures[1:]:
+        future.cancel()
+    futures[0].result()
+    time.sleep(latency * 2)
+    print(f"cancelled {engine.stats()['cancelled']['translate']} of 9 queued jobs")
+    engine.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Translation history search on a large synthetic history.
+
+Appends generated records (300k by default), then reopens the history the
+way the app does at startup and times searches for a common word, a rare
+word, several words at once and a typed prefix, newest 100 results each.
+Reports append rate, reopen time, search latency and resident memory,
+which stays small because the files are read through mmap.
+Usage: python benchmarks/bench_history.py [--records 300000] [--queries 200]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from history import TranslationHistory  # noqa: E402
+
+SYLLABLES = "ka re mo ti lu sa ve no pa di ro me tu la ni fo be sh an er".split()
+
+
+def memory_mb():
+    """(resident, anonymous) MB from /proc (Linux); None elsewhere.
+
+    Resident memory includes mapped file pages, which the OS can drop at
+    any time; anonymous memory is what the process itself holds.
+    """
+    fields = {}
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                fields[name] = value.split()[0] if value.split() else "0"
+    except OSError:
+        return None
+    return int(fields["VmRSS"]) / 1024, int(fields["RssAnon"]) / 1024
+
+
+def vocabulary(rng, size=5000):
+    """Pseudo-words with a Zipf-like frequency, like the words of real text"""
+    words = sorted(
+        {
+            "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 4)))
+            for _ in range(size * 2)
+        }
+    )[:size]
+    rng.shuffle(words)
+    weights = [1 / (rank + 1) for rank in range(len(words))]
+    return words, weights
+
+
+def sentence(rng, vocab):
+    return " ".join(rng.choices(*vocab, k=rng.randint(6, 14))).capitalize() + "."
+
+
+def summary(samples):
+    samples = sorted(samples)
+    return (
+        f"p50 {samples[len(samples) // 2] * 1000:7.2f} ms, "
+        f"p99 {samples[int(len(samples) * 0.99)] * 1000:7.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=300000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    vocab = vocabulary(rng)
+    words = vocab[0]
+    with tempfile.TemporaryDirectory() as tmp:
+        history = TranslationHistory(tmp)
+        start = time.perf_counter()
+        for i in range(args.records):
+            text = sentence(rng, vocab)
+            history.append("en", "fr", text, f"[fr] {text}", timestamp=i)
+        appended = time.perf_counter() - start
+        history.close()
+        stats = history.stats()
+        print(
+            f"appended {args.records} records in {appended:.1f}s "
+            f"({args.records / appended:.0f}/s), "
+            f"{(stats['log_bytes'] + stats['search_bytes']) / 1e6:.0f} MB on disk"
+        )
+
+        before = memory_mb()
+        start = time.perf_counter()
+        history = TranslationHistory(tmp)
+        print(f"reopened in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        queries = {
+            "common word": lambda: words[rng.randrange(5)],
+            "rare word": lambda: words[rng.randrange(len(words) // 2, len(words))],
+            "three words": lambda: " ".join(rng.sample(words[:200], 3)),
+            "typed prefix": lambda: words[rng.randrange(50, 500)][:3],
+            "recent (empty)": lambda: "",
+        }
+        for label, make in queries.items():
+            samples, found = [], 0
+            for _ in range(args.queries):
+                query = make()
+                start = time.perf_counter()
+                found += len(history.search(query, limit=100))
+                samples.append(time.perf_counter() - start)
+            print(
+                f"{label:15} {summary(samples)}, "
+                f"{found / args.queries:.0f} results on average"
+            )
+        after = memory_mb()
+        if before is not None:
+            print(
+                "memory before reopen: {:.0f} MB resident, {:.0f} MB anonymous".format(
+                    *before
+                )
+            )
+            print(
+                "memory after searching: "
+                "{:.0f} MB resident, {:.0f} MB anonymous".format(*after)
+            )
+        history.close()
+
+
+if __name__ == "__main__":
+    main()
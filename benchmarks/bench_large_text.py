@@ -0,0 +1,167 @@
+"""UI responsiveness of the Tk text panes with very large documents.
+
+Drives real Text widgets with a synthetic document (5 MB by default):
+typing in the middle of it, reading the whole buffer on every keystroke
+(the old on_text_change path) against reading the dirty range from
+TextChangeTracker; then showing a result of the same size with one
+insert against ChunkedInserter, measuring the longest main-loop stall.
+Without a DISPLAY an Xvfb virtual display is started if Xvfb is installed.
+Usage: python benchmarks/bench_large_text.py [--mb 5] [--keys 200]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from large_text import ChunkedInserter, TextChangeTracker  # noqa: E402
+
+
+def start_virtual_display(number=99):
+    """Start Xvfb on :number and point DISPLAY at it; return the process"""
+    if os.environ.get("DISPLAY"):
+        return None
+    if shutil.which("Xvfb") is None:
+        sys.exit("No DISPLAY and Xvfb is not installed")
+    process = subprocess.Popen(
+        ["Xvfb", f":{number}", "-screen", "0", "1280x800x24", "-nolisten", "tcp"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    socket = f"/tmp/.X11-unix/X{number}"
+    deadline = time.monotonic() + 10
+    while not os.path.exists(socket):
+        if process.poll() is not None or time.monotonic() > deadline:
+            sys.exit("Could not start Xvfb")
+        time.sleep(0.05)
+    os.environ["DISPLAY"] = f":{number}"
+    return process
+
+
+def document(megabytes, seed=5):
+    rng = random.Random(seed)
+    words = "the translation of this paragraph should stay fast while typing".split()
+    lines, size = [], 0
+    while size < megabytes * 1_000_000:
+        line = " ".join(rng.choice(words) for _ in range(rng.randint(8, 20))) + "."
+        lines.append(line)
+        size += len(line) + 1
+    return "\n".join(lines)
+
+
+def summary(samples):
+    samples = sorted(samples)
+    return (
+        f"p50 {samples[len(samples) // 2] * 1000:7.2f} ms, "
+        f"p99 {samples[int(len(samples) * 0.99)] * 1000:7.2f} ms, "
+        f"max {samples[-1] * 1000:7.2f} ms"
+    )
+
+
+def type_keys(root, text, keys):
+    """Insert characters mid-document, one event-loop turn per key"""
+    text.mark_set("insert", f"{int(text.index('end').split('.')[0]) // 2}.5")
+    samples = []
+    for i in range(keys):
+        start = time.perf_counter()
+        text.insert("insert", "abcdefghij "[i % 11])
+        root.update()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def bench_typing(tk, root, doc, keys):
+    results = {}
+
+    # Old path: every change copies the whole buffer
+    text = tk.Text(root)
+    text.pack()
+    text.insert("1.0", doc)
+    root.update()
+
+    def read_all(event):
+        if text.edit_modified():
+            text.edit_modified(False)
+            text.get("1.0", "end")
+
+    text.bind("<<Modified>>", read_all)
+    results["full read per key"] = type_keys(root, text, keys)
+    text.destroy()
+
+    # New path: only the edited lines are read
+    text = tk.Text(root)
+    text.pack()
+    text.insert("1.0", doc)
+    tracker = TextChangeTracker(text)
+    tracker.on_change = tracker.take_region
+    root.update()
+    results["dirty range read"] = type_keys(root, text, keys)
+    text.destroy()
+    return results
+
+
+def bench_output(tk, root, doc):
+    results = {}
+
+    text = tk.Text(root)
+    text.pack()
+    root.update()
+    start = time.perf_counter()
+    text.insert("end", doc)
+    root.update()
+    results["single insert"] = ([time.perf_counter() - start], None)
+    text.destroy()
+
+    text = tk.Text(root)
+    text.pack()
+    root.update()
+    writer = ChunkedInserter(text)
+    started = time.perf_counter()
+    writer.replace(doc)
+    stalls = []
+    while writer.busy:
+        start = time.perf_counter()
+        root.update()
+        stalls.append(time.perf_counter() - start)
+    results["chunked insert"] = (stalls, time.perf_counter() - started)
+    text.destroy()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mb", type=float, default=5.0, help="document size")
+    parser.add_argument("--keys", type=int, default=200, help="keystrokes to type")
+    args = parser.parse_args()
+
+    display = start_virtual_display()
+    try:
+        import tkinter as tk
+
+        root = tk.Tk()
+        doc = document(args.mb)
+        print(f"document: {len(doc) / 1e6:.1f} MB, {doc.count(chr(10)) + 1} lines")
+
+        print("typing (insert + handler + event loop per key):")
+        for label, samples in bench_typing(tk, root, doc, args.keys).items():
+            print(f"  {label:18} {summary(samples)}")
+
+        print("showing a result of the same size (longest main-loop stall):")
+        for label, (stalls, total) in bench_output(tk, root, doc).items():
+            line = f"  {label:18} {max(stalls) * 1000:8.1f} ms"
+            if total is not None:
+                line += f" over {len(stalls)} ticks, {total:.2f}s in total"
+            print(line)
+        root.destroy()
+    finally:
+        if display is not None:
+            display.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Fuzzy translation memory lookups on a large synthetic memory.
+
+Fills a memory with generated segments, then looks up three kinds of
+queries: stored segments with a number changed (reusable), with one word
+changed (offered), and unrelated text (no match). Reports the index size,
+lookup latency, how many near matches were found and the reuse rate.
+Usage: python benchmarks/bench_memory.py [--segments 1000000] [--queries 2000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from translation_memory import TranslationMemory  # noqa: E402
+
+SYLLABLES = "ka re mo ti lu sa ve no pa di ro me tu la ni fo be sh an er".split()
+
+
+def vocabulary(rng, size=5000):
+    """Pseudo-words with a Zipf-like frequency, like the words of real text"""
+    words = sorted(
+        {
+            "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 4)))
+            for _ in range(size * 2)
+        }
+    )[:size]
+    rng.shuffle(words)
+    weights = [1 / (rank + 1) for rank in range(len(words))]
+    return words, weights
+
+
+def sentence(rng, vocab):
+    words = rng.choices(*vocab, k=rng.randint(6, 14))
+    words.insert(rng.randrange(len(words)), str(rng.randint(1, 99999)))
+    return " ".join(words).capitalize() + "."
+
+
+def change_number(rng, text):
+    words = text.split(" ")
+    for i, word in enumerate(words):
+        if word.rstrip(".").isdigit():
+            words[i] = str(rng.randint(1, 99999)) + ("." if word.endswith(".") else "")
+    return " ".join(words)
+
+
+def change_word(rng, vocab, text):
+    words = text.split(" ")
+    i = rng.randrange(1, len(words) - 1)
+    words[i] = rng.choice(vocab[0])
+    return " ".join(words)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--segments", type=int, default=200000)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    vocab = vocabulary(rng)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "memory.sqlite3")
+        memory = TranslationMemory(db_path=path)
+        stored = []
+        start = time.perf_counter()
+        for _ in range(0, args.segments, 10000):
+            batch = [sentence(rng, vocab) for _ in range(10000)]
+            stored += rng.sample(batch, 20)
+            memory.add_many(("en", "fr", text, f"[fr] {text}") for text in batch)
+        build = time.perf_counter() - start
+        print(
+            f"indexed {memory.segments} segments in {build:.1f}s, "
+            f"{os.path.getsize(path) / 1e6:.0f} MB on disk"
+        )
+
+        kinds = {
+            "number changed": lambda: change_number(rng, rng.choice(stored)),
+            "word changed": lambda: change_word(rng, vocab, rng.choice(stored)),
+            "unrelated": lambda: sentence(rng, vocab),
+        }
+        for kind, make in kinds.items():
+            latencies, reused, offered = [], 0, 0
+            for _ in range(args.queries):
+                text = make()
+                start = time.perf_counter()
+                match = memory.find(text, "fr")
+                latencies.append(time.perf_counter() - start)
+                if match is not None:
+                    reused += match.reusable
+                    offered += not match.reusable
+            latencies.sort()
+            p50 = latencies[len(latencies) // 2] * 1000
+            p99 = latencies[int(len(latencies) * 0.99)] * 1000
+            print(
+                f"{kind:15} p50 {p50:.3f} ms, p99 {p99:.3f} ms, "
+                f"reusable {reused / args.queries:.0%}, "
+                f"offered {offered / args.queries:.0%}"
+            )
+        memory.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Speculative pre-translation on a simulated session.
+
+A user translates a series of texts, reads each result for a moment and
+then usually switches the destination to one of their regular targets.
+Switch latency is measured with and without the prefetcher, on a fake
+upstream with 150 ms per call. The report also shows the hit rate and how
+many speculative calls were spent.
+Usage: python benchmarks/bench_prefetch.py [texts]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from prefetcher import Prefetcher, TargetHistory  # noqa: E402
+from providers import FakeTranslator  # noqa: E402
+from resilience import ResilientCaller, TokenBucket  # noqa: E402
+from translation_cache import TranslationCache  # noqa: E402
+from translation_service import TranslationService  # noqa: E402
+
+UPSTREAM_LATENCY = 0.15
+READING_SECONDS = 0.4
+# How often this user switches to each target after translating into Hindi
+SWITCHES = {"fr": 0.5, "de": 0.25, "es": 0.1, None: 0.15}
+
+
+def run(tmp, name, texts, prefetch, seed=3):
+    rng = random.Random(seed)
+    translator = FakeTranslator(latency=UPSTREAM_LATENCY, seed=seed)
+    service = TranslationService(
+        cache=TranslationCache(db_path=os.path.join(tmp, name + ".sqlite3")),
+        pool=translator,
+        guard=ResilientCaller(limiter=TokenBucket(rate=1e6, burst=1e6), hedge=False),
+    )
+    prefetcher = Prefetcher(
+        service.translate,
+        TargetHistory(path=os.path.join(tmp, name + ".json")),
+        budget_per_minute=1000,
+    )
+    # Seed the history as if from earlier sessions
+    for target, weight in SWITCHES.items():
+        for _ in range(int(weight * 10) if target else 0):
+            prefetcher.history.record(target)
+
+    switches = []
+    for i in range(texts):
+        text = f"Message number {i}: could we move the meeting to {i % 7 + 1} pm?"
+        service.translate(text, "en", "hi")
+        if prefetch:
+            prefetcher.schedule(text, "en", "hi")
+        time.sleep(READING_SECONDS)
+
+        target = rng.choices(list(SWITCHES), weights=list(SWITCHES.values()))[0]
+        if target is None:
+            continue
+        start = time.perf_counter()
+        translated = prefetcher.lookup(text, "en", target) if prefetch else None
+        if translated is None:
+            translated = service.translate(text, "en", target)
+        switches.append(time.perf_counter() - start)
+        if prefetch:
+            prefetcher.schedule(text, "en", target)
+
+    prefetcher.stop()
+    service.close()
+    return switches, prefetcher.stats(), translator.calls
+
+
+def main():
+    texts = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, prefetch in (("no prefetch", False), ("prefetch", True)):
+            switches, stats, calls = run(tmp, label.replace(" ", "_"), texts, prefetch)
+            switches.sort()
+            p50 = switches[len(switches) // 2] * 1000
+            worst = switches[-1] * 1000
+            line = (
+                f"{label:12} {len(switches)} switches: p50 {p50:6.1f} ms, "
+                f"max {worst:6.1f} ms, upstream calls {calls}"
+            )
+            if prefetch:
+                line += (
+                    f", hit rate {stats['hit_rate']:.0%}, "
+                    f"speculative calls {stats['speculative_calls']}"
+                )
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Upstream resilience against the fault-injecting stand-in.
+
+Three scenarios, each with a bare TranslatorPool and with the pool behind
+a ResilientCaller (rate limit, retries, circuit breaker, hedging):
+flaky upstream with a quota, slow tail, and a full outage.
+Usage: python benchmarks/bench_resilience.py [requests] [threads]
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import fault_server  # noqa: E402
+from resilience import (  # noqa: E402
+    CircuitBreaker,
+    ResilientCaller,
+    RetryPolicy,
+    TokenBucket,
+)
+from translator_pool import TranslatorPool  # noqa: E402
+
+
+def run(label, translate, count, threads):
+    latencies = []
+    failures = 0
+
+    def one(i):
+        start = time.perf_counter()
+        try:
+            translate(f"text number {i}", "en", "hi")
+            return time.perf_counter() - start, True
+        except Exception:
+            return time.perf_counter() - start, False
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        for latency, ok in pool.map(one, range(count)):
+            latencies.append(latency)
+            failures += not ok
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    print(
+        f"  {label:<10} ok {count - failures:4d}/{count}, "
+        f"p50 {latencies[len(latencies) // 2] * 1000:6.1f} ms, "
+        f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:6.1f} ms, "
+        f"{elapsed:5.2f}s"
+    )
+
+
+def scenario(title, faults, count, threads, **caller_options):
+    print(title)
+    server, base_url = fault_server.start(faults)
+    pool = TranslatorPool(max_connections=threads, base_url=base_url + "/m")
+
+    faults.counts = dict.fromkeys(faults.counts, 0)
+    run("bare", pool.translate, count, threads)
+    bare_hits = faults.counts["requests"]
+
+    guard = ResilientCaller(**caller_options)
+    faults.counts = dict.fromkeys(faults.counts, 0)
+    run(
+        "resilient",
+        lambda *args: guard.call(pool.translate, *args),
+        count,
+        threads,
+    )
+    print(
+        f"  upstream requests: bare {bare_hits}, "
+        f"resilient {faults.counts['requests']}"
+    )
+    print(f"  {guard.stats()}")
+    guard.close()
+    pool.close()
+    server.shutdown()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+
+    scenario(
+        "flaky upstream: 10% 503, quota of 200 requests/s",
+        fault_server.Faults(error_rate=0.10, rate_limit=200),
+        count,
+        threads,
+        retry=RetryPolicy(attempts=4, base_delay=0.05),
+        limiter=TokenBucket(rate=400, burst=20),
+        hedge=False,
+    )
+    scenario(
+        "slow tail: 5% of responses take 300 ms",
+        fault_server.Faults(slow_rate=0.05, slow_latency=0.3),
+        count,
+        threads,
+        limiter=TokenBucket(rate=500, burst=50),
+    )
+
+    outage = fault_server.Faults()
+    outage.outage = True
+    scenario(
+        "outage: every request fails",
+        outage,
+        count,
+        threads,
+        retry=RetryPolicy(attempts=3, base_delay=0.05),
+        breaker=CircuitBreaker(failure_threshold=5, reset_timeout=60),
+        hedge=False,
+    )
+
+
+if __name__ == "__main__":
+    main()
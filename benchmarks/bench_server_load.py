@@ -0,0 +1,160 @@
+"""Load test of the HTTP service mode against a local fake upstream.
+
+Starts a stand-in for the Google endpoints (fixed latency), the translator
+service on a free port, and a number of keep-alive clients that POST to
+/translate. A share of the texts repeat, so the shared cache is exercised.
+Usage: python benchmarks/bench_server_load.py [requests] [clients] [latency_ms]
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import languages  # noqa: E402
+from translation_cache import TranslationCache  # noqa: E402
+from translation_server import TranslationServer  # noqa: E402
+from translation_service import TranslationService  # noqa: E402
+from translator_pool import TranslatorPool  # noqa: E402
+
+REPEAT_SHARE = 0.3  # fraction of requests that repeat an earlier text
+
+
+class FakeUpstream(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    latency = 0.02
+    calls = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with FakeUpstream.lock:
+            FakeUpstream.calls += 1
+        time.sleep(self.latency)
+        url = urlparse(self.path)
+        text = parse_qs(url.query).get("q", [""])[0]
+        if url.path.endswith("/single"):
+            body = json.dumps([[[text, text]], None, "en"]).encode()
+            content_type = "application/json"
+        else:
+            # Reverse line by line so batched requests split back correctly
+            translated = "\n".join(line[::-1] for line in text.split("\n"))
+            body = f'<html><div class="t0">{translated}</div></html>'.encode()
+            content_type = "text/html"
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+async def client(port, texts, latencies, errors):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        for text in texts:
+            body = json.dumps({"text": text, "source": "en", "target": "hi"}).encode()
+            start = time.perf_counter()
+            writer.write(
+                b"POST /translate HTTP/1.1\r\nHost: bench\r\n"
+                b"Content-Type: application/json\r\n"
+                + f"Content-Length: {len(body)}\r\n\r\n".encode()
+                + body
+            )
+            await writer.drain()
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.decode("latin-1").split("\r\n"):
+                if line.lower().startswith("content-length:"):
+                    length = int(line.split(":", 1)[1])
+            reply = await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            if not head.startswith(b"HTTP/1.1 200"):
+                errors.append(head.split(b"\r\n", 1)[0])
+            elif json.loads(reply)["translation"] != text[::-1]:
+                errors.append(f"wrong translation for {text!r}")
+    finally:
+        writer.close()
+
+
+async def run_load(count, clients, upstream_port, db_path):
+    base = f"http://127.0.0.1:{upstream_port}"
+    pool = TranslatorPool(
+        max_connections=clients,
+        base_url=base + "/m",
+        detect_url=base + "/translate_a/single",
+    )
+    service = TranslationService(cache=TranslationCache(db_path=db_path), pool=pool)
+    server = await TranslationServer(
+        service=service,
+        catalog=languages.fallback_catalog(),
+        port=0,
+        limits={"translate": clients},
+        refresh_catalog=False,
+    ).start()
+
+    texts = [
+        f"common phrase {i % 20}" if i % 10 < REPEAT_SHARE * 10 else f"unique text {i}"
+        for i in range(count)
+    ]
+    latencies, errors = [], []
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(
+            client(server.port, texts[i::clients], latencies, errors)
+            for i in range(clients)
+        )
+    )
+    elapsed = time.perf_counter() - start
+    await server.close()
+    return elapsed, sorted(latencies), errors
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    clients = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    FakeUpstream.latency = (float(sys.argv[3]) if len(sys.argv) > 3 else 20) / 1000
+
+    upstream = ThreadingHTTPServer(("127.0.0.1", 0), FakeUpstream)
+    threading.Thread(target=upstream.serve_forever, daemon=True).start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        elapsed, latencies, errors = asyncio.run(
+            run_load(
+                count,
+                clients,
+                upstream.server_address[1],
+                os.path.join(tmp, "cache.sqlite3"),
+            )
+        )
+    upstream.shutdown()
+
+    print(
+        f"{count} requests, {clients} clients, "
+        f"{FakeUpstream.latency * 1000:.0f} ms upstream latency"
+    )
+    print(
+        f"{count / elapsed:8.1f} req/s, "
+        f"p50 {percentile(latencies, 0.50) * 1000:6.1f} ms, "
+        f"p99 {percentile(latencies, 0.99) * 1000:6.1f} ms"
+    )
+    print(f"upstream calls: {FakeUpstream.calls}, errors: {len(errors)}")
+    if errors:
+        print(f"first error: {errors[0]!r}")
+
+
+if __name__ == "__main__":
+    main()
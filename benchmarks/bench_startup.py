@@ -0,0 +1,78 @@
+"""Measure cold-start cost: module import time and time until the window is up.
+
+Each measurement runs in a fresh interpreter. The window measurement needs a
+display (use xvfb-run on a headless machine) and is skipped without one.
+Usage: python benchmarks/bench_startup.py [runs]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+WINDOW_SCRIPT = """
+import time
+start = time.perf_counter()
+import tkinter as tk
+try:
+    root = tk.Tk()
+except tk.TclError:
+    print("no-display")
+    raise SystemExit
+import google_translator
+app = google_translator.TranslatorApp(root)
+root.update()
+print(time.perf_counter() - start)
+root.destroy()
+"""
+
+
+def python(args):
+    return subprocess.run(
+        [sys.executable, *args], cwd=ROOT, capture_output=True, text=True
+    )
+
+
+def import_profile():
+    """Return (total microseconds, [(cumulative us, module)]) from -X importtime"""
+    result = python(["-X", "importtime", "-c", "import google_translator"])
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        modules.append((int(cumulative), name.rstrip()))
+    total = next(us for us, name in modules if name.strip() == "google_translator")
+    return total, modules
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    totals = []
+    for _ in range(runs):
+        total, modules = import_profile()
+        totals.append(total)
+    print(f"import google_translator: median {statistics.median(totals) / 1000:.1f} ms")
+    print("slowest imports (cumulative, last run):")
+    for us, name in sorted(modules, reverse=True)[1:11]:
+        print(f"  {us / 1000:8.1f} ms {name}")
+
+    deferred = ["pygame", "speech_recognition", "gtts"]
+    loaded = [m for m in deferred if any(n.strip() == m for _, n in modules)]
+    print(f"deferred modules loaded at import: {loaded or 'none'}")
+
+    times = []
+    for _ in range(runs):
+        out = python(["-c", WINDOW_SCRIPT]).stdout.strip()
+        if out == "no-display" or not out:
+            print("window startup: skipped (no display)")
+            return
+        times.append(float(out))
+    print(f"window startup: median {statistics.median(times) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Time-to-first-audio of whole-text vs sentence-pipelined speech.
+
+Uses a stub synthesizer and player whose latency scales with text length, so
+the numbers reflect the scheduling, not gTTS or the sound card.
+Usage: python benchmarks/bench_tts_pipeline.py [sentences]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from tts_pipeline import SpeechPipeline  # noqa: E402
+
+SYNTH_SECONDS_PER_CHAR = 0.0004  # ~20 ms for a 50-character sentence
+PLAY_SECONDS_PER_CHAR = 0.0015  # speech is slower than synthesis
+
+
+def stub_synthesize(text, lang_code):
+    time.sleep(0.01 + len(text) * SYNTH_SECONDS_PER_CHAR)
+    return text
+
+
+def stub_play(clip, cancelled):
+    cancelled.wait(len(clip) * PLAY_SECONDS_PER_CHAR)
+
+
+def whole_text(text):
+    start = time.perf_counter()
+    clip = stub_synthesize(text, "en")
+    first_audio = time.perf_counter() - start
+    stub_play(clip, _NeverSet())
+    return first_audio, time.perf_counter() - start
+
+
+class _NeverSet:
+    def wait(self, timeout):
+        time.sleep(timeout)
+        return False
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    text = " ".join(
+        f"This is sentence number {i} of a long translated paragraph."
+        for i in range(count)
+    )
+
+    first, total = whole_text(text)
+    print(
+        f"whole-text  first audio {first * 1000:7.1f} ms, total {total * 1000:7.1f} ms"
+    )
+
+    pipeline = SpeechPipeline(stub_synthesize, stub_play)
+    session = pipeline.speak(text, "en")
+    session.join()
+    stats = session.stats()
+    print(
+        f"pipelined   first audio {stats['time_to_first_audio'] * 1000:7.1f} ms, "
+        f"total {stats['total_time'] * 1000:7.1f} ms, "
+        f"synthesis {stats['synth_chars_per_second']:.0f} chars/s"
+    )
+
+    # Interrupting must stop playback and pending synthesis promptly
+    session = pipeline.speak(text, "en")
+    time.sleep(0.2)
+    start = time.perf_counter()
+    pipeline.stop()
+    session.join()
+    print(f"stop        returned in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Voice pipeline on recorded audio instead of the microphone.
+
+Without arguments a synthetic recording is generated: background noise
+with tone bursts standing in for spoken phrases. The WAV is streamed in
+real time through VAD segmentation into a stub recognizer that takes
+300 ms. The report lists the phrases found and the delay from the end of
+each phrase to its text. A second pass reuses the saved calibration.
+Usage: python benchmarks/bench_voice.py [recording.wav]
+"""
+
+import math
+import os
+import random
+import struct
+import sys
+import tempfile
+import time
+import wave
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from voice_pipeline import Calibration, VoicePipeline, WavFileSource  # noqa: E402
+
+SAMPLE_RATE = 16000
+# (silence before, phrase length) in seconds
+PHRASES = [(0.8, 1.2), (0.9, 0.6), (1.0, 2.0), (0.7, 0.9)]
+RECOGNIZE_SECONDS = 0.3
+
+
+def write_synthetic(path, seed=7):
+    rng = random.Random(seed)
+    samples = []
+    truth = []
+    t = 0.0
+    for gap, length in PHRASES + [(0.8, 0.0)]:
+        samples += [int(rng.gauss(0, 60)) for _ in range(int(gap * SAMPLE_RATE))]
+        t += gap
+        if length:
+            truth.append((t, t + length))
+        for i in range(int(length * SAMPLE_RATE)):
+            # A 220 Hz voice-like tone with a 4 Hz syllable envelope
+            envelope = 0.55 + 0.45 * math.sin(2 * math.pi * 4 * i / SAMPLE_RATE)
+            tone = math.sin(2 * math.pi * 220 * i / SAMPLE_RATE)
+            samples.append(int(5000 * envelope * tone + rng.gauss(0, 60)))
+        t += length
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes(struct.pack(f"<{len(samples)}h", *samples))
+    return truth
+
+
+def run(path, calibration):
+    found = []
+    started = time.perf_counter()
+
+    def recognize(segment):
+        time.sleep(RECOGNIZE_SECONDS)
+        return f"phrase of {segment.duration:.2f}s"
+
+    def on_text(text, segment):
+        found.append(
+            (segment.start, segment.end, time.perf_counter() - segment.ended_at)
+        )
+
+    pipeline = VoicePipeline(
+        lambda: WavFileSource(path, realtime=True),
+        recognize,
+        on_text,
+        calibration=calibration,
+    )
+    pipeline.start()
+    pipeline.join()
+    return found, time.perf_counter() - started, pipeline.stats()
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        if len(sys.argv) > 1:
+            path, truth = sys.argv[1], None
+        else:
+            path = os.path.join(tmp, "speech.wav")
+            truth = write_synthetic(path)
+
+        calibration = Calibration(path=os.path.join(tmp, "calibration.json"))
+        for label in ("first run", "calibrated"):
+            found, elapsed, stats = run(path, calibration)
+            calibration.save()
+            calibration = Calibration(path=calibration.path)
+            print(
+                f"{label}: {len(found)} phrases in {elapsed:.2f}s, "
+                f"threshold {stats['threshold']:.0f}"
+            )
+            for start, end, delay in found:
+                print(
+                    f"  {start:5.2f}-{end:5.2f}s  text {delay * 1000:5.0f} ms "
+                    "after the end was detected"
+                )
+        if truth:
+            print(
+                "expected: "
+                + ", ".join(f"{start:.2f}-{end:.2f}s" for start, end in truth)
+            )
+
+
+if __name__ == "__main__":
+    main()
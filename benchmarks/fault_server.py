@@ -0,0 +1,143 @@
+"""Local stand-in for the Google endpoints that injects faults.
+
+Serves the same shapes as bench_connection_reuse.py (HTML for /m, JSON for
+/translate_a/single) but can fail with 503, throttle with 429, or answer
+slowly, each with a given probability. Faults are drawn from a seeded RNG,
+so runs are reproducible. With a rate limit, requests above that many per
+second are throttled, like a real quota.
+Usage: python benchmarks/fault_server.py [--port 8766] [--error-rate 0.1]
+       [--throttle-rate 0.05] [--slow-rate 0.05] [--latency-ms 10]
+       [--slow-ms 500] [--rate-limit 100]
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class Faults:
+    def __init__(
+        self,
+        error_rate=0.0,
+        throttle_rate=0.0,
+        slow_rate=0.0,
+        latency=0.01,
+        slow_latency=0.5,
+        rate_limit=None,
+        seed=1,
+    ):
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.slow_rate = slow_rate
+        self.latency = latency
+        self.slow_latency = slow_latency
+        self.rate_limit = rate_limit
+        self.outage = False
+        self._window = (0, 0)  # (second, requests seen in it)
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counts = {"requests": 0, "errors": 0, "throttled": 0, "slow": 0}
+
+    def draw(self):
+        """Return (status, delay) for the next request"""
+        with self.lock:
+            self.counts["requests"] += 1
+            if self.rate_limit and self._over_limit():
+                self.counts["throttled"] += 1
+                return 429, self.latency
+            roll = self.rng.random()
+            if self.outage or roll < self.error_rate:
+                self.counts["errors"] += 1
+                return 503, self.latency
+            roll -= self.error_rate
+            if roll < self.throttle_rate:
+                self.counts["throttled"] += 1
+                return 429, self.latency
+            roll -= self.throttle_rate
+            if roll < self.slow_rate:
+                self.counts["slow"] += 1
+                return 200, self.slow_latency
+            return 200, self.latency
+
+    def _over_limit(self):
+        second = int(time.monotonic())
+        start, seen = self._window
+        seen = seen + 1 if start == second else 1
+        self._window = (second, seen)
+        return seen > self.rate_limit
+
+
+class FaultHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    faults = Faults()
+
+    def do_GET(self):
+        status, delay = self.faults.draw()
+        time.sleep(delay)
+        url = urlparse(self.path)
+        text = parse_qs(url.query).get("q", [""])[0]
+        if status != 200:
+            body = b"unavailable"
+            content_type = "text/plain"
+        elif url.path.endswith("/single"):
+            body = json.dumps([[[text, text]], None, "en"]).encode()
+            content_type = "application/json"
+        else:
+            # Reverse line by line so batched requests split back correctly
+            translated = "\n".join(line[::-1] for line in text.split("\n"))
+            body = f'<html><div class="t0">{translated}</div></html>'.encode()
+            content_type = "text/html"
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start(faults, port=0):
+    """Run the stand-in on a background thread; returns (server, base_url)"""
+    handler = type("Handler", (FaultHandler,), {"faults": faults})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--error-rate", type=float, default=0.1)
+    parser.add_argument("--throttle-rate", type=float, default=0.05)
+    parser.add_argument("--slow-rate", type=float, default=0.05)
+    parser.add_argument("--latency-ms", type=float, default=10)
+    parser.add_argument("--slow-ms", type=float, default=500)
+    parser.add_argument("--rate-limit", type=int, default=None)
+    args = parser.parse_args()
+
+    faults = Faults(
+        args.error_rate,
+        args.throttle_rate,
+        args.slow_rate,
+        args.latency_ms / 1000,
+        args.slow_ms / 1000,
+        args.rate_limit,
+    )
+    server, base_url = start(faults, args.port)
+    print(f"Fault-injecting stand-in on {base_url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+        print(faults.counts)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,420 @@
+"""Reproducible benchmark suite on the deterministic fake providers.
+
+Covers single translate latency, long-document chunking, detection on a
+typing trace, TTS time-to-first-audio, batch throughput and multi-target
+fan-out. Results are written as JSON (with the commit they were measured
+on) so two runs can be compared. Hedging is off and the rate limit is
+lifted so that upstream call counts are deterministic and the numbers
+measure this code rather than the configured quota.
+Usage: python benchmarks/run_suite.py [-o results.json] [--only a,b]
+       [--compare baseline.json]
+"""
+
+import argparse
+import heapq
+import itertools
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import batch_translate  # noqa: E402
+from audio_player import AudioPlayer  # noqa: E402
+from fanout import FanOut  # noqa: E402
+from detection_scheduler import DetectionScheduler  # noqa: E402
+from language_detector import LocalLanguageDetector  # noqa: E402
+from providers import FakeTranslator, FakeTTS  # noqa: E402
+from resilience import ResilientCaller, TokenBucket  # noqa: E402
+from translation_cache import TranslationCache  # noqa: E402
+from translation_service import TranslationService  # noqa: E402
+from tts_cache import AudioCache  # noqa: E402
+from tts_pipeline import SpeechPipeline  # noqa: E402
+
+SEED = 1234
+UPSTREAM_LATENCY = 0.02
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def ms(seconds):
+    return round(seconds * 1000, 3)
+
+
+def make_service(tmp, name, translator, **options):
+    cache = TranslationCache(db_path=os.path.join(tmp, name + ".sqlite3"))
+    guard = ResilientCaller(limiter=TokenBucket(rate=1e6, burst=1e6), hedge=False)
+    return TranslationService(cache=cache, pool=translator, guard=guard, **options)
+
+
+# ----------------------- SUITES -----------------------
+def bench_translate_single(tmp):
+    translator = FakeTranslator(latency=UPSTREAM_LATENCY, seed=SEED)
+    service = make_service(tmp, "single", translator)
+    texts = [f"Short phrase number {i}." for i in range(50)]
+
+    def timed(text):
+        start = time.perf_counter()
+        service.translate(text, "en", "hi")
+        return time.perf_counter() - start
+
+    misses = [timed(text) for text in texts]
+    hits = [timed(text) for text in texts]
+    service.close()
+    return {
+        "miss_p50_ms": ms(percentile(misses, 0.5)),
+        "miss_p95_ms": ms(percentile(misses, 0.95)),
+        "hit_p50_ms": ms(percentile(hits, 0.5)),
+        "upstream_calls": translator.calls,
+    }
+
+
+def bench_long_document(tmp):
+    rng = random.Random(SEED)
+    words = "the quick brown fox jumps over a lazy dog while it rains".split()
+    sentences = [
+        " ".join(rng.choice(words) for _ in range(rng.randint(8, 20))).capitalize()
+        + "."
+        for _ in range(2000)
+    ]
+    text = "\n\n".join(" ".join(sentences[i : i + 10]) for i in range(0, 2000, 10))
+
+    result = {"chars": len(text)}
+    for workers in (1, 4):
+        translator = FakeTranslator(
+            latency=UPSTREAM_LATENCY, per_char=0.000005, seed=SEED
+        )
+        service = make_service(tmp, f"long{workers}", translator, chunk_workers=workers)
+        start = time.perf_counter()
+        service.translate(text, "en", "hi")
+        result[f"seconds_{workers}_workers"] = round(time.perf_counter() - start, 4)
+        result[f"upstream_calls_{workers}_workers"] = translator.calls
+        service.close()
+    result["speedup"] = round(
+        result["seconds_1_workers"] / result["seconds_4_workers"], 2
+    )
+    return result
+
+
+class FakeRoot:
+    """Thread-safe ``after``/``after_cancel`` driven by ``run_until``"""
+
+    def __init__(self):
+        self._timers = []
+        self._cancelled = set()
+        self._ids = itertools.count(1)
+        self._cond = threading.Condition()
+
+    def after(self, delay_ms, callback, *args):
+        with self._cond:
+            timer_id = next(self._ids)
+            due = time.perf_counter() + delay_ms / 1000
+            heapq.heappush(self._timers, (due, timer_id, callback, args))
+            self._cond.notify()
+            return timer_id
+
+    def after_cancel(self, timer_id):
+        with self._cond:
+            self._cancelled.add(timer_id)
+
+    def run_until(self, deadline):
+        while time.perf_counter() < deadline:
+            with self._cond:
+                if not self._timers:
+                    self._cond.wait(deadline - time.perf_counter())
+                    continue
+                due, timer_id, callback, args = self._timers[0]
+                if due > time.perf_counter():
+                    self._cond.wait(min(due, deadline) - time.perf_counter())
+                    continue
+                heapq.heappop(self._timers)
+                if timer_id in self._cancelled:
+                    continue
+            callback(*args)
+
+
+def bench_detection_typing(tmp):
+    rng = random.Random(SEED)
+    passage = (
+        "Bonjour, je voudrais réserver une table pour deux personnes ce soir. "
+        "Est-ce que vous avez encore de la place près de la fenêtre ?"
+    )
+    # Keystroke gaps of a fast typist, with a few thinking pauses
+    gaps = [
+        rng.uniform(0.6, 1.2) if rng.random() < 0.03 else rng.uniform(0.04, 0.12)
+        for _ in passage
+    ]
+
+    root = FakeRoot()
+    remote = FakeTranslator(latency=0.15, seed=SEED)
+    local = LocalLanguageDetector()
+    buffer = []
+    applied = []
+    calls = {"local": 0, "remote": 0}
+
+    def detect(text):
+        code, confidence = local.detect(text)
+        if code and confidence >= 0.6:
+            calls["local"] += 1
+            return code
+        calls["remote"] += 1
+        return remote.detect(text)
+
+    def apply(code):
+        applied.append((time.perf_counter(), code))
+
+    scheduler = DetectionScheduler(
+        root,
+        lambda: "".join(buffer) if len(buffer) >= 3 else "",
+        detect,
+        apply,
+        delay_ms=400,
+    )
+
+    def key(char):
+        buffer.append(char)
+        scheduler.schedule()
+
+    at = 0.0
+    for char, gap in zip(passage, gaps):
+        at += gap
+        root.after(int(at * 1000), key, char)
+    start = time.perf_counter()
+    root.run_until(start + at + 1.5)
+    scheduler.stop()
+
+    last_key = start + at
+    final_lag = applied[-1][0] - last_key if applied else None
+    stats = scheduler.stats()
+    return {
+        "keystrokes": len(passage),
+        "detections": calls["local"] + calls["remote"],
+        "remote_detections": calls["remote"],
+        "applied": stats["applied"],
+        "stale": stats["stale"],
+        "final_language": applied[-1][1] if applied else None,
+        "final_lag_ms": ms(final_lag) if final_lag is not None else None,
+    }
+
+
+class ClockOutput:
+    """AudioPlayer output stand-in: every clip "plays" for clip_seconds"""
+
+    def __init__(self, clip_seconds=0.02):
+        self.clip_seconds = clip_seconds
+        self._sounds = []  # playing, then queued
+        self._started = 0.0
+
+    def open(self):
+        pass
+
+    def decode(self, data):
+        return object()  # one distinct sound per clip
+
+    def length(self, sound):
+        return self.clip_seconds
+
+    def play(self, sound):
+        self._sounds = [sound]
+        self._started = time.perf_counter()
+
+    def queue(self, sound):
+        self._sounds.append(sound)
+
+    def playing(self):
+        now = time.perf_counter()
+        while self._sounds and now >= self._started + self.clip_seconds:
+            self._sounds.pop(0)
+            self._started += self.clip_seconds
+        return self._sounds[0] if self._sounds else None
+
+    def stop(self):
+        self._sounds = []
+
+    def close(self):
+        self.stop()
+
+
+def bench_tts_first_audio(tmp):
+    """The app's speech path: bytes from the cache or TTS, played by AudioPlayer"""
+    text = " ".join(
+        f"This is sentence number {i} of a long translated paragraph."
+        for i in range(20)
+    )
+    tts = FakeTTS(seed=SEED)
+    cache = AudioCache(directory=os.path.join(tmp, "tts"))
+
+    def synthesize(sentence, lang_code):
+        return cache.get_or_create_bytes(
+            sentence,
+            lang_code,
+            False,
+            lambda: tts.synthesize_bytes(sentence, lang_code),
+        )
+
+    player = AudioPlayer(output=ClockOutput(0.02))
+    pipeline = SpeechPipeline(synthesize, player=player)
+    result = {"sentences": 20}
+    for label in ("cold", "warm"):
+        session = pipeline.speak(text, "en")
+        session.join()
+        stats = session.stats()
+        result[f"{label}_first_audio_ms"] = ms(stats["time_to_first_audio"])
+        result[f"{label}_total_ms"] = ms(stats["total_time"])
+    result["synth_calls"] = tts.calls
+    player.close()
+    cache.close()
+    return result
+
+
+def bench_batch_throughput(tmp):
+    source = os.path.join(tmp, "batch.txt")
+    with open(source, "w", encoding="utf-8") as f:
+        for i in range(2000):
+            f.write(f"Record number {i % 1500} needs translating.\n")
+
+    translator = FakeTranslator(latency=UPSTREAM_LATENCY, seed=SEED)
+    service = make_service(tmp, "batch", translator)
+    args = batch_translate.build_parser().parse_args(
+        [source, "--to", "hi", "--workers", "8", "--format", "txt", "--restart"]
+    )
+    args.output = os.path.join(tmp, "batch.hi.txt")
+    progress = batch_translate.run(
+        args, lambda text: service.translate(text, "en", "hi")
+    )
+    elapsed = time.perf_counter() - progress.start
+    service.close()
+    return {
+        "records": progress.records,
+        "records_per_s": round(progress.records / elapsed, 1),
+        "errors": progress.errors,
+        "upstream_calls": translator.calls,
+    }
+
+
+def bench_fanout(tmp):
+    targets = ["fr", "de", "es", "it", "pt", "nl", "sv", "pl", "ru", "uk"]
+    targets += ["tr", "ar", "hi", "bn", "ja", "ko", "zh-CN", "vi", "th", "id"]
+    text = "Your changes have been saved."
+    result = {"targets": len(targets)}
+
+    translator = FakeTranslator(latency=UPSTREAM_LATENCY, seed=SEED)
+    service = make_service(tmp, "sequential", translator)
+    start = time.perf_counter()
+    for target in targets:
+        service.translate(text, "en", target)
+    result["sequential_ms"] = ms(time.perf_counter() - start)
+    service.close()
+
+    translator = FakeTranslator(latency=UPSTREAM_LATENCY, seed=SEED)
+    service = make_service(tmp, "fanout", translator)
+    first = []
+    start = time.perf_counter()
+    FanOut(service.translate, concurrency=8).run(
+        text,
+        targets,
+        "en",
+        on_result=lambda r: first or first.append(time.perf_counter() - start),
+    )
+    result["fanout_ms"] = ms(time.perf_counter() - start)
+    result["fanout_first_result_ms"] = ms(first[0])
+    result["upstream_calls"] = translator.calls
+    service.close()
+    return result
+
+
+SUITES = {
+    "translate_single": bench_translate_single,
+    "long_document": bench_long_document,
+    "detection_typing": bench_detection_typing,
+    "tts_first_audio": bench_tts_first_audio,
+    "batch_throughput": bench_batch_throughput,
+    "fanout": bench_fanout,
+}
+
+
+# ----------------------- RESULTS -----------------------
+def git_commit():
+    root = os.path.join(os.path.dirname(__file__), "..")
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=root,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=root,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return commit + ("-dirty" if dirty else "")
+
+
+def compare(baseline, current):
+    """Print the relative change of every numeric metric"""
+    print(f"\nchange vs {baseline['commit']}:")
+    for suite, metrics in current["results"].items():
+        old_metrics = baseline["results"].get(suite, {})
+        for name, value in metrics.items():
+            old = old_metrics.get(name)
+            if not isinstance(value, (int, float)) or not isinstance(old, (int, float)):
+                continue
+            change = (value - old) / old * 100 if old else 0.0
+            print(f"  {suite}.{name:<22} {old:>10} -> {value:>10} ({change:+.1f}%)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the benchmark suite")
+    parser.add_argument("-o", "--output", help="results file (default: results/)")
+    parser.add_argument("--only", help="comma-separated suites to run")
+    parser.add_argument("--compare", help="earlier results file to compare with")
+    args = parser.parse_args(argv)
+
+    names = args.only.split(",") if args.only else list(SUITES)
+    unknown = [name for name in names if name not in SUITES]
+    if unknown:
+        parser.error(f"unknown suites: {', '.join(unknown)}")
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": SEED,
+        "results": {},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in names:
+            print(f"{name} ...", flush=True)
+            report["results"][name] = SUITES[name](tmp)
+            print(f"  {report['results'][name]}")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{report['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"results written to {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(json.load(f), report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+import threading
+
+
+class DetectionScheduler:
+    """Debounced, single-worker background job for the source text box.
+
+    Used for language detection and for live translation.
+
+    ``schedule`` is called from the Tk main loop on every key release. Only
+    the last call in a burst fires (trailing-edge debounce via ``after``).
+    The fired request is handed to one long-lived worker thread; if the
+    worker is still busy, a newer request replaces the waiting one. Each
+    request carries a generation number and results from older generations
+    are dropped, so a slow detection can never overwrite a newer one.
+    """
+
+    def __init__(
+        self, root, read_text, detect, apply, delay_ms=400, on_error=None, post=None
+    ):
+        self.root = root
+        # How results get back to the main thread (e.g. TkBridge.post)
+        self.post = post or (
+            lambda callback, *args: self.root.after(0, callback, *args)
+        )
+        self.read_text = read_text
+        self.detect = detect
+        self.apply = apply
+        self.delay_ms = delay_ms
+        self.on_error = on_error or (lambda e: print(f"Language detection error: {e}"))
+
+        self.generation = 0
+        self._after_id = None
+        self._pending = None
+        self._cond = threading.Condition()
+        self._stopped = False
+
+        # Counters
+        self.scheduled = 0
+        self.skipped = 0  # Key releases folded into a later debounce
+        self.superseded = 0  # Requests replaced before the worker took them
+        self.stale = 0  # Results dropped because newer input exists
+        self.applied = 0
+
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def schedule(self):
+        """Restart the debounce timer; call from the Tk main loop"""
+        self.generation += 1
+        self.scheduled += 1
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self.skipped += 1
+        self._after_id = self.root.after(self.delay_ms, self._fire)
+
+    def cancel(self):
+        """Drop any queued or in-flight detection"""
+        self.generation += 1
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        with self._cond:
+            self._pending = None
+
+    def _fire(self):
+        self._after_id = None
+        text = self.read_text()
+        if not text:
+            return
+        with self._cond:
+            if self._pending is not None:
+                self.superseded += 1
+            self._pending = (self.generation, text)
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._stopped:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                generation, text = self._pending
+                self._pending = None
+
+            try:
+                result = self.detect(text)
+            except Exception as e:
+                self.on_error(e)
+                continue
+
+            try:
+                # Pass the values, not a closure over this loop's variables
+                self.post(self._deliver, generation, result)
+            except RuntimeError:
+                # The Tk main loop has gone away
+                return
+
+    def _deliver(self, generation, result):
+        if generation != self.generation:
+            self.stale += 1
+            return
+        self.applied += 1
+        self.apply(result)
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+
+    def stats(self):
+        return {
+            "scheduled": self.scheduled,
+            "skipped": self.skipped,
+            "superseded": self.superseded,
+            "stale": self.stale,
+            "applied": self.applied,
+        }
@@ -0,0 +1,220 @@
+"""Translate one text into many target languages in one operation.
+
+The source language is detected once, then every target is translated
+concurrently (at most ``--concurrency`` upstream calls at a time) and each
+result is written as soon as it arrives.
+
+    python fanout.py "Welcome back!" --to fr,de,es,ja
+    python fanout.py --file strings.txt --to all --format csv -o strings.csv
+"""
+
+import argparse
+import csv
+import json
+import sys
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from batch_translate import load_catalog, resolve_language
+from language_detector import LocalLanguageDetector
+from metrics import METRICS
+from translation_service import TranslationService
+
+FORMATS = ("txt", "csv", "jsonl")
+
+FanOutResult = namedtuple("FanOutResult", "target translation error seconds")
+
+
+def make_detector(service, supported_codes=None, threshold=0.6):
+    """Offline detection first, the upstream detector only when unsure"""
+    local = LocalLanguageDetector(supported_codes)
+
+    def detect(text):
+        with METRICS.span("detect.local"):
+            code, confidence = local.detect(text)
+        if code and confidence >= threshold:
+            return code
+        return service.detect(text)
+
+    return detect
+
+
+class FanOut:
+    """Run one text through ``translate(text, source, target)`` for many targets.
+
+    ``detect(text)`` resolves an "auto" source once up front, so every
+    target shares the same source language (and the same cache keys). The
+    thread pool caps concurrency; ``on_result`` is called from a worker
+    thread with a ``FanOutResult`` as each target finishes.
+    """
+
+    def __init__(self, translate, detect=None, concurrency=8):
+        self.translate = translate
+        self.detect = detect
+        self.concurrency = concurrency
+
+    def resolve_source(self, text, source_code):
+        if source_code != "auto" or self.detect is None:
+            return source_code
+        try:
+            return self.detect(text) or "auto"
+        except Exception as e:
+            print(f"Language detection error: {e}")
+            return "auto"
+
+    def run(self, text, targets, source_code="auto", on_result=None, cancelled=None):
+        """Translate into every target; return (source_code, results in target order)"""
+        source_code = self.resolve_source(text, source_code)
+        targets = [code for code in dict.fromkeys(targets) if code != source_code]
+        results = {}
+
+        def translate_one(target_code):
+            start = time.perf_counter()
+            try:
+                translation = self.translate(text, source_code, target_code)
+                error = None
+            except Exception as e:
+                translation, error = None, e
+            return FanOutResult(
+                target_code, translation, error, time.perf_counter() - start
+            )
+
+        with ThreadPoolExecutor(max_workers=max(1, self.concurrency)) as pool:
+            futures = [pool.submit(translate_one, code) for code in targets]
+            for future in as_completed(futures):
+                if cancelled is not None and cancelled.is_set():
+                    for pending in futures:
+                        pending.cancel()
+                    break
+                result = future.result()
+                results[result.target] = result
+                METRICS.inc("fanout_targets", error=result.error is not None)
+                if on_result is not None:
+                    on_result(result)
+        return source_code, [results[code] for code in targets if code in results]
+
+
+# ----------------------- OUTPUT -----------------------
+class ResultWriter:
+    """Write each result as it arrives, in txt, csv or jsonl"""
+
+    def __init__(self, stream, fmt):
+        self.stream = stream
+        self.fmt = fmt
+        self.lock = threading.Lock()
+        self.csv = csv.writer(stream) if fmt == "csv" else None
+        if self.csv:
+            self.csv.writerow(["text", "source", "target", "translation", "error"])
+
+    def write(self, text, source_code, result):
+        error = str(result.error) if result.error is not None else ""
+        with self.lock:
+            if self.fmt == "csv":
+                self.csv.writerow(
+                    [text, source_code, result.target, result.translation or "", error]
+                )
+            elif self.fmt == "jsonl":
+                record = {
+                    "text": text,
+                    "source": source_code,
+                    "target": result.target,
+                    "translation": result.translation,
+                }
+                if error:
+                    record["error"] = error
+                self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+            else:
+                line = result.translation if not error else f"ERROR: {error}"
+                self.stream.write(f"[{result.target}] {line}\n")
+            self.stream.flush()
+
+
+def resolve_targets(catalog, value):
+    """Comma-separated names or codes, or "all" for every supported language"""
+    if value.strip().lower() == "all":
+        return [code for code in catalog.codes if code != "auto"]
+    return [
+        resolve_language(catalog, name.strip())
+        for name in value.split(",")
+        if name.strip()
+    ]
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Translate text into many languages at once"
+    )
+    parser.add_argument("text", nargs="?", help="text to translate")
+    parser.add_argument("--file", help="translate each non-blank line of this file")
+    parser.add_argument(
+        "--from", dest="source", default="Auto", help="source language (default: Auto)"
+    )
+    parser.add_argument(
+        "--to",
+        dest="targets",
+        required=True,
+        help='comma-separated target names or codes, or "all"',
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=8, help="concurrent upstream requests"
+    )
+    parser.add_argument(
+        "--format", choices=FORMATS, default="txt", help="output format (default: txt)"
+    )
+    parser.add_argument("-o", "--output", help="output file (default: stdout)")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if (args.text is None) == (args.file is None):
+        parser.error("give either a text or --file")
+
+    catalog = load_catalog()
+    source_code = resolve_language(catalog, args.source, allow_auto=True)
+    targets = resolve_targets(catalog, args.targets)
+    if args.file:
+        with open(args.file, encoding="utf-8") as f:
+            texts = [line.strip() for line in f if line.strip()]
+    else:
+        texts = [args.text]
+
+    service = TranslationService()
+    fanout = FanOut(
+        service.translate,
+        detect=make_detector(service, catalog.codes),
+        concurrency=args.concurrency,
+    )
+    out = (
+        open(args.output, "w", encoding="utf-8", newline="")
+        if args.output
+        else sys.stdout
+    )
+    writer = ResultWriter(out, args.format)
+    failed = 0
+    try:
+        for text in texts:
+            detected = fanout.resolve_source(text, source_code)
+            _, results = fanout.run(
+                text,
+                targets,
+                detected,
+                on_result=lambda result: writer.write(text, detected, result),
+            )
+            failed += sum(result.error is not None for result in results)
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        service.close()
+        if out is not sys.stdout:
+            out.close()
+    if failed:
+        print(f"{failed} translations failed", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,35 @@
 import tkinter as tk
-from tkinter import ttk
-from deep_translator import GoogleTranslator
+from tkinter import filedialog, ttk
 import threading
-from gtts import gTTS
 import os
-import tempfile
-import pygame
+import sys
 import time
-import speech_recognition as sr
 import atexit
-from gtts.lang import tts_langs
 import re
+from lazy_imports import LazyModule
+from language_detector import LocalLanguageDetector
+from detection_scheduler import DetectionScheduler
+from translation_service import TranslationService
+from tts_cache import AudioCache
+from tts_pipeline import SpeechPipeline
+from audio_player import AudioPlayer
+from live_translation import IncrementalTranslator
+from translation_engine import TranslationEngine
+from tk_bridge import TkBridge
+from providers import load_providers
+from voice_pipeline import MicrophoneSource, VoicePipeline
+from metrics import METRICS, readout_enabled, start_json_log
+from prefetcher import Prefetcher
+from translation_memory import TranslationMemory
+from fanout import FanOut
+from history import TranslationHistory
+from large_text import ChunkedInserter, TextChangeTracker
+import subtitles
+from batch_translate import Throughput, default_output
+import languages
+
+# Speech recognition is imported on first use to keep startup fast
+sr = LazyModule("speech_recognition")
 
 
 class TranslatorApp:
@@ -26,101 +45,160 @@ class TranslatorApp:
         except:
             pass
 
-        # Audio and temp file management
-        self.audio_files = []
-        self.setup_audio()
+        # Worker threads hand UI updates to the main loop through the bridge
+        self.bridge = TkBridge(self.root)
+        self.status_animation = 0
+
+        # Synthesized speech is cached on disk, keyed by (text, lang, slow)
+        self.audio_cache = AudioCache()
+        # Google by default; TRANSLATOR_PROVIDERS=fake runs fully offline
+        self.providers = load_providers()
+        # Near-duplicates of earlier segments are reused or offered from memory
+        self.translation_service = TranslationService(
+            pool=self.providers.translator, memory=TranslationMemory()
+        )
+        self.declined_offer = None
+        self.engine = TranslationEngine(
+            self.translation_service,
+            synthesize=self.synthesize_sentence,
+            recognize=self.recognize_speech,
+        )
+        self.current_translation = None
+        # (text, source_code) of the translation currently shown
+        self.shown_translation = None
+
+        # While the user reads a result, translate it into the targets they
+        # usually switch to next so changing the destination is instant
+        self.prefetcher = Prefetcher(self.translation_service.translate)
+        # Every shown translation is appended to a searchable on-disk log
+        self.history = TranslationHistory()
+
+        # One playback thread plays clips from memory, back to back
+        self.audio_player = AudioPlayer(on_error=self.on_speech_error)
+        self.speech_pipeline = SpeechPipeline(
+            lambda sentence, lang_code: self.engine.call(
+                self.engine.synthesize(sentence, lang_code)
+            ),
+            player=self.audio_player,
+            on_error=self.on_speech_error,
+        )
+        self.incremental_translator = IncrementalTranslator(
+            self.translation_service.translate_piece
+        )
         self.setup_translator()
         self.setup_ui()
         self.center_window()
 
-        # Variables for language detection
-        self.last_detection_time = 0
-        self.detection_delay = 1.5  # seconds between detections
+        # Language detection runs on one worker after typing pauses
+        self.detection_delay = 0.4  # seconds of idle typing before detecting
         self.auto_detect_enabled = True  # Auto-detect is always enabled now
+        self.detection_scheduler = DetectionScheduler(
+            self.root,
+            self.read_detection_text,
+            self.detect_language,
+            self.apply_detected_language,
+            delay_ms=int(self.detection_delay * 1000),
+            post=self.bridge.post,
+        )
+
+        # Opt-in live mode retranslates only the sentences that changed
+        self.live_scheduler = DetectionScheduler(
+            self.root,
+            self.read_live_request,
+            self.run_live_translation,
+            self.apply_live_translation,
+            delay_ms=600,
+            on_error=self.on_live_error,
+            post=self.bridge.post,
+        )
 
         # Cooldown for manual changes
         self.last_manual_change_time = 0
         self.manual_change_cooldown = 3.0  # seconds
 
-        # Bind text change event for auto-detection
-        self.source_text.bind("<KeyRelease>", self.on_text_change)
+        # Edits are tracked as dirty line ranges so large documents are not
+        # copied on every keystroke; long results are inserted in slices
+        self.source_tracker = TextChangeTracker(
+            self.source_text, on_change=self.on_text_change
+        )
+        self.dest_writer = ChunkedInserter(self.dest_text)
+        self.full_read_chars = 20000  # below this, detection reads everything
 
         # Track source language changes
         self.src_lang.trace_add("write", self.on_src_lang_changed)
+        self.dest_lang.trace_add("write", self.on_live_settings_changed)
+        self.dest_lang.trace_add("write", self.on_dest_lang_changed)
+        self.live_mode.trace_add("write", self.on_live_settings_changed)
+
+        # Optional periodic JSON log of latency histograms and counters
+        self.metrics_log = start_json_log()
+        self.show_latency = readout_enabled()
 
         # Cleanup on exit
         atexit.register(self.cleanup)
 
     def cleanup(self):
-        """Clean up temporary audio files"""
-        for file in self.audio_files:
-            try:
-                if os.path.exists(file):
-                    os.remove(file)
-            except:
-                pass
-
-    # ----------------------- AUDIO SETUP -----------------------
-    def setup_audio(self):
-        try:
-            pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=4096)
-            pygame.mixer.music.set_volume(1.0)
-        except Exception as e:
-            self.status_label.config(
-                text=f"⚠️ Audio system might not work: {str(e)}", foreground="#FF9800"
-            )
+        """Release background workers and persist caches"""
+        self.speech_pipeline.stop()
+        self.audio_player.close()
+        if self.voice is not None:
+            self.voice.close()
+        self.audio_cache.close()
+        self.detection_scheduler.stop()
+        self.live_scheduler.stop()
+        self.prefetcher.stop()
+        self.history.close()
+        self.engine.close()
+        self.bridge.stop()
+        self.translation_service.close()
+        if self.metrics_log is not None:
+            self.metrics_log.stop()
 
     def setup_translator(self):
-        try:
-            self.translator = GoogleTranslator(source="auto", target="hindi")
-            self.languages_dict = self.translator.get_supported_languages(as_dict=True)
-
-            # Create properly capitalized language names for display
-            self.languages = ["Auto"]  # Add "Auto" as the first option
-            for lang_name in self.languages_dict.keys():
-                # Handle special cases for proper capitalization
-                if "(" in lang_name:
-                    # For languages like "chinese (simplified)"
-                    parts = lang_name.split(" (")
-                    capitalized = parts[0].capitalize() + " (" + parts[1].capitalize()
-                    self.languages.append(capitalized)
-                else:
-                    # For regular language names
-                    self.languages.append(lang_name.capitalize())
-
-            self.languages = sorted(self.languages[1:])  # Sort all except "Auto"
-            self.languages.insert(0, "Auto")  # Put "Auto" back at the beginning
-
-            # Get supported TTS languages
-            self.tts_languages = tts_langs()
+        # Show the window from the catalog cached by the last run, then refresh
+        self.catalog = languages.load_cached_catalog() or languages.fallback_catalog()
 
-        except Exception as e:
-            self.status_label.config(
-                text=f"⚠️ Failed to initialize translator: {str(e)}",
-                foreground="#FF9800",
-            )
-            # Fallback with properly capitalized names
-            self.languages_dict = {"english": "en", "hindi": "hi"}
-            self.languages = ["Auto", "English", "Hindi"]
-            self.tts_languages = {"en": "English", "hi": "Hindi"}
+        # Properly capitalized language names for display
+        self.languages = self.catalog.display_names
+
+        # Offline detector used before falling back to the network
+        self.language_detector = LocalLanguageDetector(self.catalog.codes)
+        self.local_detection_threshold = 0.6
+        self.detection_stats = {"local": 0, "remote": 0}
 
-        self.recognizer = sr.Recognizer()
-        self.microphone = sr.Microphone()
+        # Continuous voice capture starts on the first voice input
+        self.voice = None
         self.listening = False
-        self.current_audio_file = None
+
+        threading.Thread(target=self.refresh_languages, daemon=True).start()
+
+    def refresh_languages(self):
+        """Fetch the language lists in the background and cache them on disk"""
+        try:
+            catalog = languages.fetch_catalog()
+        except Exception as e:
+            self.set_status(f"⚠️ Failed to refresh languages: {str(e)}", "#FF9800")
+            return
+
+        if catalog == self.catalog:
+            return
+        try:
+            languages.save_catalog(catalog)
+        except OSError as e:
+            print(f"Could not cache language list: {e}")
+        self.bridge.post(self.apply_catalog, catalog)
+
+    def apply_catalog(self, catalog):
+        """Swap in a refreshed language catalog on the main thread"""
+        self.catalog = catalog
+        self.languages = catalog.display_names
+        self.language_detector = LocalLanguageDetector(catalog.codes)
+        self.src_combobox.config(values=self.languages)
+        self.dest_combobox.config(values=self.languages[1:])
 
     def get_language_code(self, language_name):
         """Get the language code from a properly capitalized language name"""
-        # Handle "Auto" selection
-        if language_name.lower() == "auto":
-            return "auto"
-
-        # Convert back to lowercase to match the dictionary keys
-        lang_lower = language_name.lower()
-        for lang_name_key, lang_code in self.languages_dict.items():
-            if lang_name_key.lower() == lang_lower:
-                return lang_code
-        return None
+        return self.catalog.code(language_name)
 
     # ----------------------- LANGUAGE DETECTION -----------------------
     def detect_language(self, text):
@@ -134,56 +212,58 @@ class TranslatorApp:
             return "Auto"  # Default to Auto for encoded/garbled text
 
         try:
-            # Use GoogleTranslator to detect language
-            detected = GoogleTranslator(source="auto", target="en").detect(text)
+            # Try the offline detector first; only ask the network when unsure
+            with METRICS.span("detect.local"):
+                detected, confidence = self.language_detector.detect(text)
+            if detected and confidence >= self.local_detection_threshold:
+                self.detection_stats["local"] += 1
+            else:
+                detected = self.engine.call(self.engine.detect(text))
+                self.detection_stats["remote"] += 1
 
             # Convert language code to properly capitalized full name
-            for lang_name, lang_code in self.languages_dict.items():
-                if lang_code == detected:
-                    # Find the properly capitalized version in our languages list
-                    for available_lang in self.languages:
-                        if available_lang.lower() == lang_name.lower():
-                            return available_lang
-
-            return "Auto"  # Default if not found
+            return self.catalog.display_name(detected) or "Auto"
 
         except Exception as e:
             print(f"Language detection error: {e}")
             return "Auto"  # Default on error
 
-    def on_text_change(self, event):
+    def on_text_change(self, event=None):
         """Handle text changes in the source text box for language detection"""
+        if self.live_mode.get():
+            self.live_scheduler.schedule()
+
         # Don't auto-detect if a manual change happened recently
         current_time = time.time()
         if current_time - self.last_manual_change_time < self.manual_change_cooldown:
             return
 
-        current_time = time.time()
-        if current_time - self.last_detection_time < self.detection_delay:
-            return
-
-        text = self.source_text.get(1.0, tk.END).strip()
-        if not text or len(text) < 3:
-            return
-
-        self.last_detection_time = current_time
-
-        # Use threading to avoid UI freeze
-        def detect_in_thread():
-            detected_lang = self.detect_language(text)
-            if detected_lang != self.src_lang.get():
-                # Update the UI in the main thread
-                self.root.after(0, lambda: self.update_source_language(detected_lang))
+        self.detection_scheduler.schedule()
+
+    def read_detection_text(self):
+        """Return the text to detect, or an empty string if it is too short"""
+        if self.source_tracker.chars <= self.full_read_chars:
+            text = self.source_text.get(1.0, tk.END).strip()
+        else:
+            # Large documents: detect on the edited lines, else the start
+            text = self.source_tracker.take_region().strip()
+            if len(text) < 3:
+                text = self.source_tracker.head().strip()
+        if len(text) < 3:
+            return ""
+        return text
 
-        threading.Thread(target=detect_in_thread, daemon=True).start()
+    def apply_detected_language(self, detected_lang):
+        """Apply a detection result delivered on the main thread"""
+        if detected_lang != self.src_lang.get():
+            self.update_source_language(detected_lang)
 
     def update_source_language(self, language):
         """Update the source language dropdown"""
         # Make sure we use the exact case as in the languages list
-        for lang in self.languages:
-            if lang.lower() == language.lower():
-                self.src_lang.set(lang)
-                break
+        lang = self.catalog.canonical_name(language)
+        if lang:
+            self.src_lang.set(lang)
 
     def on_src_lang_changed(self, *args):
         """Handle changes to the source language"""
@@ -192,7 +272,7 @@ class TranslatorApp:
         self.status_label.config(
             text=f"🌍 Language set to: {lang}", foreground="#4285F4"
         )
-        self.root.after(3000, lambda: self.status_label.config(text=""))
+        self.clear_status_later()
 
     # ----------------------- UTILITIES -----------------------
     def center_window(self):
@@ -203,54 +283,98 @@ class TranslatorApp:
         y = (self.root.winfo_screenheight() // 2) - (height // 2)
         self.root.geometry(f"{width}x{height}+{x}+{y}")
 
+    def set_status(self, text, color="#4285F4"):
+        """Update the status bar; safe to call from any thread"""
+        self.bridge.post(self.status_label.config, text=text, foreground=color)
+
+    def clear_status_later(self, delay_ms=3000):
+        self.root.after(delay_ms, lambda: self.status_label.config(text=""))
+
     def animate_status(self, message, color):
-        """Animated status with dots"""
+        """Animated status with dots, driven by the main loop"""
+        self.status_animation += 1
+        token = self.status_animation
 
-        def _animate():
-            for i in range(6):
-                self.status_label.config(text=message + "." * (i % 4), foreground=color)
-                self.root.update()
-                time.sleep(0.4)
+        def step(i):
+            if token != self.status_animation or i >= 6:
+                return
+            self.status_label.config(text=message + "." * (i % 4), foreground=color)
+            self.root.after(400, step, i + 1)
 
-        threading.Thread(target=_animate, daemon=True).start()
+        step(0)
 
-    # ----------------------- TRANSLATION -----------------------
-    def translate_text(self, text: str, src="auto", dest="Hindi"):
-        if not text.strip():
-            return ""
+    def stop_status_animation(self):
+        self.status_animation += 1
 
-        try:
-            # For auto-detection, use "auto" as source
-            if src == "Auto" or src == "auto":
-                source_code = "auto"
-            else:
-                # Get language code from properly capitalized name
-                source_code = self.get_language_code(src)
-                if not source_code:
-                    self.status_label.config(
-                        text=f"⚠️ Source language '{src}' not supported",
-                        foreground="#FF9800",
-                    )
-                    return ""
-
-            # Get target language code from properly capitalized name
-            target_code = self.get_language_code(dest)
-            if not target_code:
+    # ----------------------- TRANSLATION -----------------------
+    def resolve_language_codes(self, src, dest):
+        """Return (source_code, target_code), or None after reporting the problem"""
+        # For auto-detection, use "auto" as source
+        if src == "Auto" or src == "auto":
+            source_code = "auto"
+        else:
+            # Get language code from properly capitalized name
+            source_code = self.get_language_code(src)
+            if not source_code:
                 self.status_label.config(
-                    text=f"⚠️ Target language '{dest}' not supported",
+                    text=f"⚠️ Source language '{src}' not supported",
                     foreground="#FF9800",
                 )
-                return ""
+                return None
 
-            return GoogleTranslator(source=source_code, target=target_code).translate(
-                text
-            )
-
-        except Exception as e:
+        # Get target language code from properly capitalized name
+        target_code = self.get_language_code(dest)
+        if not target_code:
             self.status_label.config(
-                text=f"⚠️ Translation error: {str(e)}", foreground="#FF9800"
+                text=f"⚠️ Target language '{dest}' not supported",
+                foreground="#FF9800",
             )
-            return ""
+            return None
+        return source_code, target_code
+
+    def translation_source(self, src_lang):
+        """Return the source language to translate from, honouring auto-detect"""
+        # Use auto-detection if enabled or if source is set to Auto
+        return "auto" if (self.auto_detect_enabled or src_lang == "Auto") else src_lang
+
+    # ----------------------- LIVE TRANSLATION -----------------------
+    def on_live_settings_changed(self, *args):
+        if self.live_mode.get():
+            self.live_scheduler.schedule()
+        else:
+            self.live_scheduler.cancel()
+
+    def read_live_request(self):
+        """Snapshot the text and language codes for a live retranslation"""
+        text = self.source_text.get(1.0, tk.END).strip()
+        if not text:
+            return None
+        source = self.translation_source(self.src_lang.get())
+        source_code = self.get_language_code(source)
+        target_code = self.get_language_code(self.dest_lang.get())
+        if not source_code or not target_code:
+            return None
+        return text, source_code, target_code
+
+    def run_live_translation(self, request):
+        text, source_code, target_code = request
+        return self.engine.call(
+            self.engine.run(
+                "translate",
+                self.incremental_translator.translate,
+                text,
+                source_code,
+                target_code,
+            )
+        )
+
+    def apply_live_translation(self, translated):
+        if not self.live_mode.get():
+            return
+        self.dest_writer.replace(translated)
+
+    def on_live_error(self, error):
+        self.set_status(f"⚠️ Translation error: {str(error)}", "#FF9800")
 
     def perform_translation(self):
         src_lang = self.src_lang.get()
@@ -259,29 +383,418 @@ class TranslatorApp:
         if not text:
             return
 
-        def _translate():
-            self.translate_btn.config(state=tk.DISABLED, text="Translating...")
-            self.animate_status("Translating", "#FF9800")
+        codes = self.resolve_language_codes(
+            self.translation_source(src_lang), dest_lang
+        )
+        if not codes:
+            return
+
+        # A new request supersedes one still in flight, and any speculation
+        if self.current_translation is not None:
+            self.current_translation.cancel()
+            self.current_translation = None
+            self.stop_status_animation()
+            self.translate_btn.config(state=tk.NORMAL, text="TRANSLATE →")
+        self.prefetcher.cancel()
+
+        if self.offer_from_memory(text, codes):
+            return
+
+        self.translate_btn.config(state=tk.DISABLED, text="Translating...")
+        self.animate_status("Translating", "#FF9800")
+        streamed = []
+        started = time.perf_counter()
+
+        def on_progress(done, total, piece):
+            # Fill dest_text in order as chunks finish; future is read on the
+            # main thread, once it has been assigned
+            first = not streamed
+            streamed.append(piece)
+            self.bridge.post(
+                lambda: self.show_partial_translation(future, piece, first, done, total)
+            )
+
+        future = self.engine.submit(
+            self.engine.translate(text, *codes, on_progress=on_progress)
+        )
+        self.current_translation = future
+        self.bridge.deliver(
+            future,
+            lambda translated: self.finish_translation(
+                future,
+                translated,
+                streamed,
+                time.perf_counter() - started,
+                request=(text, *codes),
+            ),
+            lambda error: self.fail_translation(future, error),
+        )
+
+    def finish_translation(
+        self, future, translated, streamed, elapsed=None, request=None
+    ):
+        if future is not self.current_translation:
+            return
+        self.current_translation = None
+        self.stop_status_animation()
+        if translated and not streamed:
+            self.dest_writer.replace(translated)
+        if translated and request is not None:
+            text, source_code, target_code = request
+            self.shown_translation = (text, source_code)
+            self.prefetcher.schedule(text, source_code, target_code)
+            self.history.append(source_code, target_code, text, translated)
+        if translated:
+            message = "✅ Translation complete!"
+            if self.show_latency and elapsed is not None:
+                # e.g. "(412 ms; translate.upstream 380 ms)"
+                upstream = METRICS.readout("translate.upstream")
+                message += f" ({elapsed * 1000:.0f} ms" + (
+                    f"; {upstream})" if upstream else ")"
+                )
+            self.status_label.config(text=message, foreground="#4CAF50")
+        self.translate_btn.config(state=tk.NORMAL, text="TRANSLATE →")
+        self.clear_status_later()
+
+    def fail_translation(self, future, error):
+        if future is not self.current_translation:
+            return
+        self.current_translation = None
+        self.stop_status_animation()
+        self.status_label.config(
+            text=f"⚠️ Translation error: {str(error)}", foreground="#FF9800"
+        )
+        self.translate_btn.config(state=tk.NORMAL, text="TRANSLATE →")
+        self.clear_status_later()
+
+    def offer_from_memory(self, text, codes):
+        """Show a near match from translation memory instead of translating.
+
+        Translating the same text again fetches a fresh translation.
+        """
+        memory = self.translation_service.memory
+        key = (text, codes[1])
+        if memory is None or key == self.declined_offer:
+            self.declined_offer = None
+            return False
+        match = memory.suggest(text, codes[1])
+        if match is None:
+            return False
+        self.declined_offer = key
+        self.shown_translation = None
+        self.dest_writer.replace(match.translation)
+        self.status_label.config(
+            text=f"≈ {match.score:.0%} match from translation memory - "
+            "translate again for a fresh one",
+            foreground="#4285F4",
+        )
+        return True
+
+    def on_dest_lang_changed(self, *args):
+        """Show a prefetched translation, or retranslate the shown text"""
+        if self.live_mode.get() or self.shown_translation is None:
+            return
+        text, source_code = self.shown_translation
+        if text != self.source_text.get(1.0, tk.END).strip():
+            return
+        target_code = self.get_language_code(self.dest_lang.get())
+        if not target_code:
+            return
+
+        translated = self.prefetcher.lookup(text, source_code, target_code)
+        if translated is None:
+            self.perform_translation()
+            return
+        self.dest_writer.replace(translated)
+        self.prefetcher.schedule(text, source_code, target_code)
+        self.history.append(source_code, target_code, text, translated)
+        self.status_label.config(
+            text="⚡ Translation ready (prefetched)", foreground="#4CAF50"
+        )
+        self.clear_status_later()
+
+    def show_partial_translation(self, future, piece, first, done, total):
+        """Append the next translated chunk of a long text"""
+        if future is not self.current_translation:
+            return
+        if first:
+            self.dest_writer.replace(piece)
+        else:
+            self.dest_writer.append(piece)
+        self.status_label.config(
+            text=f"Translating... {done}/{total} parts", foreground="#FF9800"
+        )
+
+    # ----------------------- MULTI-TARGET -----------------------
+    def open_fanout_window(self):
+        """Results table for translating the source text into many languages"""
+        window = tk.Toplevel(self.root)
+        window.title("Translate to Many")
+        window.geometry("640x420")
+        window.configure(bg="#f5f5f5")
+
+        controls = tk.Frame(window, bg="#f5f5f5")
+        controls.pack(fill=tk.X, padx=10, pady=(10, 5))
+        tk.Label(controls, text="To:", font=("Arial", 9), bg="#f5f5f5").pack(
+            side=tk.LEFT
+        )
+        # Start from the targets this user translates into most
+        recent = self.prefetcher.history.likely(limit=5)
+        targets = tk.StringVar(
+            value=", ".join(self.catalog.display_name(code) or code for code in recent)
+            or "French, German, Spanish"
+        )
+        tk.Entry(controls, textvariable=targets, font=("Arial", 9)).pack(
+            side=tk.LEFT, fill=tk.X, expand=True, padx=5
+        )
+        tk.Label(controls, text="Parallel:", font=("Arial", 9), bg="#f5f5f5").pack(
+            side=tk.LEFT
+        )
+        concurrency = tk.IntVar(value=6)
+        tk.Spinbox(controls, from_=1, to=32, width=3, textvariable=concurrency).pack(
+            side=tk.LEFT, padx=5
+        )
+
+        table = ttk.Treeview(
+            window, columns=("language", "translation", "time"), show="headings"
+        )
+        table.heading("language", text="Language")
+        table.heading("translation", text="Translation")
+        table.heading("time", text="ms")
+        table.column("language", width=110, stretch=False)
+        table.column("time", width=60, stretch=False, anchor=tk.E)
+        table.pack(fill=tk.BOTH, expand=True, padx=10)
+
+        status = tk.Label(window, text="", font=("Arial", 9), bg="#f5f5f5")
+        status.pack(fill=tk.X, padx=10, pady=5)
+
+        cancelled = threading.Event()
+
+        def start():
+            names = [name.strip() for name in targets.get().split(",")]
+            codes = [self.get_language_code(name) for name in names if name]
+            unknown = [name for name, code in zip(names, codes) if not code]
+            if unknown:
+                status.config(text=f"⚠️ Unknown languages: {', '.join(unknown)}")
+                return
+            text = self.source_text.get(1.0, tk.END).strip()
+            if not text or not codes:
+                return
+            source = self.translation_source(self.src_lang.get())
+            source_code = self.get_language_code(source)
+            if not source_code:
+                return
+            table.delete(*table.get_children())
+            cancelled.clear()
+            self.run_fanout(
+                text, codes, source_code, concurrency.get(), table, status, cancelled
+            )
+
+        tk.Button(
+            controls,
+            text="Start",
+            font=("Arial", 9, "bold"),
+            bg="#4CC210",
+            fg="white",
+            bd=0,
+            padx=10,
+            command=start,
+        ).pack(side=tk.LEFT)
+
+        def close():
+            cancelled.set()
+            window.destroy()
+
+        window.protocol("WM_DELETE_WINDOW", close)
+
+    def run_fanout(
+        self, text, codes, source_code, concurrency, table, status, cancelled
+    ):
+        """Translate on a background thread, adding table rows as results arrive"""
+        fanout = FanOut(
+            self.translation_service.translate,
+            detect=lambda text: self.get_language_code(self.detect_language(text)),
+            concurrency=concurrency,
+        )
+        status.config(text=f"Translating into {len(codes)} languages...")
+        started = time.perf_counter()
+
+        def add_row(result):
+            if cancelled.is_set():
+                return
+            name = self.catalog.display_name(result.target) or result.target
+            translation = (
+                result.translation if result.error is None else f"⚠️ {result.error}"
+            )
+            table.insert(
+                "",
+                tk.END,
+                values=(name, translation, f"{result.seconds * 1000:.0f}"),
+            )
+
+        def finish(results):
+            if cancelled.is_set():
+                return
+            failed = sum(result.error is not None for result in results)
+            message = (
+                f"✅ {len(results)} languages in {time.perf_counter() - started:.1f}s"
+            )
+            status.config(text=message + (f", {failed} failed" if failed else ""))
+
+        def work():
+            _, results = fanout.run(
+                text,
+                codes,
+                source_code,
+                on_result=lambda result: self.bridge.post(add_row, result),
+                cancelled=cancelled,
+            )
+            self.bridge.post(finish, results)
+
+        threading.Thread(target=work, daemon=True).start()
+
+    # ----------------------- HISTORY -----------------------
+    def open_history_window(self):
+        """Searchable list of past translations; double-click to restore one"""
+        window = tk.Toplevel(self.root)
+        window.title("History")
+        window.geometry("720x420")
+        window.configure(bg="#f5f5f5")
+
+        controls = tk.Frame(window, bg="#f5f5f5")
+        controls.pack(fill=tk.X, padx=10, pady=(10, 5))
+        tk.Label(controls, text="Search:", font=("Arial", 9), bg="#f5f5f5").pack(
+            side=tk.LEFT
+        )
+        query = tk.StringVar()
+        entry = tk.Entry(controls, textvariable=query, font=("Arial", 9))
+        entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        entry.focus_set()
+
+        table = ttk.Treeview(
+            window,
+            columns=("time", "languages", "text", "translation"),
+            show="headings",
+        )
+        table.heading("time", text="Time")
+        table.heading("languages", text="Languages")
+        table.heading("text", text="Text")
+        table.heading("translation", text="Translation")
+        table.column("time", width=120, stretch=False)
+        table.column("languages", width=80, stretch=False)
+        table.pack(fill=tk.BOTH, expand=True, padx=10)
+
+        status = tk.Label(window, text="", font=("Arial", 9), bg="#f5f5f5")
+        status.pack(fill=tk.X, padx=10, pady=5)
+
+        records = {}
+        pending = [None]
+
+        def refresh():
+            pending[0] = None
+            started = time.perf_counter()
+            results = self.history.search(query.get(), limit=200)
+            elapsed = time.perf_counter() - started
+            table.delete(*table.get_children())
+            records.clear()
+            for record in results:
+                item = table.insert(
+                    "",
+                    tk.END,
+                    values=(
+                        time.strftime(
+                            "%Y-%m-%d %H:%M", time.localtime(record.timestamp)
+                        ),
+                        f"{record.source} → {record.target}",
+                        record.text[:200].replace("\n", " "),
+                        record.translation[:200].replace("\n", " "),
+                    ),
+                )
+                records[item] = record
+            status.config(
+                text=f"{len(results)} of {self.history.count} entries "
+                f"({elapsed * 1000:.0f} ms)"
+            )
+
+        def on_query_changed(*args):
+            # Search once typing pauses rather than on every keystroke
+            if pending[0] is not None:
+                window.after_cancel(pending[0])
+            pending[0] = window.after(150, refresh)
+
+        def restore(event=None):
+            record = records.get(table.focus())
+            if record is None:
+                return
+            # Not a language switch on the shown result: nothing to retranslate
+            self.shown_translation = None
+            self.last_manual_change_time = time.time()
+            for code, var in (
+                (record.source, self.src_lang),
+                (record.target, self.dest_lang),
+            ):
+                name = self.catalog.display_name(code)
+                if name:
+                    var.set(name)
+            self.source_text.delete(1.0, tk.END)
+            self.source_text.insert(tk.END, record.text)
+            self.dest_writer.replace(record.translation)
+            self.shown_translation = (record.text, record.source)
+
+        query.trace_add("write", on_query_changed)
+        table.bind("<Double-1>", restore)
+        table.bind("<Return>", restore)
+        refresh()
+
+    # ----------------------- SUBTITLES -----------------------
+    def translate_subtitles(self):
+        """Translate an SRT/VTT file into a new file, keeping the cue timing"""
+        codes = self.resolve_language_codes(
+            self.translation_source(self.src_lang.get()), self.dest_lang.get()
+        )
+        if not codes:
+            return
+        path = filedialog.askopenfilename(
+            title="Subtitles to translate",
+            filetypes=[("Subtitles", "*.srt *.vtt"), ("All files", "*.*")],
+        )
+        if not path:
+            return
+        suggested = default_output(path, codes[1])
+        output = filedialog.asksaveasfilename(
+            title="Save translated subtitles",
+            initialdir=os.path.dirname(suggested),
+            initialfile=os.path.basename(suggested),
+        )
+        if not output:
+            return
+
+        def on_progress(progress):
+            elapsed = max(time.perf_counter() - progress.start, 1e-9)
+            self.set_status(
+                f"🎬 Subtitles: {progress.records} cues "
+                f"({progress.records / elapsed:.0f} cues/s)",
+                "#FF9800",
+            )
 
+        def work():
             try:
-                # Use auto-detection if enabled or if source is set to Auto
-                source = (
-                    "auto"
-                    if (self.auto_detect_enabled or src_lang == "Auto")
-                    else src_lang
+                progress = subtitles.run(
+                    path,
+                    output,
+                    lambda text: self.translation_service.translate(text, *codes),
+                    progress=Throughput(unit="cues", interval=float("inf")),
+                    on_progress=on_progress,
                 )
-                translated = self.translate_text(text, source, dest_lang)
-                if translated:
-                    self.dest_text.delete(1.0, tk.END)
-                    self.dest_text.insert(tk.END, translated)
-                    self.status_label.config(
-                        text="✅ Translation complete!", foreground="#4CAF50"
-                    )
-            finally:
-                self.translate_btn.config(state=tk.NORMAL, text="TRANSLATE →")
-                self.root.after(3000, lambda: self.status_label.config(text=""))
-
-        threading.Thread(target=_translate, daemon=True).start()
+            except Exception as e:
+                self.set_status(f"⚠️ Subtitle error: {str(e)}", "#FF9800")
+                return
+            message = f"✅ {progress.records} cues saved to {os.path.basename(output)}"
+            if progress.errors:
+                message += f" ({progress.errors} left untranslated)"
+            self.set_status(message, "#4CAF50")
+
+        threading.Thread(target=work, daemon=True).start()
 
     # ----------------------- SPEECH -----------------------
     def speak_text(self, text, language):
@@ -296,169 +809,132 @@ class TranslatorApp:
             )
             return
 
-        def _speak():
-            try:
-                # Stop any currently playing audio
-                if pygame.mixer.music.get_busy():
-                    pygame.mixer.music.stop()
-
-                # Close any open file handles
-                if hasattr(self, "current_audio_file") and self.current_audio_file:
-                    try:
-                        if os.path.exists(self.current_audio_file):
-                            pygame.mixer.music.unload()
-                    except:
-                        pass
-
-                # Get language code from properly capitalized name
-                lang_code = self.get_language_code(language)
-                if not lang_code:
-                    lang_code = "en"  # Fallback to English
-
-                # Check if TTS is supported for this language
-                if lang_code not in self.tts_languages:
-                    self.status_label.config(
-                        text=f"⚠️ TTS not available for {language}, using English",
-                        foreground="#FF9800",
-                    )
-                    lang_code = "en"  # Fallback to English
-
-                with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as fp:
-                    temp_file = fp.name
-                    try:
-                        tts = gTTS(text=text, lang=lang_code, slow=False)
-                        tts.save(temp_file)
-                    except Exception as e:
-                        self.status_label.config(
-                            text=f"⚠️ Could not generate speech: {str(e)}",
-                            foreground="#FF9800",
-                        )
-                        return
-
-                    # Track the file for cleanup
-                    self.audio_files.append(temp_file)
-                    self.current_audio_file = temp_file
-
-                # Ensure file is fully written and closed before loading
-                time.sleep(0.1)
-
-                try:
-                    pygame.mixer.music.load(self.current_audio_file)
-                    pygame.mixer.music.play()
-
-                    # Wait for playback to finish
-                    while pygame.mixer.music.get_busy():
-                        time.sleep(0.1)
-
-                except Exception as e:
-                    self.status_label.config(
-                        text=f"⚠️ Could not play audio: {str(e)}", foreground="#FF9800"
-                    )
+        # Get language code from properly capitalized name
+        lang_code = self.get_language_code(language)
+        if not lang_code:
+            lang_code = "en"  # Fallback to English
 
-            except Exception as e:
-                self.status_label.config(
-                    text=f"⚠️ Could not speak: {str(e)}", foreground="#FF9800"
-                )
+        # Check if TTS is supported for this language
+        if not self.catalog.supports(lang_code, "tts"):
+            self.status_label.config(
+                text=f"⚠️ TTS not available for {language}, using English",
+                foreground="#FF9800",
+            )
+            lang_code = "en"  # Fallback to English
+
+        # Sentences play as soon as they are ready; this interrupts any playback
+        self.speech_pipeline.speak(text, lang_code)
 
-        threading.Thread(target=_speak, daemon=True).start()
+    def synthesize_sentence(self, sentence, lang_code):
+        """Return the MP3 bytes of one sentence, synthesizing on a miss"""
+
+        def synthesize():
+            with METRICS.span("tts.synthesize"):
+                data = self.providers.tts.synthesize_bytes(sentence, lang_code)
+            METRICS.inc("tts_bytes", len(data))
+            return data
+
+        # Replay cached speech without calling gTTS again
+        METRICS.inc("tts_sentences")
+        return self.audio_cache.get_or_create_bytes(
+            sentence, lang_code, False, synthesize
+        )
+
+    def stop_speaking(self):
+        self.speech_pipeline.stop()
+
+    def on_speech_error(self, error):
+        self.set_status(f"⚠️ Could not speak: {str(error)}", "#FF9800")
+
+    def recognize_speech(self, audio, lang_code):
+        return self.providers.stt.recognize(audio, lang_code)
+
+    def recognize_segment(self, segment):
+        """Recognize one VAD phrase; runs on the voice pipeline's workers"""
+        audio = sr.AudioData(segment.data, segment.sample_rate, segment.sample_width)
+        with METRICS.span("stt.recognize"):
+            return self.engine.call(self.engine.recognize(audio, self.voice_lang_code))
 
     def start_voice_input(self):
+        # The button toggles continuous listening
         if self.listening:
+            self.voice.stop()
+            self.finish_voice_input()
             return
 
-        def _listen():
-            self.listening = True
-            self.voice_btn.config(text="🎙️ Listening...", bg="#FF5722", fg="white")
-            self.status_label.config(
-                text="🎤 Adjusting microphone...", foreground="#FF5722"
+        lang_name = self.src_lang.get()
+        # If source language is set to Auto, use English for speech recognition
+        if lang_name == "Auto":
+            lang_code = "en"
+        else:
+            lang_code = self.get_language_code(lang_name)
+            if not lang_code:
+                lang_code = "en"  # Fallback to English
+
+        # Check if speech recognition is supported for this language
+        if not self.catalog.supports(lang_code, "stt"):
+            lang_code = "en"  # Fallback to English
+            self.voice_warning = "⚠️ Speech recognition may not work for this language"
+        else:
+            self.voice_warning = None
+
+        self.voice_lang_code = lang_code
+        self.voice_phrases = 0
+        self.listening = True
+        self.voice_btn.config(text="⏹ Stop Listening", bg="#FF5722", fg="white")
+        self.status_label.config(text="🎤 Opening microphone...", foreground="#FF5722")
+
+        if self.voice is None:
+            # The stream and the calibrated threshold outlive a single press
+            self.voice = VoicePipeline(
+                MicrophoneSource,
+                self.recognize_segment,
+                on_text=self.on_voice_text,
+                on_error=self.on_voice_error,
+                on_listening=self.on_voice_listening,
             )
-            self.root.update()
-
-            try:
-                with self.microphone as source:
-                    self.recognizer.dynamic_energy_threshold = True
-                    self.recognizer.adjust_for_ambient_noise(source, duration=1.5)
-
-                    self.status_label.config(
-                        text="🎧 Listening... Speak clearly", foreground="#4285F4"
-                    )
-                    self.root.update()
-
-                    audio = self.recognizer.listen(
-                        source, timeout=5, phrase_time_limit=8
-                    )
-
-                    self.status_label.config(
-                        text="⌛ Processing speech...", foreground="#FF9800"
-                    )
-                    self.root.update()
-
-                    try:
-                        lang_name = self.src_lang.get()
-                        # If source language is set to Auto, use English for speech recognition
-                        if lang_name == "Auto":
-                            lang_code = "en"
-                        else:
-                            lang_code = self.get_language_code(lang_name)
-                            if not lang_code:
-                                lang_code = "en"  # Fallback to English
-
-                        # Check if speech recognition is supported for this language
-                        if lang_code not in [
-                            "en",
-                            "hi",
-                            "es",
-                            "fr",
-                            "de",
-                            "it",
-                            "pt",
-                            "ru",
-                            "zh-CN",
-                            "ja",
-                            "ko",
-                        ]:
-                            self.status_label.config(
-                                text="⚠️ Speech recognition may not work for this language",
-                                foreground="#FF9800",
-                            )
-                            lang_code = "en"  # Fallback to English
-
-                        text = self.recognizer.recognize_google(
-                            audio, language=lang_code
-                        )
-
-                        if text.strip():
-                            self.source_text.delete(1.0, tk.END)
-                            self.source_text.insert(tk.END, text.capitalize())
-                            self.status_label.config(
-                                text="✅ Voice input successful!", foreground="#4CAF50"
-                            )
-                            self.perform_translation()
-                        else:
-                            self.status_label.config(
-                                text="⚠️ No speech detected", foreground="#F44336"
-                            )
-
-                    except sr.UnknownValueError:
-                        self.status_label.config(
-                            text="❌ Could not understand audio", foreground="#F44336"
-                        )
-                    except sr.RequestError as e:
-                        self.status_label.config(
-                            text=f"🚫 API Error: {e}", foreground="#F44336"
-                        )
+        self.voice.start()
 
-            except Exception as e:
-                self.status_label.config(
-                    text=f"⚠️ Error: {str(e)}", foreground="#F44336"
-                )
+    def on_voice_listening(self):
+        self.set_status(
+            self.voice_warning or "🎧 Listening... Speak clearly", "#4285F4"
+        )
 
-            finally:
-                self.listening = False
-                self.voice_btn.config(text="🎤 Voice Input", bg="#4CC210", fg="white")
-                self.root.after(3000, lambda: self.status_label.config(text=""))
+    def on_voice_text(self, text, segment):
+        METRICS.observe("stt.end_to_text", time.perf_counter() - segment.ended_at)
+        self.bridge.post(self.apply_voice_text, text)
+
+    def on_voice_error(self, error):
+        if isinstance(error, sr.RequestError):
+            self.set_status(f"🚫 API Error: {error}", "#F44336")
+        else:
+            self.set_status(f"⚠️ Error: {str(error)}", "#F44336")
+        if not self.voice.active:
+            self.bridge.post(self.finish_voice_input)
+
+    def apply_voice_text(self, text):
+        """Put a recognized phrase in the source box and translate it"""
+        if not self.listening:
+            return
+        text = text.capitalize()
+        if self.voice_phrases == 0:
+            # The first phrase of a press replaces the text, later ones append
+            self.source_text.delete(1.0, tk.END)
+        else:
+            self.source_text.insert(tk.END, " ")
+        self.source_text.insert(tk.END, text)
+        self.voice_phrases += 1
+        self.status_label.config(
+            text="✅ Voice input successful!", foreground="#4CAF50"
+        )
+        self.perform_translation()
 
-        threading.Thread(target=_listen, daemon=True).start()
+    def finish_voice_input(self):
+        if not self.listening:
+            return
+        self.listening = False
+        self.voice_btn.config(text="🎤 Voice Input", bg="#4CC210", fg="white")
+        self.clear_status_later()
 
     # ----------------------- UI -----------------------
     def swap_languages(self):
@@ -569,6 +1045,22 @@ class TranslatorApp:
             ),
         ).pack(side=tk.LEFT, padx=5)
 
+        # Stop button interrupts playback and any pending synthesis
+        tk.Button(
+            button_container,
+            text="Stop Audio",
+            font=("Arial", 10, "bold"),
+            bg="#E57373",
+            fg="white",
+            bd=0,
+            padx=12,
+            pady=6,
+            relief="flat",
+            activebackground="#d32f2f",
+            activeforeground="white",
+            command=self.stop_speaking,
+        ).pack(side=tk.LEFT, padx=5)
+
         lang_controls = tk.Frame(source_frame, bg="#ffffff")
         lang_controls.pack(fill=tk.X, pady=(0, 0))
 
@@ -625,6 +1117,16 @@ class TranslatorApp:
         )
         self.translate_btn.pack(side=tk.RIGHT)
 
+        # Live mode retranslates while typing
+        self.live_mode = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            lang_controls,
+            text="Live",
+            variable=self.live_mode,
+            font=("Arial", 9),
+            bg="#ffffff",
+        ).pack(side=tk.RIGHT, padx=(0, 5))
+
         # Destination Section with scrollbar
         dest_frame = tk.LabelFrame(
             main_frame,
@@ -665,8 +1167,11 @@ class TranslatorApp:
         dest_btn_frame = tk.Frame(dest_frame, bg="#ffffff")
         dest_btn_frame.pack(fill=tk.X, pady=(5, 5))
 
+        dest_button_container = tk.Frame(dest_btn_frame, bg="#ffffff")
+        dest_button_container.pack(expand=True)
+
         tk.Button(
-            dest_btn_frame,
+            dest_button_container,
             text="Speak Translation",
             font=("Arial", 10, "bold"),
             bg="#64B5F6",
@@ -677,7 +1182,46 @@ class TranslatorApp:
             command=lambda: self.speak_text(
                 self.dest_text.get(1.0, tk.END).strip(), self.dest_lang.get()
             ),
-        ).pack()
+        ).pack(side=tk.LEFT, padx=5)
+
+        # Translate the source text into a list of languages at once
+        tk.Button(
+            dest_button_container,
+            text="Translate to Many",
+            font=("Arial", 10, "bold"),
+            bg="#4CC210",
+            fg="white",
+            bd=0,
+            padx=12,
+            pady=5,
+            command=self.open_fanout_window,
+        ).pack(side=tk.LEFT, padx=5)
+
+        # Translate an SRT/VTT file with the selected languages
+        tk.Button(
+            dest_button_container,
+            text="Translate Subtitles",
+            font=("Arial", 10, "bold"),
+            bg="#64B5F6",
+            fg="white",
+            bd=0,
+            padx=12,
+            pady=5,
+            command=self.translate_subtitles,
+        ).pack(side=tk.LEFT, padx=5)
+
+        # Search and restore earlier translations
+        tk.Button(
+            dest_button_container,
+            text="History",
+            font=("Arial", 10, "bold"),
+            bg="#64B5F6",
+            fg="white",
+            bd=0,
+            padx=12,
+            pady=5,
+            command=self.open_history_window,
+        ).pack(side=tk.LEFT, padx=5)
 
         # Status Bar
         self.status_label = tk.Label(
@@ -702,6 +1246,12 @@ class TranslatorApp:
 
 
 if __name__ == "__main__":
+    if sys.argv[1:2] == ["--serve"]:
+        # Headless shared service instead of the window
+        import translation_server
+
+        sys.exit(translation_server.main(sys.argv[2:]))
+
     root = tk.Tk()
     app = TranslatorApp(root)
     root.mainloop()
@@ -0,0 +1,271 @@
+import bisect
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+import unicodedata
+from collections import namedtuple
+
+from app_paths import cache_path
+from metrics import METRICS
+
+# timestamp, source code length, target code length, text length, translation length
+HEADER = struct.Struct("<dBBII")
+# log offset, search-file offset
+ENTRY = struct.Struct("<QQ")
+_WORD = re.compile(r"\w+")
+
+Record = namedtuple("Record", "number timestamp source target text translation")
+
+
+def search_terms(text):
+    """Casefolded words, as stored in the search file and parsed from queries"""
+    return _WORD.findall(unicodedata.normalize("NFC", text).casefold())
+
+
+class _Map:
+    """Read-only mmap of an append-only file, remapped when it has grown"""
+
+    def __init__(self, path):
+        self.path = path
+        self.map = None
+        self.size = 0
+
+    def view(self, needed):
+        if self.map is None or needed > self.size:
+            self.close()
+            size = os.path.getsize(self.path)
+            if size:
+                with open(self.path, "rb") as f:
+                    self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self.size = size
+        return self.map
+
+    def close(self):
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+
+
+class _SearchOffsets:
+    """Sequence view of the search-file offsets, for bisect"""
+
+    def __init__(self, history):
+        self.history = history
+
+    def __len__(self):
+        return self.history.count
+
+    def __getitem__(self, i):
+        return self.history._entry(i)[1]
+
+
+class TranslationHistory:
+    """Append-only translation history with an offset index and search.
+
+    ``history.log`` holds compact binary records, ``history.idx`` one
+    fixed-size (log offset, search offset) entry per record and
+    ``history.search`` one casefolded line of words per record. All three
+    are only ever appended to and are read through mmap, so opening a long
+    history costs nothing and the OS pages data in on demand. A search
+    scans the word file backwards with ``mmap.rfind`` (newest first) and
+    stops as soon as ``limit`` results are found. An interrupted append is
+    repaired on open.
+    """
+
+    def __init__(self, directory=None):
+        directory = directory or os.path.dirname(cache_path("history.log"))
+        self.log_path = os.path.join(directory, "history.log")
+        self.index_path = os.path.join(directory, "history.idx")
+        self.search_path = os.path.join(directory, "history.search")
+        self._lock = threading.Lock()
+        self.searches = 0
+        self.search_seconds = 0.0
+        for path in (self.log_path, self.index_path, self.search_path):
+            open(path, "ab").close()
+        self._repair()
+
+        self.count = os.path.getsize(self.index_path) // ENTRY.size
+        self._log = open(self.log_path, "ab")
+        self._index = open(self.index_path, "ab")
+        self._search = open(self.search_path, "ab")
+        self._log_map = _Map(self.log_path)
+        self._index_map = _Map(self.index_path)
+        self._search_map = _Map(self.search_path)
+
+    # ----------------------- WRITING -----------------------
+    @staticmethod
+    def _encode(timestamp, source, target, text, translation):
+        fields = [s.encode("utf-8") for s in (source, target, text, translation)]
+        return HEADER.pack(timestamp, *map(len, fields)) + b"".join(fields)
+
+    @staticmethod
+    def _search_line(text, translation):
+        # Each word once: a line only has to say whether it contains a word
+        words = dict.fromkeys(search_terms(text) + search_terms(translation))
+        return (" " + " ".join(words) + " \n").encode("utf-8")
+
+    def append(self, source, target, text, translation, timestamp=None):
+        """Record one translation; returns its record number"""
+        timestamp = time.time() if timestamp is None else timestamp
+        record = self._encode(timestamp, source, target, text, translation)
+        line = self._search_line(text, translation)
+        with self._lock:
+            log_offset, search_offset = self._log.tell(), self._search.tell()
+            # Log first, index last: a crash leaves at most an unindexed tail
+            self._log.write(record)
+            self._log.flush()
+            self._search.write(line)
+            self._search.flush()
+            self._index.write(ENTRY.pack(log_offset, search_offset))
+            self._index.flush()
+            self.count += 1
+            return self.count - 1
+
+    def _repair(self):
+        """Drop torn writes and index records the log has but the index lacks"""
+        log_size = os.path.getsize(self.log_path)
+        with open(self.index_path, "r+b") as index:
+            entries = os.path.getsize(self.index_path) // ENTRY.size
+            index.truncate(entries * ENTRY.size)
+            with open(self.log_path, "rb") as log:
+
+                def record_end(offset):
+                    log.seek(offset)
+                    header = log.read(HEADER.size)
+                    if len(header) < HEADER.size:
+                        return None
+                    end = offset + HEADER.size + sum(HEADER.unpack(header)[1:])
+                    return end if end <= log_size else None
+
+                log_end = search_end = 0
+                while entries:
+                    index.seek((entries - 1) * ENTRY.size)
+                    log_offset, search_offset = ENTRY.unpack(index.read(ENTRY.size))
+                    end = record_end(log_offset)
+                    if end is not None:
+                        log_end, search_end = end, search_offset
+                        break
+                    entries -= 1
+                index.truncate(entries * ENTRY.size)
+
+                with open(self.search_path, "r+b") as search:
+                    if entries:
+                        search.seek(search_end)
+                        search_end += len(search.readline())
+                    search.truncate(search_end)
+                    search.seek(search_end)
+                    index.seek(entries * ENTRY.size)
+                    # Records written after the last index entry
+                    offset = log_end
+                    while True:
+                        end = record_end(offset)
+                        if end is None:
+                            break
+                        log.seek(offset)
+                        record = self._decode(log.read(end - offset))
+                        index.write(ENTRY.pack(offset, search.tell()))
+                        search.write(self._search_line(record[3], record[4]))
+                        offset = end
+        with open(self.log_path, "r+b") as log:
+            log.truncate(offset)
+
+    # ----------------------- READING -----------------------
+    @staticmethod
+    def _decode(data):
+        timestamp, *lengths = HEADER.unpack_from(data)
+        fields, position = [], HEADER.size
+        for length in lengths:
+            fields.append(bytes(data[position : position + length]).decode("utf-8"))
+            position += length
+        return (timestamp, *fields)
+
+    def _entry(self, number):
+        offset = (number + 1) * ENTRY.size
+        return ENTRY.unpack_from(self._index_map.view(offset), offset - ENTRY.size)
+
+    def get(self, number):
+        with self._lock:
+            log_offset, _ = self._entry(number)
+            log = self._log_map.view(log_offset + HEADER.size)
+            lengths = HEADER.unpack_from(log, log_offset)[1:]
+            end = log_offset + HEADER.size + sum(lengths)
+            log = self._log_map.view(end)
+            return Record(number, *self._decode(log[log_offset:end]))
+
+    def recent(self, limit=100):
+        """Newest records first"""
+        return [
+            self.get(n)
+            for n in range(self.count - 1, max(-1, self.count - 1 - limit), -1)
+        ]
+
+    def search(self, query, limit=100, prefix=True):
+        """Newest records containing every word of query.
+
+        With ``prefix`` a query word matches words starting with it
+        ("transl" finds "translation"); otherwise it matches anywhere.
+        """
+        terms = search_terms(query)
+        if not terms:
+            return self.recent(limit)
+        lead = " " if prefix else ""
+        needles = list(dict.fromkeys((lead + term).encode("utf-8") for term in terms))
+
+        start = time.perf_counter()
+        with METRICS.span("history.search"):
+            numbers = self._scan(needles, limit)
+        with self._lock:
+            self.searches += 1
+            self.search_seconds += time.perf_counter() - start
+        return [self.get(number) for number in numbers]
+
+    def _scan(self, needles, limit):
+        numbers = []
+        with self._lock:
+            if not self.count:
+                return numbers
+            last_offset = self._entry(self.count - 1)[1]
+            data = self._search_map.view(last_offset + 1)
+            end = data.find(b"\n", last_offset) + 1
+            offsets = _SearchOffsets(self)
+            while len(numbers) < limit:
+                # Newest line holding each word; when they disagree, only the
+                # oldest of those lines and earlier ones can hold all words,
+                # so every word jumps back there (the rarest leads the way)
+                starts = set()
+                for needle in needles:
+                    position = data.rfind(needle, 0, end)
+                    if position < 0:
+                        return numbers
+                    starts.add(data.rfind(b"\n", 0, position) + 1)
+                start = min(starts)
+                if len(starts) == 1:
+                    numbers.append(bisect.bisect_right(offsets, start) - 1)
+                    end = start
+                else:
+                    end = data.find(b"\n", start) + 1
+        return numbers
+
+    def stats(self):
+        with self._lock:
+            return {
+                "records": self.count,
+                "log_bytes": os.path.getsize(self.log_path),
+                "search_bytes": os.path.getsize(self.search_path),
+                "searches": self.searches,
+                "avg_search_ms": (
+                    self.search_seconds / self.searches * 1000
+                    if self.searches
+                    else None
+                ),
+            }
+
+    def close(self):
+        with self._lock:
+            for f in (self._log, self._index, self._search):
+                f.close()
+            for m in (self._log_map, self._index_map, self._search_map):
+                m.close()
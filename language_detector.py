@@ -0,0 +1,266 @@
+import math
+import unicodedata
+from collections import Counter
+
+
+# Scripts used by a single language map straight to that language's code
+SCRIPT_LANGUAGES = {
+    "BENGALI": "bn",
+    "GURMUKHI": "pa",
+    "GUJARATI": "gu",
+    "ORIYA": "or",
+    "TAMIL": "ta",
+    "TELUGU": "te",
+    "KANNADA": "kn",
+    "MALAYALAM": "ml",
+    "SINHALA": "si",
+    "THAI": "th",
+    "LAO": "lo",
+    "MYANMAR": "my",
+    "KHMER": "km",
+    "GEORGIAN": "ka",
+    "ARMENIAN": "hy",
+    "ETHIOPIC": "am",
+    "HANGUL": "ko",
+    "HIRAGANA": "ja",
+    "KATAKANA": "ja",
+    "GREEK": "el",
+    "HEBREW": "iw",
+}
+
+# Scripts shared by several languages; the first code is the usual default
+SHARED_SCRIPTS = {
+    "DEVANAGARI": ("hi", "mr", "ne"),
+    "ARABIC": ("ar", "fa", "ur"),
+    "CYRILLIC": ("ru", "uk", "bg", "sr"),
+    "CJK": ("zh-CN", "ja"),
+    "LATIN": (),
+}
+
+# Letters that are rare outside a handful of languages sharing a script
+MARKER_LETTERS = {
+    "es": "ñ¿¡",
+    "pt": "ãõç",
+    "fr": "çœèêàùû",
+    "de": "ßäöü",
+    "it": "ìò",
+    "sv": "åäö",
+    "pl": "łąęśźżń",
+    "tr": "ığşİüç",
+    "ru": "ыэё",
+    "uk": "іїєґ",
+    "bg": "ъщ",
+    "mr": "ळ",
+    "fa": "پچژگ",
+    "ur": "ٹڈڑںےھ",
+}
+
+# Short reference texts used to build character trigram profiles
+SAMPLES = {
+    "en": "All human beings are born free and equal in dignity and rights. "
+    "They are endowed with reason and conscience and should act towards one "
+    "another in a spirit of brotherhood. The quick brown fox jumps over the "
+    "lazy dog. What is your name? I would like to know where the station is "
+    "and how much this costs. Thank you very much, have a nice day.",
+    "es": "Todos los seres humanos nacen libres e iguales en dignidad y "
+    "derechos y, dotados como están de razón y conciencia, deben comportarse "
+    "fraternalmente los unos con los otros. ¿Cómo te llamas? Me gustaría "
+    "saber dónde está la estación y cuánto cuesta esto. Muchas gracias, que "
+    "tengas un buen día.",
+    "fr": "Tous les êtres humains naissent libres et égaux en dignité et en "
+    "droits. Ils sont doués de raison et de conscience et doivent agir les "
+    "uns envers les autres dans un esprit de fraternité. Comment "
+    "t'appelles-tu? Je voudrais savoir où se trouve la gare et combien cela "
+    "coûte. Merci beaucoup, bonne journée.",
+    "de": "Alle Menschen sind frei und gleich an Würde und Rechten geboren. "
+    "Sie sind mit Vernunft und Gewissen begabt und sollen einander im Geiste "
+    "der Brüderlichkeit begegnen. Wie heißt du? Ich möchte wissen, wo der "
+    "Bahnhof ist und wie viel das kostet. Vielen Dank, einen schönen Tag "
+    "noch.",
+    "it": "Tutti gli esseri umani nascono liberi ed eguali in dignità e "
+    "diritti. Essi sono dotati di ragione e di coscienza e devono agire gli "
+    "uni verso gli altri in spirito di fratellanza. Come ti chiami? Vorrei "
+    "sapere dove si trova la stazione e quanto costa questo. Grazie mille, "
+    "buona giornata.",
+    "pt": "Todos os seres humanos nascem livres e iguais em dignidade e em "
+    "direitos. Dotados de razão e de consciência, devem agir uns para com os "
+    "outros em espírito de fraternidade. Como você se chama? Eu gostaria de "
+    "saber onde fica a estação e quanto custa isso. Muito obrigado, tenha "
+    "um bom dia.",
+    "nl": "Alle mensen worden vrij en gelijk in waardigheid en rechten "
+    "geboren. Zij zijn begiftigd met verstand en geweten, en behoren zich "
+    "jegens elkander in een geest van broederschap te gedragen. Hoe heet je? "
+    "Ik zou graag willen weten waar het station is en hoeveel dit kost. "
+    "Hartelijk bedankt, een fijne dag nog.",
+    "sv": "Alla människor är födda fria och lika i värde och rättigheter. De "
+    "har utrustats med förnuft och samvete och bör handla gentemot varandra "
+    "i en anda av broderskap. Vad heter du? Jag skulle vilja veta var "
+    "stationen ligger och hur mycket det här kostar. Tack så mycket, ha en "
+    "trevlig dag.",
+    "pl": "Wszyscy ludzie rodzą się wolni i równi pod względem swej godności "
+    "i swych praw. Są oni obdarzeni rozumem i sumieniem i powinni postępować "
+    "wobec innych w duchu braterstwa. Jak masz na imię? Chciałbym wiedzieć, "
+    "gdzie jest dworzec i ile to kosztuje. Dziękuję bardzo, miłego dnia.",
+    "tr": "Bütün insanlar hür, haysiyet ve haklar bakımından eşit doğarlar. "
+    "Akıl ve vicdana sahiptirler ve birbirlerine karşı kardeşlik zihniyeti "
+    "ile hareket etmelidirler. Adın ne? İstasyonun nerede olduğunu ve bunun "
+    "ne kadar tuttuğunu öğrenmek istiyorum. Çok teşekkür ederim, iyi günler.",
+    "id": "Semua orang dilahirkan merdeka dan mempunyai martabat dan hak-hak "
+    "yang sama. Mereka dikaruniai akal dan hati nurani dan hendaknya bergaul "
+    "satu sama lain dalam semangat persaudaraan. Siapa nama kamu? Saya ingin "
+    "tahu di mana stasiunnya dan berapa harganya. Terima kasih banyak, "
+    "semoga harimu menyenangkan.",
+    "ru": "Все люди рождаются свободными и равными в своем достоинстве и "
+    "правах. Они наделены разумом и совестью и должны поступать в отношении "
+    "друг друга в духе братства. Как тебя зовут? Я хотел бы знать, где "
+    "находится вокзал и сколько это стоит. Большое спасибо, хорошего дня.",
+    "uk": "Всі люди народжуються вільними і рівними у своїй гідності та "
+    "правах. Вони наділені розумом і совістю і повинні діяти у відношенні "
+    "один до одного в дусі братерства. Як тебе звати? Я хотів би знати, де "
+    "знаходиться вокзал і скільки це коштує. Щиро дякую, гарного дня.",
+    "bg": "Всички хора се раждат свободни и равни по достойнство и права. Те "
+    "са надарени с разум и съвест и следва да се отнасят помежду си в дух на "
+    "братство. Как се казваш? Бих искал да знам къде е гарата и колко струва "
+    "това. Много благодаря, приятен ден.",
+    "hi": "सभी मनुष्यों को गौरव और अधिकारों के मामले में जन्मजात स्वतन्त्रता "
+    "और समानता प्राप्त है। उन्हें बुद्धि और अन्तरात्मा की देन प्राप्त है और "
+    "परस्पर उन्हें भाईचारे के भाव से बर्ताव करना चाहिए। आपका नाम क्या है? "
+    "मैं जानना चाहता हूँ कि स्टेशन कहाँ है और यह कितने का है। बहुत धन्यवाद।",
+    "mr": "सर्व मानवी व्यक्ति जन्मतःच स्वतंत्र आहेत व त्यांना समान प्रतिष्ठा "
+    "व समान अधिकार आहेत. त्यांना विचारशक्ती व सदसद्विवेकबुद्धी लाभलेली "
+    "आहे व त्यांनी एकमेकांशी बंधुत्वाच्या भावनेने आचरण करावे. तुझे नाव "
+    "काय आहे? स्टेशन कुठे आहे आणि याची किंमत किती आहे हे मला जाणून "
+    "घ्यायचे आहे. खूप धन्यवाद.",
+    "ar": "يولد جميع الناس أحرارًا متساوين في الكرامة والحقوق. وقد وهبوا "
+    "عقلًا وضميرًا وعليهم أن يعامل بعضهم بعضًا بروح الإخاء. ما اسمك؟ أود "
+    "أن أعرف أين المحطة وكم يكلف هذا. شكرا جزيلا، أتمنى لك يوما سعيدا.",
+    "fa": "تمام افراد بشر آزاد به دنیا می‌آیند و از لحاظ حیثیت و حقوق با هم "
+    "برابرند. همه دارای عقل و وجدان هستند و باید نسبت به یکدیگر با روح "
+    "برادری رفتار کنند. اسم شما چیست؟ می‌خواهم بدانم ایستگاه کجاست و این "
+    "چقدر می‌شود. خیلی ممنونم، روز خوبی داشته باشید.",
+    "ur": "تمام انسان آزاد اور حقوق و عزت کے اعتبار سے برابر پیدا ہوئے ہیں۔ "
+    "انہیں ضمیر اور عقل ودیعت ہوئی ہے۔ اس لئے انہیں ایک دوسرے کے ساتھ بھائی "
+    "چارے کا سلوک کرنا چاہیئے۔ آپ کا نام کیا ہے؟ میں جاننا چاہتا ہوں کہ "
+    "اسٹیشن کہاں ہے اور یہ کتنے کا ہے۔ بہت شکریہ۔",
+}
+
+
+def script_of(char):
+    """Return the Unicode script name of a character (or None for non-letters)"""
+    if not char.isalpha():
+        return None
+    try:
+        name = unicodedata.name(char)
+    except ValueError:
+        return None
+    if name.startswith("CJK"):
+        return "CJK"
+    for script in SCRIPT_LANGUAGES:
+        if name.startswith(script):
+            return script
+    for script in SHARED_SCRIPTS:
+        if name.startswith(script):
+            return script
+    return None
+
+
+def trigrams(text):
+    """Count character trigrams of a lowercased, space-padded text"""
+    words = "".join(c if c.isalpha() else " " for c in text.lower()).split()
+    counts = Counter()
+    for word in words:
+        padded = f" {word} "
+        for i in range(len(padded) - 2):
+            counts[padded[i : i + 3]] += 1
+    return counts
+
+
+class LocalLanguageDetector:
+    """Offline language detector combining script and trigram evidence.
+
+    ``detect`` returns a (language code, confidence) pair. Confidence is in
+    [0, 1]; callers should fall back to a remote detector when it is low.
+    """
+
+    def __init__(self, supported_codes=None, max_chars=400):
+        self.max_chars = max_chars
+        self.supported_codes = set(supported_codes) if supported_codes else None
+        self._script_cache = {}
+        self.profiles = {}
+        self.profile_scripts = {}
+        for code, sample in SAMPLES.items():
+            if self._supported(code):
+                profile = trigrams(sample)
+                norm = math.sqrt(sum(v * v for v in profile.values()))
+                self.profiles[code] = (profile, norm)
+                self.profile_scripts[code] = Counter(
+                    filter(None, map(script_of, sample))
+                ).most_common(1)[0][0]
+
+    def _supported(self, code):
+        return self.supported_codes is None or code in self.supported_codes
+
+    def _script(self, char):
+        script = self._script_cache.get(char, False)
+        if script is False:
+            script = script_of(char)
+            self._script_cache[char] = script
+        return script
+
+    def _rank(self, text, script):
+        counts = trigrams(text)
+        norm = math.sqrt(sum(v * v for v in counts.values()))
+        if not norm:
+            return []
+        letters = set(text.lower())
+        scores = []
+        for code, (profile, profile_norm) in self.profiles.items():
+            if self.profile_scripts[code] != script:
+                continue
+            dot = sum(n * profile.get(g, 0) for g, n in counts.items())
+            markers = sum(1 for c in MARKER_LETTERS.get(code, "") if c in letters)
+            scores.append((dot / (norm * profile_norm) + 0.1 * markers, code))
+        scores.sort(reverse=True)
+        return scores
+
+    def detect(self, text):
+        text = text[: self.max_chars]
+        scripts = Counter()
+        for char in text:
+            script = self._script(char)
+            if script:
+                scripts[script] += 1
+        if not scripts:
+            return None, 0.0
+
+        script, count = scripts.most_common(1)[0]
+        dominance = count / sum(scripts.values())
+
+        # Kana anywhere means Japanese even when kanji dominate
+        if script == "CJK":
+            if scripts["HIRAGANA"] or scripts["KATAKANA"]:
+                return "ja", dominance
+            return "zh-CN", dominance * 0.9
+
+        code = SCRIPT_LANGUAGES.get(script)
+        if code:
+            if not self._supported(code):
+                return None, 0.0
+            return code, dominance
+
+        scores = self._rank(text, script)
+        if not scores:
+            # No profile for this script; guess the usual language at low confidence
+            candidates = SHARED_SCRIPTS.get(script, ())
+            default = candidates[0] if candidates else None
+            if default and self._supported(default):
+                return default, 0.3 * dominance
+            return None, 0.0
+
+        best, code = scores[0]
+        runner_up = scores[1][0] if len(scores) > 1 else 0.0
+        # Confident when the best profile clearly beats the next one
+        margin = (best - runner_up) / best if best else 0.0
+        length_factor = min(1.0, len(text) / 40)
+        confidence = min(1.0, (0.5 * best + margin * 2)) * length_factor * dominance
+        return code, confidence
@@ -0,0 +1,148 @@
+import json
+import os
+
+from app_paths import cache_path
+
+# Used when the supported-language list cannot be fetched
+FALLBACK_LANGUAGES = {"english": "en", "hindi": "hi"}
+FALLBACK_TTS_LANGUAGES = {"en": "English", "hi": "Hindi"}
+
+
+def load_languages():
+    """Fetch the {language name: code} dict supported by Google Translate"""
+    from deep_translator import GoogleTranslator
+
+    translator = GoogleTranslator(source="auto", target="hindi")
+    return translator.get_supported_languages(as_dict=True)
+
+
+def display_name(lang_name):
+    """Return the properly capitalized display name of a language"""
+    # Handle special cases for proper capitalization
+    if "(" in lang_name:
+        # For languages like "chinese (simplified)"
+        parts = lang_name.split(" (")
+        return parts[0].capitalize() + " (" + parts[1].capitalize()
+    # For regular language names
+    return lang_name.capitalize()
+
+
+def display_names(languages_dict):
+    """Return sorted display names with "Auto" as the first option"""
+    names = sorted(display_name(lang_name) for lang_name in languages_dict)
+    names.insert(0, "Auto")
+    return names
+
+
+# Languages the Google speech recognizer is known to handle well
+STT_LANGUAGES = ("en", "hi", "es", "fr", "de", "it", "pt", "ru", "zh-CN", "ja", "ko")
+
+CAPABILITIES = ("translate", "tts", "stt")
+
+
+class LanguageCatalog:
+    """Single source of truth for language names, codes and capabilities.
+
+    Lookups are O(1): names are indexed case-insensitively, codes double as
+    aliases, and each code maps back to its display name. The capability
+    matrix records whether a language can be translated, spoken (gTTS) and
+    recognized (speech-to-text).
+    """
+
+    SNAPSHOT_VERSION = 1
+
+    def __init__(self, languages_dict, tts_codes=(), stt_codes=STT_LANGUAGES):
+        self.languages_dict = dict(languages_dict)
+        self.tts_codes = frozenset(tts_codes)
+        self.stt_codes = frozenset(stt_codes)
+
+        self._code_by_alias = {"auto": "auto"}
+        self._display_by_code = {"auto": "Auto"}
+        for lang_name, lang_code in self.languages_dict.items():
+            shown = display_name(lang_name)
+            self._display_by_code.setdefault(lang_code, shown)
+            self._code_by_alias[lang_name.lower()] = lang_code
+            self._code_by_alias.setdefault(lang_code.lower(), lang_code)
+
+        self.display_names = display_names(self.languages_dict)
+        self.capabilities = {
+            lang_code: {
+                "translate": True,
+                "tts": lang_code in self.tts_codes,
+                "stt": lang_code in self.stt_codes,
+            }
+            for lang_code in self.languages_dict.values()
+        }
+
+    def code(self, language):
+        """Return the code for a display name, raw name or code (any case)"""
+        return self._code_by_alias.get(language.strip().lower())
+
+    def display_name(self, lang_code):
+        """Return the display name for a language code, or None"""
+        return self._display_by_code.get(lang_code)
+
+    def canonical_name(self, language):
+        """Return the display name for any accepted spelling of a language"""
+        lang_code = self.code(language)
+        return self.display_name(lang_code) if lang_code else None
+
+    def supports(self, lang_code, capability):
+        return self.capabilities.get(lang_code, {}).get(capability, False)
+
+    @property
+    def codes(self):
+        return self.capabilities.keys()
+
+    def to_snapshot(self):
+        """Return a compact, JSON-serializable form of the catalog"""
+        return {
+            "version": self.SNAPSHOT_VERSION,
+            "languages": self.languages_dict,
+            "tts": sorted(self.tts_codes),
+            "stt": sorted(self.stt_codes),
+        }
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        if snapshot.get("version") != cls.SNAPSHOT_VERSION:
+            raise ValueError("Unsupported language catalog snapshot")
+        return cls(snapshot["languages"], snapshot["tts"], snapshot["stt"])
+
+    def __eq__(self, other):
+        if not isinstance(other, LanguageCatalog):
+            return NotImplemented
+        return self.to_snapshot() == other.to_snapshot()
+
+
+def fallback_catalog():
+    return LanguageCatalog(FALLBACK_LANGUAGES, FALLBACK_TTS_LANGUAGES)
+
+
+# ----------------------- CACHED CATALOG -----------------------
+CATALOG_FILE = "languages.json"
+
+
+def fetch_catalog():
+    """Fetch the translation and TTS language lists (may hit the network)"""
+    from gtts.lang import tts_langs
+
+    return LanguageCatalog(load_languages(), tts_langs())
+
+
+def load_cached_catalog(path=None):
+    """Return the LanguageCatalog saved by the last run, or None"""
+    path = path or cache_path(CATALOG_FILE)
+    try:
+        with open(path, encoding="utf-8") as f:
+            return LanguageCatalog.from_snapshot(json.load(f))
+    except (OSError, ValueError, KeyError, AttributeError):
+        return None
+
+
+def save_catalog(catalog, path=None):
+    path = path or cache_path(CATALOG_FILE)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(catalog.to_snapshot(), f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
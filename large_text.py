@@ -0,0 +1,166 @@
+from collections import deque
+
+
+def _line(index):
+    return int(index.split(".")[0])
+
+
+class TextChangeTracker:
+    """Track edits to a Tk Text widget as a dirty line range.
+
+    The widget's Tcl command is wrapped so every insert/delete/replace is
+    seen with its indices (the same trick as idlelib's WidgetRedirector);
+    ``<<Modified>>`` then reports one change per event-loop turn. Callers
+    read only the lines that changed (``take_region``) and know the buffer
+    length (``chars``) without copying the whole text on each keystroke.
+    """
+
+    def __init__(self, widget, on_change=None):
+        self.widget = widget
+        self.on_change = on_change
+        self.dirty = None  # (first line, last line), 1-based and inclusive
+        self.edits = 0
+
+        self._orig = widget._w + "_tracked"
+        widget.tk.call("rename", widget._w, self._orig)
+        widget.tk.createcommand(widget._w, self._dispatch)
+        widget.bind("<<Modified>>", self._on_modified, add="+")
+        self.chars = self._count("1.0", "end - 1 chars")
+
+    def _call(self, *args):
+        return self.widget.tk.call(self._orig, *args)
+
+    def _index(self, index):
+        return str(self._call("index", index))
+
+    def _compare(self, a, op, b):
+        return self.widget.tk.getboolean(self._call("compare", a, op, b))
+
+    def _count(self, start, end):
+        return int(self._call("count", "-chars", start, end) or 0)
+
+    def _dispatch(self, operation, *args):
+        if operation == "insert":
+            self._before_insert(args[0], args[1::2])
+        elif operation == "delete":
+            self._before_delete(*args[:2])
+        elif operation == "replace":
+            self._before_delete(*args[:2])
+            self._before_insert(args[0], args[2::2])
+        return self._call(operation, *args)
+
+    def _before_insert(self, index, texts):
+        index = self._index(index)
+        # Text inserted at "end" goes before the final newline
+        if self._compare(index, ">", "end - 1 chars"):
+            index = self._index("end - 1 chars")
+        first = _line(index)
+        chars = sum(len(text) for text in texts)
+        added = sum(text.count("\n") for text in texts)
+        self.chars += chars
+        if self.dirty is not None and added:
+            a, b = self.dirty
+            self.dirty = (a + added if a > first else a, b + added if b >= first else b)
+        self._mark(first, first + added)
+
+    def _before_delete(self, start, end=None):
+        start = self._index(start)
+        end = self._index(end if end is not None else f"{start} + 1 chars")
+        # Tk never deletes the final newline
+        if self._compare(end, ">", "end - 1 chars"):
+            end = self._index("end - 1 chars")
+        if self._compare(start, ">=", end):
+            return
+        self.chars -= self._count(start, end)
+        first, last = _line(start), _line(end)
+        if self.dirty is not None:
+
+            def shift(line):
+                if line <= first:
+                    return line
+                return first if line <= last else line - (last - first)
+
+            self.dirty = tuple(map(shift, self.dirty))
+        self._mark(first, first)
+
+    def _mark(self, first, last):
+        self.edits += 1
+        if self.dirty is None:
+            self.dirty = (first, last)
+        else:
+            self.dirty = (min(self.dirty[0], first), max(self.dirty[1], last))
+
+    def _on_modified(self, event=None):
+        # Clearing the flag fires <<Modified>> again; that one finds it unset
+        if not self.widget.edit_modified():
+            return
+        self.widget.edit_modified(False)
+        if self.on_change is not None:
+            self.on_change()
+
+    def take_region(self, max_chars=2000):
+        """Text of the lines changed since the last call (at most max_chars)"""
+        if self.dirty is None:
+            return ""
+        first, last = self.dirty
+        self.dirty = None
+        start = f"{first}.0"
+        end = self._index(f"{last}.0 lineend")
+        if self._count(start, end) > max_chars:
+            end = f"{start} + {max_chars} chars"
+        return self._call("get", start, end)
+
+    def head(self, max_chars=2000):
+        """The first max_chars characters of the buffer"""
+        return self._call("get", "1.0", f"1.0 + {max_chars} chars")
+
+
+class ChunkedInserter:
+    """Fill a Text widget in slices spread over ``after`` ticks.
+
+    Inserting a multi-megabyte result in one call blocks the main loop for
+    the whole layout; here each tick inserts at most ``chunk_chars`` so the
+    window stays responsive. ``replace`` drops anything still queued.
+    Short texts are inserted at once, as before.
+    """
+
+    def __init__(self, widget, chunk_chars=20000, delay_ms=1):
+        self.widget = widget
+        self.chunk_chars = chunk_chars
+        self.delay_ms = delay_ms
+        self._queue = deque()
+        self._after_id = None
+        self.ticks = 0
+
+    @property
+    def busy(self):
+        return bool(self._queue)
+
+    def replace(self, text):
+        self.cancel()
+        self.widget.delete("1.0", "end")
+        self.append(text)
+
+    def append(self, text):
+        if not self._queue and len(text) <= self.chunk_chars:
+            self.widget.insert("end", text)
+            return
+        for start in range(0, len(text), self.chunk_chars):
+            self._queue.append(text[start : start + self.chunk_chars])
+        if self._after_id is None:
+            self._after_id = self.widget.after(self.delay_ms, self._pump)
+
+    def _pump(self):
+        self._after_id = None
+        if not self._queue:
+            return
+        self.ticks += 1
+        self.widget.insert("end", self._queue.popleft())
+        if self._queue:
+            self._after_id = self.widget.after(self.delay_ms, self._pump)
+
+    def cancel(self):
+        self._queue.clear()
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
@@ -0,0 +1,86 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from text_chunker import split_sentence_chunks
+
+
+class SegmentStore:
+    """Per-session LRU of sentence translations keyed by (source, target, text)"""
+
+    def __init__(self, max_segments=5000):
+        self.max_segments = max_segments
+        self._segments = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, source_code, target_code, sentence):
+        key = (source_code, target_code, sentence)
+        with self._lock:
+            translation = self._segments.get(key)
+            if translation is not None:
+                self._segments.move_to_end(key)
+            return translation
+
+    def put(self, source_code, target_code, sentence, translation):
+        with self._lock:
+            self._segments[(source_code, target_code, sentence)] = translation
+            self._segments.move_to_end((source_code, target_code, sentence))
+            while len(self._segments) > self.max_segments:
+                self._segments.popitem(last=False)
+
+    def __len__(self):
+        return len(self._segments)
+
+
+class IncrementalTranslator:
+    """Retranslate a changing buffer one sentence at a time.
+
+    The buffer is split into sentences; sentences already in the segment
+    store are reused and only new or edited ones go upstream, so editing one
+    sentence of a long document costs one small request.
+    """
+
+    def __init__(self, translate_piece, store=None, max_workers=4):
+        self.translate_piece = translate_piece
+        self.store = store if store is not None else SegmentStore()
+        self.max_workers = max_workers
+        self.reused = 0
+        self.translated = 0
+
+    def translate(self, text, source_code, target_code):
+        chunks = split_sentence_chunks(text)
+        results = {}
+        missing = []
+        for chunk in chunks:
+            if not chunk.body or chunk.body in results:
+                continue
+            cached = self.store.get(source_code, target_code, chunk.body)
+            if cached is None:
+                missing.append(chunk.body)
+                results[chunk.body] = None
+            else:
+                results[chunk.body] = cached
+                self.reused += 1
+
+        if missing:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                translations = pool.map(
+                    lambda s: self.translate_piece(s, source_code, target_code),
+                    missing,
+                )
+                for sentence, translation in zip(missing, translations):
+                    translation = translation or ""
+                    results[sentence] = translation
+                    self.store.put(source_code, target_code, sentence, translation)
+            self.translated += len(missing)
+
+        return "".join(
+            c.leading + (results[c.body] if c.body else "") + c.trailing for c in chunks
+        )
+
+    def stats(self):
+        return {
+            "segments": len(self.store),
+            "reused": self.reused,
+            "translated": self.translated,
+        }
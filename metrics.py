@@ -0,0 +1,232 @@
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Upper bounds in seconds, from a cache hit to a slow upstream call
+DEFAULT_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+METRICS_ENV = "TRANSLATOR_METRICS"  # "0" disables collection
+METRICS_LOG_ENV = "TRANSLATOR_METRICS_LOG"  # path of a periodic JSON log
+READOUT_ENV = "TRANSLATOR_LATENCY_READOUT"  # "1" shows latency in the status bar
+
+
+class Histogram:
+    """Cumulative latency histogram with fixed bucket bounds"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th observation"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+
+class _NoopSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class MetricsRegistry:
+    """Timing spans, latency histograms and counters for every stage.
+
+    ``span("translate.upstream")`` times a block into the histogram for
+    that stage and counts an error if it raises. ``inc`` bumps a counter
+    (requests, cache hits, bytes). When disabled, ``span`` returns a shared
+    no-op context manager and ``inc``/``observe`` return immediately.
+    """
+
+    def __init__(self, enabled=True, buckets=DEFAULT_BUCKETS):
+        self.enabled = enabled
+        self.buckets = buckets
+        self.histograms = {}
+        self.counters = {}
+        self.last = {}  # stage -> most recent duration
+        self._lock = threading.Lock()
+
+    def span(self, stage):
+        if not self.enabled:
+            return _NOOP_SPAN
+        return self._span(stage)
+
+    @contextmanager
+    def _span(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.inc("errors", stage=stage)
+            raise
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def observe(self, stage, seconds):
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = Histogram(self.buckets)
+            histogram.observe(seconds)
+            self.last[stage] = seconds
+
+    def inc(self, name, value=1, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+            self.last.clear()
+
+    # ----------------------- EXPORT -----------------------
+    def snapshot(self):
+        with self._lock:
+            return {
+                "time": round(time.time(), 3),
+                "stages": {
+                    stage: histogram.snapshot()
+                    for stage, histogram in sorted(self.histograms.items())
+                },
+                "counters": {
+                    _format_key(name, labels): value
+                    for (name, labels), value in sorted(self.counters.items())
+                },
+            }
+
+    def prometheus_text(self, prefix="translator"):
+        """Render everything in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            if self.histograms:
+                name = f"{prefix}_stage_seconds"
+                lines.append(f"# TYPE {name} histogram")
+            for stage, histogram in sorted(self.histograms.items()):
+                cumulative = 0
+                bounds = [str(b) for b in histogram.buckets] + ["+Inf"]
+                for bound, count in zip(bounds, histogram.counts):
+                    cumulative += count
+                    lines.append(
+                        f'{name}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}'
+                    )
+                lines.append(f'{name}_sum{{stage="{stage}"}} {histogram.sum:.6f}')
+                lines.append(f'{name}_count{{stage="{stage}"}} {histogram.count}')
+
+            typed = set()
+            for (counter, labels), value in sorted(self.counters.items()):
+                name = f"{prefix}_{counter}_total"
+                if name not in typed:
+                    lines.append(f"# TYPE {name} counter")
+                    typed.add(name)
+                lines.append(_format_key(name, labels) + f" {value}")
+        return "\n".join(lines) + "\n"
+
+    def readout(self, *stages):
+        """Short 'stage 123 ms' summary of the latest spans, for the status bar"""
+        with self._lock:
+            parts = [
+                f"{stage} {self.last[stage] * 1000:.0f} ms"
+                for stage in stages
+                if stage in self.last
+            ]
+        return ", ".join(parts)
+
+
+def _format_key(name, labels):
+    if not labels:
+        return name
+    return name + "{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}"
+
+
+class JsonLogExporter:
+    """Append a metrics snapshot as one JSON line every ``interval`` seconds"""
+
+    def __init__(self, registry, path, interval=60.0):
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self.write()
+
+    def write(self):
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(self.registry.snapshot()) + "\n")
+        except OSError as e:
+            print(f"Could not write metrics log: {e}")
+
+    def stop(self):
+        self._stopped.set()
+        self.write()
+
+
+# Process-wide registry shared by the app, the service mode and the CLI
+METRICS = MetricsRegistry(enabled=os.environ.get(METRICS_ENV, "1") != "0")
+
+
+def start_json_log(interval=60.0):
+    """Start the periodic JSON log if TRANSLATOR_METRICS_LOG is set"""
+    path = os.environ.get(METRICS_LOG_ENV)
+    if not path or not METRICS.enabled:
+        return None
+    return JsonLogExporter(METRICS, path, interval)
+
+
+def readout_enabled():
+    return METRICS.enabled and os.environ.get(READOUT_ENV) == "1"
@@ -0,0 +1,179 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from app_paths import cache_path
+from metrics import METRICS
+from resilience import TokenBucket
+
+HISTORY_FILE = "recent_targets.json"
+
+
+class TargetHistory:
+    """Recently used target languages, saved across runs.
+
+    Each of the last ``max_uses`` uses scores ``decay ** age``, so both
+    recency and frequency count when guessing the next target.
+    """
+
+    def __init__(self, path=None, max_uses=30, decay=0.8):
+        self.path = path or cache_path(HISTORY_FILE)
+        self.max_uses = max_uses
+        self.decay = decay
+        self._uses = []  # most recent last
+        self._lock = threading.Lock()
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self._uses = [str(code) for code in json.load(f)][-max_uses:]
+        except (OSError, ValueError, TypeError):
+            pass
+
+    def record(self, target_code):
+        with self._lock:
+            self._uses.append(target_code)
+            del self._uses[: -self.max_uses]
+
+    def likely(self, exclude=(), limit=2):
+        """The ``limit`` most likely next targets, best first"""
+        with self._lock:
+            scores = {}
+            for age, code in enumerate(reversed(self._uses)):
+                scores[code] = scores.get(code, 0.0) + self.decay**age
+        ranked = sorted(scores, key=scores.get, reverse=True)
+        return [code for code in ranked if code not in exclude][:limit]
+
+    def save(self):
+        with self._lock:
+            uses = list(self._uses)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(uses, f)
+        os.replace(tmp, self.path)
+
+
+class Prefetcher:
+    """Speculatively translate the current text into likely next targets.
+
+    After a translation the text is translated in the background, one call
+    at a time, into the targets the user most often switches to. Results
+    are kept in a small LRU, so switching the destination shows them
+    without a round trip. Speculative calls are capped by a token bucket
+    (``budget_per_minute``) and by ``max_chars``; a newer request drops any
+    speculation still queued for an older text.
+    """
+
+    def __init__(
+        self,
+        translate,
+        history=None,
+        targets=2,
+        budget_per_minute=20,
+        max_chars=5000,
+        max_results=64,
+    ):
+        self.translate = translate
+        self.history = history if history is not None else TargetHistory()
+        self.targets = targets
+        self.max_chars = max_chars
+        self.max_results = max_results
+        self.budget = TokenBucket(
+            rate=budget_per_minute / 60, burst=budget_per_minute, max_rate=None
+        )
+
+        self._results = OrderedDict()  # (text, source, target) -> translation
+        self._pending = None
+        self._generation = 0
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+        # Counters
+        self.speculative = 0
+        self.hits = 0
+        self.misses = 0
+        self.over_budget = 0
+        self.failed = 0
+
+    def schedule(self, text, source_code, target_code):
+        """Record the target just used and prefetch the likely next ones"""
+        self.history.record(target_code)
+        with self._cond:
+            self._generation += 1
+            if len(text) > self.max_chars:
+                self._pending = None
+                return
+            targets = self.history.likely(exclude=(target_code,), limit=self.targets)
+            self._pending = (self._generation, text, source_code, targets)
+            self._cond.notify()
+
+    def cancel(self):
+        with self._cond:
+            self._generation += 1
+            self._pending = None
+
+    def lookup(self, text, source_code, target_code):
+        """Return a prefetched translation, or None"""
+        key = (text, source_code, target_code)
+        with self._cond:
+            translation = self._results.get(key)
+            if translation is None:
+                self.misses += 1
+                METRICS.inc("prefetch_misses")
+                return None
+            self._results.move_to_end(key)
+            self.hits += 1
+        METRICS.inc("prefetch_hits")
+        return translation
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._stopped:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                generation, text, source_code, targets = self._pending
+                self._pending = None
+
+            for target_code in targets:
+                with self._cond:
+                    if generation != self._generation:
+                        break  # superseded by newer input
+                    if (text, source_code, target_code) in self._results:
+                        continue
+                if not self.budget.try_acquire():
+                    self.over_budget += 1
+                    continue
+                self.speculative += 1
+                METRICS.inc("prefetch_calls")
+                try:
+                    translation = self.translate(text, source_code, target_code)
+                except Exception:
+                    self.failed += 1
+                    continue
+                with self._cond:
+                    self._results[(text, source_code, target_code)] = translation
+                    while len(self._results) > self.max_results:
+                        self._results.popitem(last=False)
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        try:
+            self.history.save()
+        except OSError as e:
+            print(f"Could not save target history: {e}")
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "speculative_calls": self.speculative,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else None,
+            "over_budget": self.over_budget,
+            "failed": self.failed,
+        }
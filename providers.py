@@ -0,0 +1,177 @@
+"""Pluggable translate, detect, text-to-speech and speech-to-text backends.
+
+A backend bundle has four parts:
+
+- ``translator``: ``translate(text, source, target)``, ``detect(text)``, ``close()``
+- ``tts``: ``synthesize(text, lang_code, path)`` writes an MP3 to ``path``,
+  ``synthesize_bytes(text, lang_code)`` returns one
+- ``stt``: ``recognize(audio, lang_code)`` returns the transcript
+
+``load_providers()`` returns the Google-backed bundle, or deterministic
+local fakes when ``TRANSLATOR_PROVIDERS=fake`` is set, so the app, the
+service mode and the benchmarks can run without the network.
+"""
+
+import io
+import os
+import random
+import threading
+import time
+
+import requests
+
+from lazy_imports import LazyModule
+from language_detector import LocalLanguageDetector
+from translator_pool import TranslatorPool
+
+gtts = LazyModule("gtts")
+
+PROVIDERS_ENV = "TRANSLATOR_PROVIDERS"
+
+
+class Providers:
+    def __init__(self, translator, tts, stt):
+        self.translator = translator
+        self.tts = tts
+        self.stt = stt
+
+    def close(self):
+        self.translator.close()
+
+
+# ----------------------- GOOGLE -----------------------
+class GTTSProvider:
+    def synthesize(self, text, lang_code, path):
+        gtts.gTTS(text=text, lang=lang_code, slow=False).save(path)
+
+    def synthesize_bytes(self, text, lang_code):
+        buffer = io.BytesIO()
+        gtts.gTTS(text=text, lang=lang_code, slow=False).write_to_fp(buffer)
+        return buffer.getvalue()
+
+
+class GoogleSpeechProvider:
+    """Speech-to-text through SpeechRecognition's free Google endpoint"""
+
+    def __init__(self):
+        self._recognizer = None
+
+    def recognize(self, audio, lang_code):
+        if self._recognizer is None:
+            import speech_recognition as sr
+
+            self._recognizer = sr.Recognizer()
+        return self._recognizer.recognize_google(audio, language=lang_code)
+
+
+def google_providers(**options):
+    return Providers(TranslatorPool(**options), GTTSProvider(), GoogleSpeechProvider())
+
+
+# ----------------------- FAKES -----------------------
+class FakeUpstreamError(requests.HTTPError):
+    """Injected failure; looks like a 503 to the resilience layer"""
+
+    def __init__(self):
+        response = requests.Response()
+        response.status_code = 503
+        super().__init__("Injected upstream failure", response=response)
+
+
+class FakeBackend:
+    """Fixed latency plus a per-character cost and a seeded error rate"""
+
+    def __init__(self, latency=0.02, per_char=0.0, error_rate=0.0, seed=0):
+        self.latency = latency
+        self.per_char = per_char
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    def wait(self, size):
+        with self._lock:
+            self.calls += 1
+            failed = self._rng.random() < self.error_rate
+        time.sleep(self.latency + size * self.per_char)
+        if failed:
+            raise FakeUpstreamError()
+
+
+class FakeTranslator(FakeBackend):
+    """Deterministic translator: tags each line with the target code.
+
+    Lines are translated independently, so newline-batched requests split
+    back exactly. Detection uses the offline detector and falls back to
+    English.
+    """
+
+    def __init__(self, latency=0.02, per_char=0.0, error_rate=0.0, seed=0):
+        super().__init__(latency, per_char, error_rate, seed)
+        self._detector = LocalLanguageDetector()
+
+    def translate(self, text, source_code, target_code):
+        self.wait(len(text))
+        return "\n".join(
+            f"[{target_code}] {line}" if line.strip() else line
+            for line in text.split("\n")
+        )
+
+    def detect(self, text):
+        self.wait(0)
+        detected, _ = self._detector.detect(text)
+        return detected or "en"
+
+    def close(self):
+        pass
+
+
+class FakeTTS(FakeBackend):
+    """Writes a small silent-ish MP3-sized payload after a synthesis delay"""
+
+    def __init__(self, latency=0.05, per_char=0.0005, error_rate=0.0, seed=0):
+        super().__init__(latency, per_char, error_rate, seed)
+
+    def synthesize(self, text, lang_code, path):
+        data = self.synthesize_bytes(text, lang_code)
+        with open(path, "wb") as f:
+            f.write(data)
+
+    def synthesize_bytes(self, text, lang_code):
+        self.wait(len(text))
+        return b"ID3" + text.encode("utf-8") * 16
+
+
+class FakeSTT(FakeBackend):
+    """Returns a fixed transcript, or the audio itself if it is a string"""
+
+    def __init__(self, transcript="hello world", latency=0.3, error_rate=0.0, seed=0):
+        super().__init__(latency, 0.0, error_rate, seed)
+        self.transcript = transcript
+
+    def recognize(self, audio, lang_code):
+        self.wait(0)
+        return audio if isinstance(audio, str) else self.transcript
+
+
+def fake_providers(latency=0.02, error_rate=0.0, seed=0):
+    return Providers(
+        FakeTranslator(latency=latency, error_rate=error_rate, seed=seed),
+        FakeTTS(error_rate=error_rate, seed=seed),
+        FakeSTT(error_rate=error_rate, seed=seed),
+    )
+
+
+PROVIDER_FACTORIES = {"google": google_providers, "fake": fake_providers}
+
+
+def load_providers(name=None, **options):
+    """Build the named backend bundle (default: $TRANSLATOR_PROVIDERS or google)"""
+    name = name or os.environ.get(PROVIDERS_ENV, "google")
+    try:
+        factory = PROVIDER_FACTORIES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown provider {name!r}; choose from {', '.join(PROVIDER_FACTORIES)}"
+        )
+    return factory(**options)
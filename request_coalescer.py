@@ -0,0 +1,179 @@
+import threading
+from concurrent.futures import Future
+
+BATCH_SEPARATOR = "\n"
+
+
+class _Batch:
+    def __init__(self):
+        self.items = []  # (text, future)
+        self.chars = 0
+        self.full = threading.Event()
+
+
+class RequestCoalescer:
+    """Single-flight and micro-batching in front of an upstream translate call.
+
+    Identical (text, source, target) requests in flight at the same time
+    share one upstream call. Short single-line texts for the same language
+    pair that arrive while other upstream calls are running are packed,
+    newline-separated, into one request of up to ``max_batch_chars`` /
+    ``max_batch_items``, sent after at most ``window`` seconds, and the
+    result is split back per caller. If the upstream reply does not split
+    into the expected number of lines, the batch falls back to one call per
+    text. An idle coalescer sends immediately, so a lone request never waits.
+    Texts with an ``"auto"`` source are never batched: upstream would detect
+    one language for the whole batch, which mistranslates mixed input.
+    """
+
+    def __init__(
+        self,
+        translate,
+        window=0.01,
+        max_batch_chars=1500,
+        max_batch_items=32,
+        max_segment_chars=300,
+    ):
+        self.translate_upstream = translate
+        self.window = window
+        self.max_batch_chars = max_batch_chars
+        self.max_batch_items = max_batch_items
+        self.max_segment_chars = max_segment_chars
+
+        self._lock = threading.Lock()
+        self._in_flight = {}  # (text, source, target) -> Future
+        self._batches = {}  # (source, target) -> open _Batch
+        self._active = 0  # upstream calls currently running
+
+        # Counters
+        self.requests = 0
+        self.deduplicated = 0
+        self.upstream_calls = 0
+        self.batches = 0
+        self.batched_texts = 0
+        self.fallbacks = 0
+
+    def translate(self, text, source_code, target_code):
+        key = (text, source_code, target_code)
+        with self._lock:
+            self.requests += 1
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.deduplicated += 1
+                leader = False
+            else:
+                future = Future()
+                self._in_flight[key] = future
+                leader = True
+
+        if leader:
+            # Joiners keep sharing the call until its result is known
+            future.add_done_callback(lambda f: self._forget(key))
+            try:
+                self._dispatch(text, source_code, target_code, future)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+        return future.result()
+
+    def _forget(self, key):
+        with self._lock:
+            self._in_flight.pop(key, None)
+
+    def _batchable(self, text, source_code):
+        return (
+            source_code != "auto"
+            and len(text) <= self.max_segment_chars
+            and BATCH_SEPARATOR not in text
+            and text == text.strip()
+        )
+
+    def _dispatch(self, text, source_code, target_code, future):
+        pair = (source_code, target_code)
+        with self._lock:
+            if not self._batchable(text, source_code) or (
+                self._active == 0 and pair not in self._batches
+            ):
+                batch = None
+            else:
+                batch = self._batches.get(pair)
+                if batch is not None:
+                    # Join the open batch; its owner sends it
+                    batch.items.append((text, future))
+                    batch.chars += len(text) + len(BATCH_SEPARATOR)
+                    if (
+                        len(batch.items) >= self.max_batch_items
+                        or batch.chars >= self.max_batch_chars
+                    ):
+                        self._batches.pop(pair, None)
+                        batch.full.set()
+                    return
+                batch = self._batches[pair] = _Batch()
+                batch.items.append((text, future))
+                batch.chars = len(text)
+
+        if batch is None:
+            self._call_single(text, source_code, target_code, future)
+            return
+
+        # Collect more texts for up to one window, then send what we have
+        batch.full.wait(self.window)
+        with self._lock:
+            if self._batches.get(pair) is batch:
+                del self._batches[pair]
+        self._send_batch(batch.items, source_code, target_code)
+
+    def _upstream(self, text, source_code, target_code):
+        with self._lock:
+            self._active += 1
+            self.upstream_calls += 1
+        try:
+            return self.translate_upstream(text, source_code, target_code)
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    def _call_single(self, text, source_code, target_code, future):
+        try:
+            future.set_result(self._upstream(text, source_code, target_code))
+        except Exception as e:
+            future.set_exception(e)
+
+    def _send_batch(self, items, source_code, target_code):
+        if len(items) == 1:
+            self._call_single(items[0][0], source_code, target_code, items[0][1])
+            return
+
+        with self._lock:
+            self.batches += 1
+            self.batched_texts += len(items)
+        try:
+            joined = BATCH_SEPARATOR.join(text for text, _ in items)
+            lines = (self._upstream(joined, source_code, target_code) or "").split(
+                BATCH_SEPARATOR
+            )
+        except Exception as e:
+            for _, future in items:
+                future.set_exception(e)
+            return
+
+        if len(lines) != len(items):
+            # The provider merged or split lines; translate one by one
+            with self._lock:
+                self.fallbacks += 1
+            for text, future in items:
+                self._call_single(text, source_code, target_code, future)
+            return
+        for (_, future), line in zip(items, lines):
+            future.set_result(line.strip())
+
+    def stats(self):
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "upstream_calls": self.upstream_calls,
+                "deduplicated": self.deduplicated,
+                "batches": self.batches,
+                "batched_texts": self.batched_texts,
+                "fallbacks": self.fallbacks,
+            }
@@ -0,0 +1,333 @@
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+
+
+class CircuitOpenError(Exception):
+    """Raised without calling upstream while the circuit breaker is open"""
+
+    def __init__(self, retry_in):
+        super().__init__(
+            f"Translation service unavailable, retrying in {retry_in:.0f}s"
+        )
+        self.retry_in = retry_in
+
+
+# deep_translator is imported lazily elsewhere, so its errors are matched by
+# name instead of importing the package here. Its other errors (RequestError,
+# ServerException) are raised for 4xx too, so they are judged by the status
+# of the response attached to them (see TranslatorPool.translate).
+_THROTTLE_ERRORS = {"TooManyRequests"}
+
+
+def status_code_of(error):
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None)
+
+
+def is_throttle(error):
+    return type(error).__name__ in _THROTTLE_ERRORS or status_code_of(error) == 429
+
+
+def is_retryable(error):
+    """True for throttling, timeouts, connection problems and 5xx responses"""
+    if is_throttle(error):
+        return True
+    if isinstance(error, (requests.Timeout, requests.ConnectionError)):
+        return True
+    status = status_code_of(error)
+    return status is not None and status >= 500
+
+
+class TokenBucket:
+    """Thread-safe token bucket whose rate adapts to throttling (AIMD).
+
+    Each upstream call takes a token. A throttled response halves the rate
+    down to ``min_rate`` (at most once per ``cooldown`` seconds, so a burst
+    of 429s counts once); every success adds ``increase`` back, up to
+    ``max_rate``.
+    """
+
+    def __init__(
+        self,
+        rate=50.0,
+        burst=50,
+        min_rate=1.0,
+        max_rate=None,
+        increase=1.0,
+        cooldown=1.0,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate or rate
+        self.increase = increase
+        self.cooldown = cooldown
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+        self.waited = 0.0
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self):
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def acquire(self):
+        """Take a token, sleeping until one is available"""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) / self.rate
+                self.waited += delay
+            time.sleep(delay)
+
+    def throttled(self):
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_decrease >= self.cooldown:
+                self._last_decrease = now
+                self.rate = max(self.min_rate, self.rate / 2)
+
+    def succeeded(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter"""
+
+    def __init__(self, attempts=3, base_delay=0.2, max_delay=5.0, rng=None):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.rng = rng or random.Random()
+
+    def delay(self, attempt):
+        """Seconds to wait before retry number ``attempt`` (1-based)"""
+        cap = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return self.rng.uniform(0, cap)
+
+
+class CircuitBreaker:
+    """Stop calling an upstream that keeps failing.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls fail fast for ``reset_timeout`` seconds. Then one trial call is let
+    through (half-open): success closes the circuit, failure reopens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trips = 0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            remaining = self.opened_at + self.reset_timeout - time.monotonic()
+            if self.state == self.OPEN and remaining <= 0:
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return
+            raise CircuitOpenError(max(0.0, remaining))
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial_running = False
+
+    def release(self):
+        """End a call that says nothing about upstream health"""
+        with self._lock:
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_running = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.trips += 1
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+class ResilientCaller:
+    """Rate limiting, retries, circuit breaking and hedging for upstream calls.
+
+    ``call(func, *args)`` waits for a rate-limit token, runs ``func`` and
+    retries transient failures with backoff while the total time stays
+    within ``deadline``. Per-request timeouts are enforced by the HTTP layer
+    (see TranslatorPool). When ``hedge`` is on and a call runs longer than
+    the recent p95 latency, a second identical request is started and the
+    first answer wins; only idempotent calls should go through here.
+    """
+
+    def __init__(
+        self,
+        limiter=None,
+        retry=None,
+        breaker=None,
+        deadline=30.0,
+        hedge=True,
+        hedge_quantile=0.95,
+        hedge_min_samples=20,
+        hedge_workers=32,
+    ):
+        self.limiter = limiter or TokenBucket()
+        self.retry = retry or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self.deadline = deadline
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_samples = hedge_min_samples
+        self._latencies = deque(maxlen=200)
+        self._executor = (
+            ThreadPoolExecutor(max_workers=hedge_workers, thread_name_prefix="hedge")
+            if hedge
+            else None
+        )
+        self._lock = threading.Lock()
+
+        # Counters
+        self.calls = 0
+        self.attempts = 0
+        self.retries = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.failures = 0
+        self.rejected = 0  # failed fast while the circuit was open
+
+    def hedge_delay(self):
+        """Latency after which a hedge is sent, or None while still learning"""
+        with self._lock:
+            if len(self._latencies) < self.hedge_min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * self.hedge_quantile))]
+
+    def call(self, func, *args, **kwargs):
+        started = time.monotonic()
+        with self._lock:
+            self.calls += 1
+        attempt = 0
+        while True:
+            try:
+                self.breaker.before_call()
+            except CircuitOpenError:
+                with self._lock:
+                    self.rejected += 1
+                raise
+            self.limiter.acquire()
+            try:
+                result = self._attempt(func, args, kwargs)
+            except Exception as e:
+                if not is_retryable(e):
+                    # Upstream answered; the request itself was bad
+                    self.breaker.record_success()
+                    raise
+                if is_throttle(e):
+                    # Throttling is the rate limiter's job, not a sign of an outage
+                    self.breaker.release()
+                    self.limiter.throttled()
+                else:
+                    self.breaker.record_failure()
+                attempt += 1
+                delay = self.retry.delay(attempt)
+                if (
+                    attempt >= self.retry.attempts
+                    or time.monotonic() - started + delay > self.deadline
+                ):
+                    with self._lock:
+                        self.failures += 1
+                    raise
+                with self._lock:
+                    self.retries += 1
+                time.sleep(delay)
+                continue
+            self.breaker.record_success()
+            self.limiter.succeeded()
+            return result
+
+    def _timed(self, func, args, kwargs):
+        with self._lock:
+            self.attempts += 1
+        start = time.monotonic()
+        result = func(*args, **kwargs)
+        with self._lock:
+            self._latencies.append(time.monotonic() - start)
+        return result
+
+    def _attempt(self, func, args, kwargs):
+        delay = self.hedge_delay() if self.hedge else None
+        if delay is None:
+            return self._timed(func, args, kwargs)
+
+        primary = self._executor.submit(self._timed, func, args, kwargs)
+        done, _ = wait([primary], timeout=delay)
+        if done or not self.limiter.try_acquire():
+            return primary.result()
+
+        with self._lock:
+            self.hedged += 1
+        backup = self._executor.submit(self._timed, func, args, kwargs)
+        pending = {primary, backup}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is backup:
+                        with self._lock:
+                            self.hedge_wins += 1
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def stats(self):
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "attempts": self.attempts,
+                "retries": self.retries,
+                "hedged": self.hedged,
+                "hedge_wins": self.hedge_wins,
+                "failures": self.failures,
+                "rejected": self.rejected,
+                "rate": round(self.limiter.rate, 2),
+                "circuit": self.breaker.state,
+                "circuit_trips": self.breaker.trips,
+            }
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
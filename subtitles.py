@@ -0,0 +1,271 @@
+"""Streaming SRT/WebVTT subtitle translation that keeps the timing intact.
+
+Cues are read one block at a time; cue numbers, identifiers, timestamps
+(with any cue settings), headers, NOTE/STYLE blocks and blank lines are
+copied byte for byte, and only the text lines are translated. Neighbouring
+cues are batched into one newline-joined upstream request, and a line that
+was already translated is reused instead of being sent again. Batches run
+on a bounded thread pool and are written back in order, so memory stays
+constant for multi-hour files.
+
+    python subtitles.py lecture.srt --to French
+    python subtitles.py talk.vtt --from English --to de -o talk.de.vtt
+"""
+
+import argparse
+import sys
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+from batch_translate import Throughput, default_output, load_catalog, resolve_language
+from translation_service import TranslationService
+
+TIMING_MARK = "-->"
+# WebVTT blocks that are not cues
+PASSTHROUGH_PREFIXES = ("WEBVTT", "NOTE", "STYLE", "REGION")
+
+
+# ----------------------- PARSING -----------------------
+class Block:
+    """Lines copied verbatim (``head``) followed by lines to translate (``text``)"""
+
+    __slots__ = ("head", "text")
+
+    def __init__(self, head, text=()):
+        self.head = head
+        self.text = list(text)
+
+
+def read_blocks(f):
+    """Yield a Block per cue, header or run of blank lines, streaming"""
+    lines = []
+
+    def finish():
+        if not lines[0].startswith(PASSTHROUGH_PREFIXES):
+            for i, line in enumerate(lines):
+                if TIMING_MARK in line:
+                    return Block(lines[: i + 1], lines[i + 1 :])
+        return Block(list(lines))
+
+    for line in f:
+        if line.strip():
+            lines.append(line)
+            continue
+        if lines:
+            yield finish()
+            lines = []
+        yield Block([line])
+    if lines:
+        yield finish()
+
+
+def split_ending(line):
+    body = line.rstrip("\r\n")
+    return body, line[len(body) :]
+
+
+def cue_line(translation, original):
+    """One output line: a blank or multi-line result would end the cue early"""
+    translation = " ".join(translation.splitlines()).strip()
+    return translation or original
+
+
+# ----------------------- TRANSLATION -----------------------
+class LineTranslator:
+    """Translate lists of subtitle lines with batching and reuse.
+
+    Unseen lines are joined with newlines into requests of up to
+    ``batch_chars`` characters. If a reply does not split back into the same
+    number of lines, those lines are translated one by one. A bounded LRU of
+    finished lines means a repeated line ("Thank you.", "[music]") is sent
+    upstream once.
+    """
+
+    def __init__(self, translate, batch_chars=1500, memo_size=5000):
+        self.translate = translate
+        self.batch_chars = batch_chars
+        self.memo_size = memo_size
+        self._memo = OrderedDict()
+        self._lock = threading.Lock()
+        self.upstream_calls = 0
+        self.reused = 0
+
+    def _remember(self, line, translation):
+        with self._lock:
+            self._memo[line] = translation
+            self._memo.move_to_end(line)
+            while len(self._memo) > self.memo_size:
+                self._memo.popitem(last=False)
+
+    def _call(self, text):
+        with self._lock:
+            self.upstream_calls += 1
+        return self.translate(text)
+
+    def translate_lines(self, lines):
+        results = {}
+        pending = []
+        with self._lock:
+            for line in dict.fromkeys(lines):
+                if not line.strip():
+                    results[line] = line
+                elif line in self._memo:
+                    results[line] = self._memo[line]
+                    self._memo.move_to_end(line)
+                else:
+                    pending.append(line)
+            self.reused += len(lines) - len(pending)
+
+        batch, size = [], 0
+        for line in pending + [None]:
+            if batch and (line is None or size + len(line) + 1 > self.batch_chars):
+                self._translate_batch(batch, results)
+                batch, size = [], 0
+            if line is not None:
+                batch.append(line)
+                size += len(line) + 1
+        return [results[line] for line in lines]
+
+    def _translate_batch(self, batch, results):
+        parts = self._call("\n".join(batch)).split("\n") if len(batch) > 1 else None
+        if parts is None or len(parts) != len(batch):
+            parts = [self._call(line) for line in batch]
+        for line, translation in zip(batch, parts):
+            results[line] = translation.strip()
+            self._remember(line, results[line])
+
+
+# ----------------------- MAIN LOOP -----------------------
+def batches(blocks, max_cues, max_chars):
+    """Group blocks so that each group holds a bounded amount of cue text"""
+    group, cues, chars = [], 0, 0
+    for block in blocks:
+        group.append(block)
+        if block.text:
+            cues += 1
+            chars += sum(len(line) for line in block.text)
+        if cues >= max_cues or chars >= max_chars:
+            yield group
+            group, cues, chars = [], 0, 0
+    if group:
+        yield group
+
+
+def run(
+    input_path,
+    output_path,
+    translate,
+    workers=4,
+    batch_cues=40,
+    batch_chars=1500,
+    progress=None,
+    on_progress=None,
+):
+    """Stream input_path through translate(text) into output_path"""
+    progress = progress or Throughput(unit="cues")
+    translator = LineTranslator(translate, batch_chars=batch_chars)
+    window = deque()
+
+    def translate_group(group):
+        lines = []
+        for block in group:
+            lines += [split_ending(line)[0] for line in block.text]
+        try:
+            return translator.translate_lines(lines), False
+        except Exception as e:
+            print(f"Translation error: {e}", file=sys.stderr)
+            return lines, True  # keep the original text rather than drop cues
+
+    def write_next(out):
+        group, future = window.popleft()
+        translations, failed = future.result()
+        translations = iter(translations)
+        for block in group:
+            out.writelines(block.head)
+            for line in block.text:
+                body, ending = split_ending(line)
+                out.write(cue_line(next(translations), body) + ending)
+            if block.text:
+                progress.errors += failed
+                progress.add(sum(len(line) for line in block.text))
+        if on_progress is not None:
+            on_progress(progress)
+
+    with open(input_path, encoding="utf-8-sig", newline="") as f, open(
+        output_path, "w", encoding="utf-8", newline=""
+    ) as out, ThreadPoolExecutor(max_workers=workers) as pool:
+        for group in batches(read_blocks(f), batch_cues, batch_chars):
+            window.append((group, pool.submit(translate_group, group)))
+            # Keep a bounded number of batches in flight
+            if len(window) >= workers * 2:
+                write_next(out)
+        while window:
+            write_next(out)
+
+    progress.upstream_calls = translator.upstream_calls
+    progress.reused_lines = translator.reused
+    progress.report(final=True)
+    return progress
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Translate SRT or WebVTT subtitles, keeping cue timing"
+    )
+    parser.add_argument("input", help="subtitle file (.srt or .vtt)")
+    parser.add_argument(
+        "-o", "--output", help="output file (default: <input>.<code>.<ext>)"
+    )
+    parser.add_argument(
+        "--from", dest="source", default="Auto", help="source language (default: Auto)"
+    )
+    parser.add_argument(
+        "--to", dest="target", required=True, help="target language name or code"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=4, help="concurrent upstream requests"
+    )
+    parser.add_argument(
+        "--batch-cues", type=int, default=40, help="most cues per upstream request"
+    )
+    parser.add_argument(
+        "--batch-chars",
+        type=int,
+        default=1500,
+        help="most characters per upstream request",
+    )
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    catalog = load_catalog()
+    source_code = resolve_language(catalog, args.source, allow_auto=True)
+    target_code = resolve_language(catalog, args.target)
+    output = args.output or default_output(args.input, target_code)
+
+    service = TranslationService()
+    try:
+        progress = run(
+            args.input,
+            output,
+            lambda text: service.translate(text, source_code, target_code),
+            workers=args.workers,
+            batch_cues=args.batch_cues,
+            batch_chars=min(args.batch_chars, service.chunk_size),
+        )
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        service.close()
+    print(
+        f"Wrote {output} ({progress.upstream_calls} upstream requests, "
+        f"{progress.reused_lines} lines reused)",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+import re
+import threading
+from collections import namedtuple
+from concurrent.futures import CancelledError, ThreadPoolExecutor, as_completed
+
+
+# A chunk keeps the whitespace around its body so the output can be rebuilt
+Chunk = namedtuple("Chunk", ["leading", "body", "trailing"])
+
+# Split after sentence punctuation or at blank lines, keeping the separators
+_BOUNDARY = re.compile(r"(\n\s*\n|(?<=[.!?。！？।])\s+)")
+_SPACE = re.compile(r"\s+")
+_PARAGRAPH_END = re.compile(r"\n\s*\n\s*$")
+
+
+def _split_long(piece, max_chars):
+    """Hard-split a single oversized sentence at whitespace"""
+    parts = []
+    while len(piece) > max_chars:
+        cut = max(
+            (m.end() for m in _SPACE.finditer(piece, 0, max_chars)), default=max_chars
+        )
+        parts.append(piece[:cut])
+        piece = piece[cut:]
+    if piece:
+        parts.append(piece)
+    return parts
+
+
+def _make_chunk(raw):
+    body = raw.strip()
+    if not body:
+        return Chunk(raw, "", "")
+    start = raw.index(body)
+    return Chunk(raw[:start], body, raw[start + len(body) :])
+
+
+def _sentence_pieces(text, max_chars):
+    """Split text into sentences, each carrying its trailing separator"""
+    pieces = []
+    tokens = _BOUNDARY.split(text)
+    # tokens alternate sentence, separator, sentence, ...
+    for i in range(0, len(tokens), 2):
+        sentence = tokens[i]
+        separator = tokens[i + 1] if i + 1 < len(tokens) else ""
+        for part in _split_long(sentence, max_chars):
+            pieces.append(part)
+        if separator:
+            if pieces:
+                pieces[-1] += separator
+            else:
+                pieces.append(separator)
+    return pieces
+
+
+def split_into_chunks(text, max_chars=1500):
+    """Split text into chunks of at most max_chars on sentence/paragraph breaks.
+
+    Joining ``leading + body + trailing`` of every chunk gives back the
+    original text exactly.
+    """
+    pieces = _sentence_pieces(text, max_chars)
+    chunks = []
+    current = ""
+    paragraph_end = False
+    for piece in pieces:
+        # Prefer to end a chunk at a paragraph break once it is half full
+        if current and (
+            len(current) + len(piece) > max_chars
+            or (paragraph_end and len(current) >= max_chars // 2)
+        ):
+            chunks.append(_make_chunk(current))
+            current = ""
+        current += piece
+        paragraph_end = _PARAGRAPH_END.search(piece) is not None
+    if current:
+        chunks.append(_make_chunk(current))
+    return chunks
+
+
+def translate_chunks(
+    text, translate, max_chars=1500, max_workers=4, on_progress=None, cancelled=None
+):
+    """Translate text chunk by chunk on a bounded thread pool.
+
+    ``translate`` is called with each chunk body. ``on_progress(done, total,
+    piece)`` is called whenever the next in-order piece of output (with its
+    original surrounding whitespace) becomes available, so callers can show
+    the translation as it fills in. Once the ``cancelled`` event is set, no
+    further chunks are started or reported and CancelledError is raised.
+    """
+    chunks = split_into_chunks(text, max_chars)
+    results = [None] * len(chunks)
+    total = len(chunks)
+    lock = threading.Lock()
+    state = {"done": 0, "emitted": 0}
+
+    def emit_ready():
+        # Emit the contiguous prefix of finished chunks, in order
+        while state["emitted"] < total and results[state["emitted"]] is not None:
+            chunk = chunks[state["emitted"]]
+            piece = chunk.leading + results[state["emitted"]] + chunk.trailing
+            state["emitted"] += 1
+            if on_progress:
+                on_progress(state["done"], total, piece)
+
+    def translate_unless_cancelled(body):
+        if cancelled is not None and cancelled.is_set():
+            raise CancelledError()
+        return translate(body)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {}
+        for i, chunk in enumerate(chunks):
+            if chunk.body:
+                futures[pool.submit(translate_unless_cancelled, chunk.body)] = i
+            else:
+                results[i] = ""
+                state["done"] += 1
+        with lock:
+            emit_ready()
+
+        for future in as_completed(futures):
+            if cancelled is not None and cancelled.is_set():
+                for pending in futures:
+                    pending.cancel()
+                raise CancelledError()
+            i = futures[future]
+            translated = future.result()
+            with lock:
+                results[i] = translated or ""
+                state["done"] += 1
+                emit_ready()
+
+    return "".join(c.leading + r + c.trailing for c, r in zip(chunks, results))
+
+
+def split_sentences(text):
+    """Split text into stripped, non-empty sentences"""
+    return [s.strip() for s in _BOUNDARY.split(text) if s and s.strip()]
+
+
+def split_sentence_chunks(text, max_chars=1500):
+    """Split text into one chunk per sentence, keeping surrounding whitespace"""
+    return [_make_chunk(piece) for piece in _sentence_pieces(text, max_chars)]
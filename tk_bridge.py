@@ -0,0 +1,56 @@
+import queue
+import time
+
+
+class TkBridge:
+    """Thread-safe hand-off of UI updates to the Tk main loop.
+
+    Worker threads never touch widgets. They ``post`` callbacks onto a queue
+    that the main loop drains every few milliseconds with ``after``; each
+    drain is time-boxed so a burst of updates cannot stall the window.
+    """
+
+    def __init__(self, root, interval_ms=20, budget_ms=15):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.budget = budget_ms / 1000
+        self._queue = queue.SimpleQueue()
+        self._stopped = False
+        self._after_id = self.root.after(self.interval_ms, self._drain)
+
+    def post(self, callback, *args, **kwargs):
+        """Queue callback(*args, **kwargs) to run on the main thread"""
+        self._queue.put((callback, args, kwargs))
+
+    def deliver(self, future, on_result, on_error=None):
+        """Call on_result/on_error on the main thread when future completes"""
+        future.add_done_callback(
+            lambda f: self.post(self._complete, f, on_result, on_error)
+        )
+
+    @staticmethod
+    def _complete(future, on_result, on_error):
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is None:
+            on_result(future.result())
+        elif on_error is not None:
+            on_error(error)
+
+    def _drain(self):
+        deadline = time.perf_counter() + self.budget
+        while time.perf_counter() < deadline:
+            try:
+                callback, args, kwargs = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                callback(*args, **kwargs)
+            except Exception as e:
+                print(f"UI update error: {e}")
+        if not self._stopped:
+            self._after_id = self.root.after(self.interval_ms, self._drain)
+
+    def stop(self):
+        self._stopped = True
@@ -0,0 +1,195 @@
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+from app_paths import cache_path
+
+
+_HORIZONTAL_SPACE = re.compile(r"[ \t\f\v]+")
+
+
+def normalize_text(text):
+    """Normalize text so trivially different inputs share one cache entry"""
+    text = unicodedata.normalize("NFC", text)
+    lines = [_HORIZONTAL_SPACE.sub(" ", line).strip() for line in text.split("\n")]
+    return "\n".join(lines).strip()
+
+
+class TranslationCache:
+    """Two-tier translation cache: an in-memory LRU in front of SQLite.
+
+    Entries are keyed on (source code, target code, normalized text). The
+    memory tier answers repeat lookups without touching disk; the SQLite
+    tier survives restarts. Both tiers honour the same TTL.
+    """
+
+    def __init__(
+        self,
+        db_path=None,
+        max_memory_entries=1024,
+        max_disk_entries=50000,
+        ttl=30 * 24 * 3600,
+    ):
+        self.db_path = db_path or cache_path("translations.sqlite3")
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttl = ttl
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._conn = None
+        try:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS translations (
+                    source TEXT NOT NULL,
+                    target TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    translation TEXT NOT NULL,
+                    created REAL NOT NULL,
+                    accessed REAL NOT NULL,
+                    PRIMARY KEY (source, target, text)
+                )"""
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_accessed ON translations (accessed)"
+            )
+            self._conn.commit()
+        except sqlite3.Error as e:
+            # Fall back to a memory-only cache if the disk tier is unusable
+            print(f"Translation cache disabled on disk: {e}")
+            self._conn = None
+
+    @staticmethod
+    def make_key(source_code, target_code, text):
+        return (source_code, target_code, normalize_text(text))
+
+    def _expired(self, created, now):
+        return self.ttl is not None and now - created > self.ttl
+
+    def get(self, source_code, target_code, text):
+        """Return the cached translation or None"""
+        key = self.make_key(source_code, target_code, text)
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                translation, created = entry
+                if not self._expired(created, now):
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    self.memory_hits += 1
+                    return translation
+                del self._memory[key]
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT translation, created FROM translations "
+                    "WHERE source = ? AND target = ? AND text = ?",
+                    key,
+                ).fetchone()
+                if row is not None:
+                    translation, created = row
+                    if not self._expired(created, now):
+                        self._conn.execute(
+                            "UPDATE translations SET accessed = ? "
+                            "WHERE source = ? AND target = ? AND text = ?",
+                            (now, *key),
+                        )
+                        self._conn.commit()
+                        self._remember(key, translation, created)
+                        self.hits += 1
+                        self.disk_hits += 1
+                        return translation
+                    self._conn.execute(
+                        "DELETE FROM translations "
+                        "WHERE source = ? AND target = ? AND text = ?",
+                        key,
+                    )
+                    self._conn.commit()
+
+            self.misses += 1
+            return None
+
+    def put(self, source_code, target_code, text, translation):
+        """Store a translation in both tiers"""
+        if not translation:
+            return
+        key = self.make_key(source_code, target_code, text)
+        now = time.time()
+
+        with self._lock:
+            self._remember(key, translation, now)
+            if self._conn is None:
+                return
+            self._conn.execute(
+                "INSERT OR REPLACE INTO translations "
+                "(source, target, text, translation, created, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (*key, translation, now, now),
+            )
+            self._evict_disk()
+            self._conn.commit()
+
+    def _remember(self, key, translation, created):
+        self._memory[key] = (translation, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self):
+        if self.ttl is not None:
+            self._conn.execute(
+                "DELETE FROM translations WHERE created < ?",
+                (time.time() - self.ttl,),
+            )
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()
+        overflow = count - self.max_disk_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM translations WHERE rowid IN ("
+                "SELECT rowid FROM translations ORDER BY accessed LIMIT ?)",
+                (overflow,),
+            )
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM translations")
+                self._conn.commit()
+
+    def stats(self):
+        """Return hit/miss counters and tier sizes"""
+        with self._lock:
+            disk_entries = 0
+            if self._conn is not None:
+                (disk_entries,) = self._conn.execute(
+                    "SELECT COUNT(*) FROM translations"
+                ).fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_entries": disk_entries,
+            }
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,132 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class TranslationEngine:
+    """UI-independent asyncio front end for detect, translate, TTS and STT.
+
+    Blocking providers run on a thread pool; each kind of work has its own
+    concurrency limit (an asyncio semaphore). By default the engine runs its
+    event loop on a private thread so synchronous callers (Tk, worker
+    threads) can use ``submit``/``call``; async callers can instead pass
+    their running ``loop`` and await the coroutines directly. Cancelling a
+    submitted future cancels the job; a blocking call already running on
+    the pool finishes but its result is discarded. A long translation is
+    told to stop, so it starts no further chunks.
+    """
+
+    def __init__(
+        self,
+        service,
+        synthesize=None,
+        recognize=None,
+        limits=None,
+        max_workers=8,
+        loop=None,
+    ):
+        self.service = service
+        self._synthesize = synthesize
+        self._recognize = recognize
+        self.limits = {"translate": 4, "detect": 2, "tts": 2, "stt": 1}
+        self.limits.update(limits or {})
+        self._semaphores = {
+            kind: asyncio.Semaphore(limit) for kind, limit in self.limits.items()
+        }
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="engine"
+        )
+
+        self.in_flight = {kind: 0 for kind in self.limits}
+        self.completed = {kind: 0 for kind in self.limits}
+        self.failed = {kind: 0 for kind in self.limits}
+        self.cancelled = {kind: 0 for kind in self.limits}
+
+        self._thread = None
+        if loop is None:
+            self.loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(
+                target=self.loop.run_forever, name="engine-loop", daemon=True
+            )
+            self._thread.start()
+        else:
+            self.loop = loop
+
+    # ----------------------- CORE -----------------------
+    async def run(self, kind, func, *args, timeout=None, **kwargs):
+        """Run a blocking call on the pool under the concurrency limit for kind"""
+        try:
+            async with self._semaphores[kind]:
+                self.in_flight[kind] += 1
+                try:
+                    call = asyncio.get_running_loop().run_in_executor(
+                        self._executor, functools.partial(func, *args, **kwargs)
+                    )
+                    result = await asyncio.wait_for(call, timeout)
+                finally:
+                    self.in_flight[kind] -= 1
+        except asyncio.CancelledError:
+            # Also counts jobs cancelled while still waiting for a slot
+            self.cancelled[kind] += 1
+            raise
+        except Exception:
+            self.failed[kind] += 1
+            raise
+        self.completed[kind] += 1
+        return result
+
+    async def translate(
+        self, text, source_code, target_code, on_progress=None, timeout=None
+    ):
+        cancelled = threading.Event()
+        try:
+            return await self.run(
+                "translate",
+                self.service.translate,
+                text,
+                source_code,
+                target_code,
+                on_progress=on_progress,
+                cancelled=cancelled,
+                timeout=timeout,
+            )
+        finally:
+            # Cancelled or timed out: stop the chunks still left to translate
+            cancelled.set()
+
+    async def detect(self, text, timeout=None):
+        return await self.run("detect", self.service.detect, text, timeout=timeout)
+
+    async def synthesize(self, text, lang_code, timeout=None):
+        if self._synthesize is None:
+            raise RuntimeError("No speech synthesizer configured")
+        return await self.run("tts", self._synthesize, text, lang_code, timeout=timeout)
+
+    async def recognize(self, audio, lang_code, timeout=None):
+        if self._recognize is None:
+            raise RuntimeError("No speech recognizer configured")
+        return await self.run("stt", self._recognize, audio, lang_code, timeout=timeout)
+
+    # ----------------------- SYNC BRIDGE -----------------------
+    def submit(self, coro):
+        """Schedule a coroutine from any thread; returns a concurrent Future"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def call(self, coro, timeout=None):
+        """Run a coroutine from a worker thread and wait for its result"""
+        return self.submit(coro).result(timeout)
+
+    def stats(self):
+        return {
+            "limits": dict(self.limits),
+            "in_flight": dict(self.in_flight),
+            "completed": dict(self.completed),
+            "failed": dict(self.failed),
+            "cancelled": dict(self.cancelled),
+        }
+
+    def close(self):
+        if self._thread is not None and self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+        self._executor.shutdown(wait=False, cancel_futures=True)
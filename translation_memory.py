@@ -0,0 +1,285 @@
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from collections import namedtuple
+
+from app_paths import cache_path
+from metrics import METRICS
+from translation_cache import normalize_text
+
+NUMBER = re.compile(r"\d+(?:[.,:]\d+)*")
+
+# score: Dice similarity of the number-masked texts; reusable: the texts
+# differ only in numbers, so ``translation`` already has the new numbers in it
+Match = namedtuple("Match", "score text translation reusable")
+
+
+def mask_numbers(text):
+    return NUMBER.sub("#", text)
+
+
+def shingles(text, n=3):
+    """Set of character n-grams of a lowercased, space-padded text"""
+    padded = f" {text.lower()} "
+    return {padded[i : i + n] for i in range(len(padded) - n + 1)}
+
+
+def dice(a, b):
+    if not a or not b:
+        return 0.0
+    return 2 * len(a & b) / (len(a) + len(b))
+
+
+def substitute_numbers(old_text, translation, new_text):
+    """Carry the numbers of new_text into a translation of old_text.
+
+    Works only when the translation contains the old numbers in the same
+    order, so each one can be replaced by its counterpart; otherwise None.
+    """
+    old_numbers = NUMBER.findall(old_text)
+    new_numbers = NUMBER.findall(new_text)
+    if len(old_numbers) != len(new_numbers):
+        return None
+    if old_numbers == new_numbers:
+        return translation
+    if NUMBER.findall(translation) != old_numbers:
+        return None
+    replacements = iter(new_numbers)
+    return NUMBER.sub(lambda m: next(replacements), translation)
+
+
+class TranslationMemory:
+    """Fuzzy translation memory over (segment, target language, translation).
+
+    Segments are indexed with MinHash LSH on character trigrams of the
+    number-masked text: one-permutation hashing into ``bins`` minima, taken
+    ``rows`` at a time as band keys in SQLite, plus one key for the masked
+    text itself so that number-only changes are always found. A lookup
+    fetches the few segments that share the most bands and scores them
+    exactly, so its cost does not grow with the size of the memory. A match
+    that differs only in numbers is reusable as is (with the numbers
+    swapped); other matches above ``threshold`` can be offered to the user.
+    """
+
+    def __init__(
+        self,
+        db_path=None,
+        threshold=0.85,
+        bins=40,
+        rows=5,
+        candidates=8,
+        bucket_limit=128,
+        max_chars=500,
+    ):
+        self.db_path = db_path or cache_path("translation_memory.sqlite3")
+        self.threshold = threshold
+        self.bins = bins
+        self.rows = rows
+        self.candidates = candidates
+        self.bucket_limit = bucket_limit
+        self.max_chars = max_chars  # longer segments are not worth indexing
+        self._lock = threading.Lock()
+
+        self.lookups = 0
+        self.lookup_seconds = 0.0
+        self.matches = 0
+        self.reused = 0
+        self.offered = 0
+
+        self._conn = None
+        self.segments = 0
+        try:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("""CREATE TABLE IF NOT EXISTS segments (
+                    id INTEGER PRIMARY KEY,
+                    source TEXT NOT NULL,
+                    target TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    translation TEXT NOT NULL,
+                    created REAL NOT NULL,
+                    UNIQUE (target, text)
+                )""")
+            self._conn.execute("""CREATE TABLE IF NOT EXISTS bands (
+                    key INTEGER NOT NULL,
+                    id INTEGER NOT NULL,
+                    PRIMARY KEY (key, id)
+                ) WITHOUT ROWID""")
+            self._conn.commit()
+            (self.segments,) = self._conn.execute(
+                "SELECT COUNT(*) FROM segments"
+            ).fetchone()
+        except sqlite3.Error as e:
+            print(f"Translation memory disabled: {e}")
+            self._conn = None
+
+    # ----------------------- INDEX -----------------------
+    @staticmethod
+    def _hash(label):
+        digest = hashlib.blake2b(label.encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "big", signed=True)
+
+    def _template_key(self, target_code, masked):
+        """Key shared by segments that differ only in their numbers"""
+        return self._hash(f"{target_code}|#|{masked}")
+
+    def _band_keys(self, target_code, grams):
+        mins = [0xFFFFFFFF] * self.bins
+        for gram in grams:
+            h = zlib.crc32(gram.encode("utf-8"))
+            b = h % self.bins
+            if h < mins[b]:
+                mins[b] = h
+        return [
+            self._hash(f"{target_code}|{band}|{mins[band : band + self.rows]}")
+            for band in range(0, self.bins, self.rows)
+        ]
+
+    def _insert(self, source_code, target_code, text, translation, now):
+        text = normalize_text(text)
+        if not text or not translation or len(text) > self.max_chars:
+            return False
+        cursor = self._conn.execute(
+            "INSERT OR IGNORE INTO segments "
+            "(source, target, text, translation, created) VALUES (?, ?, ?, ?, ?)",
+            (source_code, target_code, text, translation, now),
+        )
+        if not cursor.rowcount:
+            self._conn.execute(
+                "UPDATE segments SET translation = ?, created = ? "
+                "WHERE target = ? AND text = ?",
+                (translation, now, target_code, text),
+            )
+            return False
+        segment_id = cursor.lastrowid
+        masked = mask_numbers(text)
+        keys = self._band_keys(target_code, shingles(masked))
+        keys.append(self._template_key(target_code, masked))
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO bands (key, id) VALUES (?, ?)",
+            [(key, segment_id) for key in keys],
+        )
+        return True
+
+    def add(self, source_code, target_code, text, translation):
+        """Remember one translated segment"""
+        with self._lock:
+            if self._conn is None:
+                return
+            self.segments += self._insert(
+                source_code, target_code, text, translation, time.time()
+            )
+            self._conn.commit()
+
+    def add_many(self, segments):
+        """Bulk import (source, target, text, translation) tuples"""
+        now = time.time()
+        with self._lock:
+            if self._conn is None:
+                return
+            for segment in segments:
+                self.segments += self._insert(*segment, now)
+            self._conn.commit()
+
+    # ----------------------- LOOKUP -----------------------
+    def find(self, text, target_code):
+        """Best stored segment scoring at least ``threshold``, or None"""
+        text = normalize_text(text)
+        if not text or len(text) > self.max_chars or self._conn is None:
+            return None
+        start = time.perf_counter()
+        with METRICS.span("memory.lookup"):
+            match = self._find(text, target_code)
+        with self._lock:
+            self.lookups += 1
+            self.lookup_seconds += time.perf_counter() - start
+            self.matches += match is not None
+        return match
+
+    def _find(self, text, target_code):
+        masked = mask_numbers(text)
+        grams = shingles(masked)
+        keys = self._band_keys(target_code, grams)
+        # Segments with the same words come first whatever their band votes
+        weights = [1] * len(keys) + [len(keys) + 1]
+        keys.append(self._template_key(target_code, masked))
+        with self._lock:
+            # Popular buckets are capped to their newest segments, so common
+            # phrasing cannot make a lookup scan a large part of the index
+            votes = {}
+            for key, weight in zip(keys, weights):
+                for (segment_id,) in self._conn.execute(
+                    "SELECT id FROM bands WHERE key = ? ORDER BY id DESC LIMIT ?",
+                    (key, self.bucket_limit),
+                ):
+                    votes[segment_id] = votes.get(segment_id, 0) + weight
+            if not votes:
+                return None
+            ids = sorted(votes, key=votes.get, reverse=True)[: self.candidates]
+            rows = self._conn.execute(
+                "SELECT target, text, translation FROM segments "
+                f"WHERE id IN ({','.join('?' * len(ids))})",
+                ids,
+            ).fetchall()
+
+        best = None
+        for target, stored, translation in rows:
+            if target != target_code:
+                continue  # band keys include the target; guards hash collisions
+            stored_masked = mask_numbers(stored)
+            score = (
+                1.0 if stored_masked == masked else dice(grams, shingles(stored_masked))
+            )
+            if score >= self.threshold and (best is None or score > best[0]):
+                best = (score, stored, translation, stored_masked == masked)
+        if best is None:
+            return None
+
+        score, stored, translation, same_words = best
+        if same_words:
+            adapted = substitute_numbers(stored, translation, text)
+            if adapted is not None:
+                return Match(score, stored, adapted, True)
+        return Match(score, stored, translation, False)
+
+    def reuse(self, text, target_code):
+        """Translation to use instead of calling upstream, or None"""
+        match = self.find(text, target_code)
+        if match is None or not match.reusable:
+            return None
+        with self._lock:
+            self.reused += 1
+        METRICS.inc("memory_reused")
+        return match.translation
+
+    def suggest(self, text, target_code):
+        """A near match that is not safe to reuse as is, to offer the user"""
+        match = self.find(text, target_code)
+        if match is None or match.reusable:
+            return None
+        with self._lock:
+            self.offered += 1
+        METRICS.inc("memory_offered")
+        return match
+
+    def stats(self):
+        with self._lock:
+            return {
+                "segments": self.segments,
+                "lookups": self.lookups,
+                "avg_lookup_ms": (
+                    self.lookup_seconds / self.lookups * 1000 if self.lookups else None
+                ),
+                "matches": self.matches,
+                "reused": self.reused,
+                "offered": self.offered,
+                "reuse_rate": self.reused / self.lookups if self.lookups else 0.0,
+            }
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,361 @@
+"""Shared translator service over HTTP.
+
+One process per host serves every local tool from a single translation
+engine, connection pool and cache. Endpoints (JSON unless noted):
+
+    POST /translate  {"text", "source"="auto", "target"} -> {"translation", ...}
+    POST /detect     {"text"}                            -> {"language", "name"}
+    GET  /languages                                      -> language catalog
+    POST /tts        {"text", "lang"}                    -> audio/mpeg
+    GET  /stats                                          -> engine counters
+    GET  /metrics                                        -> Prometheus text
+
+Usage: python google_translator.py --serve [--host 127.0.0.1] [--port 8765]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import threading
+import time
+
+import languages
+from metrics import METRICS, start_json_log
+from providers import load_providers
+from translation_engine import TranslationEngine
+from translation_service import TranslationService
+from tts_cache import AudioCache
+
+MAX_BODY_BYTES = 1024 * 1024
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    504: "Gateway Timeout",
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class TranslationServer:
+    """Minimal HTTP/1.1 keep-alive server on an asyncio event loop.
+
+    Requests are parsed with asyncio streams; the blocking provider calls go
+    through a TranslationEngine bound to the same loop, so the concurrency
+    limits and the translation cache are shared by every client.
+    """
+
+    def __init__(
+        self,
+        service=None,
+        providers=None,
+        catalog=None,
+        audio_cache=None,
+        host="127.0.0.1",
+        port=8765,
+        request_timeout=30,
+        limits=None,
+        refresh_catalog=True,
+    ):
+        self.providers = providers or load_providers()
+        self.service = service or TranslationService(pool=self.providers.translator)
+        self.catalog = (
+            catalog or languages.load_cached_catalog() or languages.fallback_catalog()
+        )
+        self.audio_cache = audio_cache
+        # synthesize runs on engine threads; only one of them creates the cache
+        self._audio_cache_lock = threading.Lock()
+        self.host = host
+        self.port = port
+        self.request_timeout = request_timeout
+        self.limits = limits
+        self.refresh_catalog = refresh_catalog
+        self.engine = None
+        self.server = None
+        self.requests = 0
+        self.errors = 0
+        self.routes = {
+            ("POST", "/translate"): self.handle_translate,
+            ("POST", "/detect"): self.handle_detect,
+            ("GET", "/languages"): self.handle_languages,
+            ("POST", "/tts"): self.handle_tts,
+            ("GET", "/stats"): self.handle_stats,
+            ("GET", "/metrics"): self.handle_metrics,
+        }
+
+    # ----------------------- LIFECYCLE -----------------------
+    async def start(self):
+        self.engine = TranslationEngine(
+            self.service,
+            synthesize=self.synthesize,
+            limits=self.limits,
+            loop=asyncio.get_running_loop(),
+        )
+        self.server = await asyncio.start_server(
+            self.handle_connection, self.host, self.port
+        )
+        # Port 0 picks a free port; report the real one
+        self.port = self.server.sockets[0].getsockname()[1]
+        if self.refresh_catalog:
+            asyncio.get_running_loop().create_task(self.update_catalog())
+        return self
+
+    async def serve_forever(self):
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.engine is not None:
+            self.engine.close()
+        if self.audio_cache is not None:
+            self.audio_cache.close()
+        self.service.close()
+
+    async def update_catalog(self):
+        """Refresh the language list in the background and cache it on disk"""
+        loop = asyncio.get_running_loop()
+        try:
+            catalog = await loop.run_in_executor(None, languages.fetch_catalog)
+        except Exception as e:
+            print(f"Could not refresh languages: {e}")
+            return
+        if catalog != self.catalog:
+            self.catalog = catalog
+            try:
+                languages.save_catalog(catalog)
+            except OSError as e:
+                print(f"Could not cache language list: {e}")
+
+    # ----------------------- HTTP -----------------------
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    await self.respond(writer, 400, {"error": "Headers too large"})
+                    break
+
+                try:
+                    method, path, version, headers = self.parse_head(head)
+                    length = int(headers.get("content-length", 0))
+                    if length < 0:
+                        raise ValueError("negative Content-Length")
+                except ValueError:
+                    await self.respond(writer, 400, {"error": "Malformed request"})
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self.respond(writer, 413, {"error": "Body too large"})
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                keep_alive = headers.get("connection", "").lower() != "close" and (
+                    version == "HTTP/1.1"
+                )
+                status, payload, content_type = await self.dispatch(method, path, body)
+                await self.respond(writer, status, payload, content_type, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def parse_head(head):
+        lines = head.decode("latin-1").split("\r\n")
+        method, target, version = lines[0].split(" ", 2)
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+        return method.upper(), target.split("?", 1)[0], version, headers
+
+    async def dispatch(self, method, path, body):
+        self.requests += 1
+        handler = self.routes.get((method, path))
+        try:
+            if handler is None:
+                if any(route_path == path for _, route_path in self.routes):
+                    raise HTTPError(405, f"{method} not allowed on {path}")
+                raise HTTPError(404, f"No such endpoint: {path}")
+            request = self.parse_json(body) if method == "POST" else {}
+            with METRICS.span("http" + path.replace("/", ".")):
+                result = await asyncio.wait_for(handler(request), self.request_timeout)
+        except HTTPError as e:
+            return self.error(path, e.status, e.message)
+        except asyncio.TimeoutError:
+            return self.error(path, 504, "Upstream timed out")
+        except Exception as e:
+            return self.error(path, 500, str(e))
+        METRICS.inc("http_requests", path=path, status=200)
+        if isinstance(result, bytes):
+            METRICS.inc("http_audio_bytes", len(result))
+            return 200, result, "audio/mpeg"
+        if isinstance(result, str):
+            return 200, result, "text/plain; version=0.0.4"
+        return 200, result, "application/json"
+
+    def error(self, path, status, message):
+        self.errors += 1
+        METRICS.inc("http_requests", path=path, status=status)
+        return status, {"error": message}, "application/json"
+
+    async def respond(
+        self, writer, status, payload, content_type="application/json", keep_alive=True
+    ):
+        if content_type == "application/json":
+            payload = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            content_type = "application/json; charset=utf-8"
+        elif isinstance(payload, str):
+            payload = payload.encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {REASONS.get(status, 'OK')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + payload)
+        await writer.drain()
+
+    @staticmethod
+    def parse_json(body):
+        try:
+            request = json.loads(body or b"{}")
+        except ValueError:
+            raise HTTPError(400, "Body must be JSON")
+        if not isinstance(request, dict):
+            raise HTTPError(400, "Body must be a JSON object")
+        return request
+
+    # ----------------------- ENDPOINTS -----------------------
+    def resolve_language(self, value, allow_auto=False):
+        code = self.catalog.code(str(value))
+        if code is None or (code == "auto" and not allow_auto):
+            raise HTTPError(400, f"Unsupported language: {value}")
+        return code
+
+    @staticmethod
+    def require_text(request):
+        text = request.get("text")
+        if not isinstance(text, str) or not text.strip():
+            raise HTTPError(400, "'text' must be a non-empty string")
+        return text
+
+    async def handle_translate(self, request):
+        text = self.require_text(request)
+        if "target" not in request:
+            raise HTTPError(400, "'target' is required")
+        source_code = self.resolve_language(
+            request.get("source", "auto"), allow_auto=True
+        )
+        target_code = self.resolve_language(request["target"])
+        translation = await self.engine.translate(text, source_code, target_code)
+        return {
+            "translation": translation,
+            "source": source_code,
+            "target": target_code,
+        }
+
+    async def handle_detect(self, request):
+        text = self.require_text(request)
+        detected = await self.engine.detect(text)
+        return {"language": detected, "name": self.catalog.display_name(detected)}
+
+    async def handle_languages(self, request):
+        return {
+            "languages": [
+                {
+                    "code": code,
+                    "name": self.catalog.display_name(code),
+                    **capabilities,
+                }
+                for code, capabilities in sorted(self.catalog.capabilities.items())
+            ]
+        }
+
+    async def handle_tts(self, request):
+        text = self.require_text(request)
+        lang_code = self.resolve_language(request.get("lang", "en"))
+        if not self.catalog.supports(lang_code, "tts"):
+            raise HTTPError(400, f"Text-to-speech not available for {lang_code}")
+        return await self.engine.synthesize(text, lang_code)
+
+    async def handle_stats(self, request):
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "engine": self.engine.stats(),
+            "cache": self.service.cache.stats(),
+        }
+
+    async def handle_metrics(self, request):
+        return METRICS.prometheus_text()
+
+    def synthesize(self, text, lang_code):
+        """Return MP3 bytes for text, synthesizing on a cache miss"""
+        with self._audio_cache_lock:
+            if self.audio_cache is None:
+                self.audio_cache = AudioCache()
+
+        def synthesize(path):
+            with METRICS.span("tts.synthesize"):
+                self.providers.tts.synthesize(text, lang_code, path)
+            METRICS.inc("tts_bytes", os.path.getsize(path))
+
+        path = self.audio_cache.get_or_create(text, lang_code, False, synthesize)
+        with open(path, "rb") as f:
+            return f.read()
+
+
+# ----------------------- ENTRY POINT -----------------------
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="google_translator.py --serve",
+        description="Serve translate, detect, languages and TTS over HTTP.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    return parser
+
+
+async def serve(host, port):
+    server = await TranslationServer(host=host, port=port).start()
+    print(f"Translator service listening on http://{server.host}:{server.port}")
+    started = time.perf_counter()
+    metrics_log = start_json_log()
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+        if metrics_log is not None:
+            metrics_log.stop()
+        print(
+            f"Served {server.requests} requests in "
+            f"{time.perf_counter() - started:.0f}s"
+        )
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
@@ -0,0 +1,106 @@
+from translation_cache import TranslationCache
+from providers import load_providers
+from request_coalescer import RequestCoalescer
+from resilience import ResilientCaller
+from text_chunker import translate_chunks
+from metrics import METRICS
+
+
+class TranslationService:
+    """Tk-free translation path shared by the app and the headless tools.
+
+    Works on language codes; name lookup is left to the caller. ``pool`` is
+    any translator provider (see providers.py). Short texts go straight
+    through the cache and the provider, long ones are split
+    into sentence chunks translated in parallel. Cache misses go through a
+    coalescer that shares identical in-flight requests and batches short
+    ones under load; every upstream call is rate limited, retried and
+    guarded by a circuit breaker. With a ``memory`` (TranslationMemory),
+    a segment that differs from an earlier one only in its numbers is
+    answered from memory, and every upstream result is stored there.
+    """
+
+    def __init__(
+        self,
+        cache=None,
+        pool=None,
+        chunk_size=1500,
+        chunk_workers=4,
+        coalescer=None,
+        guard=None,
+        memory=None,
+    ):
+        self.cache = cache if cache is not None else TranslationCache()
+        self.pool = pool if pool is not None else load_providers().translator
+        self.guard = guard if guard is not None else ResilientCaller()
+        self.coalescer = (
+            coalescer
+            if coalescer is not None
+            else RequestCoalescer(self.translate_upstream, max_batch_chars=chunk_size)
+        )
+        self.chunk_size = chunk_size  # characters per upstream request
+        self.chunk_workers = chunk_workers
+        self.memory = memory
+
+    def translate_upstream(self, text, source_code, target_code):
+        METRICS.inc("upstream_chars", len(text))
+        with METRICS.span("translate.upstream"):
+            return self.guard.call(self.pool.translate, text, source_code, target_code)
+
+    def translate_piece(self, text, source_code, target_code):
+        """Translate one upstream-sized piece of text, using the cache"""
+        # Serve repeated phrases from the cache instead of the network
+        cached = self.cache.get(source_code, target_code, text)
+        if cached is not None:
+            METRICS.inc("cache_hits")
+            return cached
+        METRICS.inc("cache_misses")
+
+        if self.memory is not None:
+            reused = self.memory.reuse(text, target_code)
+            if reused is not None:
+                self.cache.put(source_code, target_code, text, reused)
+                return reused
+
+        translated = self.coalescer.translate(text, source_code, target_code)
+        self.cache.put(source_code, target_code, text, translated)
+        if self.memory is not None:
+            self.memory.add(source_code, target_code, text, translated)
+        return translated
+
+    def translate(
+        self, text, source_code, target_code, on_progress=None, cancelled=None
+    ):
+        if not text.strip():
+            return ""
+
+        METRICS.inc("translations")
+        with METRICS.span("translate"):
+            return self._translate(
+                text, source_code, target_code, on_progress, cancelled
+            )
+
+    def _translate(self, text, source_code, target_code, on_progress, cancelled):
+        if len(text) <= self.chunk_size:
+            return self.translate_piece(text, source_code, target_code)
+
+        # Long texts are split on sentence boundaries and translated in parallel
+        return translate_chunks(
+            text,
+            lambda chunk: self.translate_piece(chunk, source_code, target_code),
+            max_chars=self.chunk_size,
+            max_workers=self.chunk_workers,
+            on_progress=on_progress,
+            cancelled=cancelled,
+        )
+
+    def detect(self, text):
+        with METRICS.span("detect.remote"):
+            return self.guard.call(self.pool.detect, text)
+
+    def close(self):
+        self.guard.close()
+        self.cache.close()
+        if self.memory is not None:
+            self.memory.close()
+        self.pool.close()
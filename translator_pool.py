@@ -0,0 +1,139 @@
+import threading
+from contextlib import contextmanager
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+DETECT_URL = "https://translate.googleapis.com/translate_a/single"
+
+
+# The pool whose client the current thread has checked out
+_checked_out = threading.local()
+_install_lock = threading.Lock()
+
+
+class _SessionRequests:
+    """Stand-in for the ``requests`` module that routes GETs through a session.
+
+    deep_translator calls ``requests.get`` directly, which opens a fresh
+    connection for every translation. Swapping the module reference for this
+    object (once, for all pools) sends each GET through the session of the
+    pool whose client the calling thread has checked out, reusing its
+    keep-alive connections and adding its timeout, which deep_translator
+    leaves unset. Outside a checkout it behaves like plain ``requests``.
+    """
+
+    def get(self, url, **kwargs):
+        pool = getattr(_checked_out, "pool", None)
+        if pool is None:
+            return requests.get(url, **kwargs)
+        kwargs.setdefault("timeout", pool.timeout)
+        response = pool.session.get(url, **kwargs)
+        _checked_out.response = response
+        return response
+
+    def __getattr__(self, name):
+        return getattr(requests, name)
+
+
+def _install(google_module):
+    with _install_lock:
+        if not isinstance(google_module.requests, _SessionRequests):
+            google_module.requests = _SessionRequests()
+
+
+class TranslatorPool:
+    """Thread-safe registry of reusable GoogleTranslator clients.
+
+    Clients are pooled per (source, target) pair and checked out one caller
+    at a time, because a GoogleTranslator keeps per-request state on the
+    instance. All clients share a single keep-alive HTTP session.
+    ``base_url``/``detect_url`` point the clients at another upstream, such
+    as a local stand-in for load tests.
+    """
+
+    def __init__(
+        self, max_connections=10, timeout=10, base_url=None, detect_url=DETECT_URL
+    ):
+        self.timeout = timeout
+        self.base_url = base_url
+        self.detect_url = detect_url
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_connections)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._idle = {}
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+
+    def _new_client(self, source, target):
+        # deep_translator (and bs4) are imported on first use to speed up startup
+        import deep_translator.google as google_module
+
+        _install(google_module)
+        translator = google_module.GoogleTranslator(source=source, target=target)
+        if self.base_url:
+            translator._base_url = self.base_url
+        return translator
+
+    @contextmanager
+    def client(self, source, target):
+        """Check out a translator for (source, target) and return it afterwards"""
+        key = (source, target)
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if idle:
+                translator = idle.pop()
+                self.reused += 1
+            else:
+                translator = None
+
+        if translator is None:
+            with self._lock:
+                translator = self._new_client(source, target)
+                self.created += 1
+
+        previous = getattr(_checked_out, "pool", None)
+        _checked_out.pool = self
+        try:
+            yield translator
+        finally:
+            _checked_out.pool = previous
+            with self._lock:
+                self._idle[key].append(translator)
+
+    def translate(self, text, source, target):
+        with self.client(source, target) as translator:
+            _checked_out.response = None
+            try:
+                return translator.translate(text)
+            except Exception as e:
+                # deep_translator's errors carry no status; attach the reply
+                # so retries can tell a 5xx from a bad request
+                if getattr(e, "response", None) is None:
+                    e.response = _checked_out.response
+                raise
+
+    def detect(self, text):
+        """Detect the language code of text over the shared session"""
+        response = self.session.get(
+            self.detect_url,
+            params={"client": "gtx", "sl": "auto", "tl": "en", "dt": "t", "q": text},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return response.json()[2]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "clients_created": self.created,
+                "clients_reused": self.reused,
+                "idle_clients": sum(len(v) for v in self._idle.values()),
+            }
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,157 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+from app_paths import cache_path
+
+
+class AudioCache:
+    """Content-addressed on-disk cache of synthesized speech.
+
+    Clips are stored as ``<sha256 of (text, lang, slow)>.mp3`` and tracked in
+    a JSON index that survives restarts. When the total size exceeds
+    ``max_bytes`` the least recently played clips are deleted.
+    """
+
+    def __init__(self, directory=None, max_bytes=100 * 1024 * 1024):
+        self.directory = directory or cache_path("tts")
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(self.directory, "index.json")
+        os.makedirs(self.directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._index = self._load_index()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(text, lang_code, slow=False):
+        payload = json.dumps([text, lang_code, bool(slow)], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".mp3")
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = {}
+        # Forget entries whose files were removed behind our back
+        return {
+            key: entry
+            for key, entry in index.items()
+            if os.path.exists(self._path(key))
+        }
+
+    def _save_index(self):
+        tmp = self.index_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._index, f)
+        os.replace(tmp, self.index_path)
+
+    def get(self, text, lang_code, slow=False):
+        """Return the path of a cached clip, or None"""
+        key = self.make_key(text, lang_code, slow)
+        with self._lock:
+            entry = self._index.get(key)
+            path = self._path(key)
+            if entry is None or not os.path.exists(path):
+                self._index.pop(key, None)
+                self.misses += 1
+                return None
+            entry["accessed"] = time.time()
+            self.hits += 1
+            return path
+
+    def put(self, text, lang_code, slow, synthesize):
+        """Create a clip with ``synthesize(path)`` and add it to the cache"""
+        key = self.make_key(text, lang_code, slow)
+        path = self._path(key)
+        tmp = path + f".{threading.get_ident()}.part"
+        try:
+            synthesize(tmp)
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+        with self._lock:
+            self._index[key] = {
+                "size": os.path.getsize(path),
+                "accessed": time.time(),
+            }
+            self._evict(keep=key)
+            self._save_index()
+        return path
+
+    def get_or_create(self, text, lang_code, slow, synthesize):
+        path = self.get(text, lang_code, slow)
+        if path is None:
+            path = self.put(text, lang_code, slow, synthesize)
+        return path
+
+    def get_or_create_bytes(self, text, lang_code, slow, synthesize):
+        """Clip bytes, from the cache or from ``synthesize()`` on a miss.
+
+        New clips are returned straight from memory; saving them for next
+        time is best effort.
+        """
+        path = self.get(text, lang_code, slow)
+        if path is not None:
+            try:
+                with open(path, "rb") as f:
+                    return f.read()
+            except OSError:
+                pass
+        data = synthesize()
+
+        def write(tmp):
+            with open(tmp, "wb") as f:
+                f.write(data)
+
+        try:
+            self.put(text, lang_code, slow, write)
+        except OSError:
+            pass
+        return data
+
+    def _evict(self, keep=None):
+        total = sum(entry["size"] for entry in self._index.values())
+        if total <= self.max_bytes:
+            return
+        for key in sorted(self._index, key=lambda k: self._index[k]["accessed"]):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                # Still open by the player; try again on a later eviction
+                continue
+            total -= self._index.pop(key)["size"]
+
+    def total_bytes(self):
+        with self._lock:
+            return sum(entry["size"] for entry in self._index.values())
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._index),
+                "bytes": sum(entry["size"] for entry in self._index.values()),
+            }
+
+    def close(self):
+        """Persist access times so LRU order survives restarts"""
+        with self._lock:
+            try:
+                self._save_index()
+            except OSError:
+                pass
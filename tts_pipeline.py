@@ -0,0 +1,258 @@
+import queue
+import threading
+import time
+
+from text_chunker import split_sentences
+
+_END = object()
+
+
+class _BaseSession:
+    """What every run of the pipeline tracks: its input, timings and counters"""
+
+    def __init__(self, sentences, lang_code, synthesize, on_error, on_done):
+        self.sentences = sentences
+        self.lang_code = lang_code
+        self.synthesize = synthesize
+        self.on_error = on_error
+        self.on_done = on_done
+        self.cancelled = threading.Event()
+
+        self.started = time.perf_counter()
+        self.first_audio = None
+        self.finished = None
+        self.synth_seconds = 0.0
+        self.synth_chars = 0
+
+    def _synthesize_timed(self, sentence):
+        start = time.perf_counter()
+        clip = self.synthesize(sentence, self.lang_code)
+        self.synth_seconds += time.perf_counter() - start
+        self.synth_chars += len(sentence)
+        return clip
+
+    def stats(self):
+        return {
+            "sentences": len(self.sentences),
+            "time_to_first_audio": (
+                self.first_audio - self.started if self.first_audio else None
+            ),
+            "total_time": self.finished - self.started if self.finished else None,
+            "synth_chars_per_second": (
+                self.synth_chars / self.synth_seconds if self.synth_seconds else None
+            ),
+            "cancelled": self.cancelled.is_set(),
+        }
+
+
+class SpeechSession(_BaseSession):
+    """One run of the pipeline: a synthesis thread feeding a playback thread"""
+
+    def __init__(
+        self, sentences, lang_code, synthesize, play, lookahead, on_error, on_done
+    ):
+        super().__init__(sentences, lang_code, synthesize, on_error, on_done)
+        self.play = play
+        self.clips = queue.Queue(maxsize=lookahead)
+
+        self._synth_thread = threading.Thread(target=self._synthesize_all, daemon=True)
+        self._play_thread = threading.Thread(target=self._play_all, daemon=True)
+
+    def start(self):
+        self._synth_thread.start()
+        self._play_thread.start()
+
+    def cancel(self):
+        self.cancelled.set()
+        # Unblock a synthesizer waiting for room in the queue
+        try:
+            while True:
+                self.clips.get_nowait()
+        except queue.Empty:
+            pass
+
+    def _put(self, item):
+        while not self.cancelled.is_set():
+            try:
+                self.clips.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _synthesize_all(self):
+        for sentence in self.sentences:
+            if self.cancelled.is_set():
+                break
+            try:
+                clip = self._synthesize_timed(sentence)
+            except Exception as e:
+                self.on_error(e)
+                break
+            if not self._put(clip):
+                break
+        self._put(_END)
+
+    def _play_all(self):
+        try:
+            while not self.cancelled.is_set():
+                try:
+                    clip = self.clips.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if clip is _END:
+                    break
+                if self.first_audio is None:
+                    self.first_audio = time.perf_counter()
+                self.play(clip, self.cancelled)
+        except Exception as e:
+            self.on_error(e)
+        finally:
+            self.finished = time.perf_counter()
+            self.on_done(self)
+
+    def join(self, timeout=None):
+        self._play_thread.join(timeout)
+
+
+class PlayerSpeechSession(_BaseSession):
+    """A run that hands clips to an AudioPlayer instead of playing them.
+
+    The player preloads the clip after the playing one and starts it
+    without a gap; synthesis stays at most ``lookahead`` clips ahead of it.
+    The session is done when its last clip ends or it is cancelled.
+    """
+
+    def __init__(
+        self, sentences, lang_code, synthesize, player, lookahead, on_error, on_done
+    ):
+        super().__init__(sentences, lang_code, synthesize, on_error, on_done)
+        self.player = player
+        self.lookahead = lookahead
+        self._room = threading.Condition()
+        self._pending = 0  # clips handed to the player and not yet ended
+        self._synthesized_all = False
+        self._done = threading.Event()
+
+        self._synth_thread = threading.Thread(target=self._synthesize_all, daemon=True)
+
+    def start(self):
+        self._synth_thread.start()
+
+    def cancel(self):
+        # Under the lock, so no clip is enqueued after the stop below
+        with self._room:
+            self.cancelled.set()
+            self._room.notify_all()
+            self.player.stop(tag=self)
+
+    def _synthesize_all(self):
+        for sentence in self.sentences:
+            with self._room:
+                while self._pending > self.lookahead and not self.cancelled.is_set():
+                    self._room.wait()
+            if self.cancelled.is_set():
+                break
+            try:
+                clip = self._synthesize_timed(sentence)
+            except Exception as e:
+                self.on_error(e)
+                break
+            with self._room:
+                if self.cancelled.is_set():
+                    break
+                self._pending += 1
+                self.player.enqueue(
+                    clip, tag=self, on_start=self._on_start, on_end=self._on_end
+                )
+        with self._room:
+            self._synthesized_all = True
+            idle = self._pending == 0
+        if idle:
+            self._finish()
+
+    def _on_start(self, clip):
+        if self.first_audio is None:
+            self.first_audio = time.perf_counter()
+
+    def _on_end(self, completed):
+        with self._room:
+            self._pending -= 1
+            self._room.notify_all()
+            idle = self._synthesized_all and self._pending == 0
+        if idle:
+            self._finish()
+
+    def _finish(self):
+        self.finished = time.perf_counter()
+        self.on_done(self)
+        self._done.set()
+
+    def join(self, timeout=None):
+        self._done.wait(timeout)
+
+
+class SpeechPipeline:
+    """Sentence-level streaming text-to-speech.
+
+    Text is split into sentences. The first sentence starts playing as soon
+    as it is synthesized while the following ones are synthesized ahead on a
+    worker, up to ``lookahead`` clips, so playback runs without gaps.
+    ``synthesize(sentence, lang_code)`` returns a clip and
+    ``play(clip, cancelled)`` must block until the clip ends or the
+    ``cancelled`` event is set. With a ``player`` (an AudioPlayer) clips are
+    enqueued on it instead and ``play`` is not used. Starting a new run or
+    calling ``stop`` cancels pending synthesis and playback.
+    """
+
+    def __init__(self, synthesize, play=None, lookahead=2, on_error=None, player=None):
+        self.synthesize = synthesize
+        self.play = play
+        self.player = player
+        self.lookahead = lookahead
+        self.on_error = on_error or (lambda e: print(f"Speech error: {e}"))
+        self.current = None
+        self.last_stats = None
+        self._lock = threading.Lock()
+
+    def speak(self, text, lang_code, on_done=None):
+        """Start speaking text, interrupting anything already playing"""
+        sentences = split_sentences(text)
+
+        def done(session):
+            self.last_stats = session.stats()
+            if on_done:
+                on_done(session)
+
+        if self.player is not None:
+            session = PlayerSpeechSession(
+                sentences,
+                lang_code,
+                self.synthesize,
+                self.player,
+                self.lookahead,
+                self.on_error,
+                done,
+            )
+        else:
+            session = SpeechSession(
+                sentences,
+                lang_code,
+                self.synthesize,
+                self.play,
+                self.lookahead,
+                self.on_error,
+                done,
+            )
+        with self._lock:
+            if self.current is not None:
+                self.current.cancel()
+            self.current = session
+        session.start()
+        return session
+
+    def stop(self):
+        with self._lock:
+            if self.current is not None:
+                self.current.cancel()
+                self.current = None
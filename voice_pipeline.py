@@ -0,0 +1,458 @@
+import json
+import math
+import os
+import sys
+import threading
+import time
+import wave
+from array import array
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from app_paths import cache_path
+
+CALIBRATION_FILE = "voice_calibration.json"
+
+_SAMPLE_TYPES = {2: "h", 4: "i"}  # sample width in bytes -> array typecode
+
+
+def frame_energy(frame, sample_width):
+    """RMS energy of a mono little-endian PCM frame"""
+    samples = array(_SAMPLE_TYPES[sample_width], frame)
+    if sys.byteorder == "big":
+        samples.byteswap()
+    if not samples:
+        return 0.0
+    return math.sqrt(sum(s * s for s in samples) / len(samples))
+
+
+# ----------------------- AUDIO SOURCES -----------------------
+class MicrophoneSource:
+    """The default microphone through SpeechRecognition/PyAudio"""
+
+    def __init__(self, sample_rate=16000):
+        self.requested_rate = sample_rate
+        self._mic = None
+
+    def open(self):
+        import speech_recognition as sr
+
+        self._mic = sr.Microphone(sample_rate=self.requested_rate)
+        self._mic.__enter__()
+        if self._mic.stream is None:
+            raise OSError("Could not open the microphone")
+        self.sample_rate = self._mic.SAMPLE_RATE
+        self.sample_width = self._mic.SAMPLE_WIDTH
+
+    def read(self, frames):
+        return self._mic.stream.read(frames)
+
+    def close(self):
+        if self._mic is not None:
+            self._mic.__exit__(None, None, None)
+            self._mic = None
+
+
+class WavFileSource:
+    """A recorded mono 16/32-bit WAV file standing in for the microphone.
+
+    With ``realtime`` the reads are paced like a live stream; otherwise the
+    file is consumed as fast as possible. ``read`` returns b"" at the end.
+    """
+
+    def __init__(self, path, realtime=False):
+        self.path = path
+        self.realtime = realtime
+        self._wave = None
+
+    def open(self):
+        self._wave = wave.open(self.path, "rb")
+        if self._wave.getnchannels() != 1:
+            raise ValueError(f"{self.path}: only mono WAV files are supported")
+        self.sample_rate = self._wave.getframerate()
+        self.sample_width = self._wave.getsampwidth()
+        if self.sample_width not in _SAMPLE_TYPES:
+            raise ValueError(f"{self.path}: only 16- or 32-bit samples are supported")
+        self._started = time.perf_counter()
+        self._position = 0
+
+    def read(self, frames):
+        data = self._wave.readframes(frames)
+        self._position += len(data) // self.sample_width
+        if self.realtime:
+            due = self._started + self._position / self.sample_rate
+            time.sleep(max(0.0, due - time.perf_counter()))
+        return data
+
+    def close(self):
+        if self._wave is not None:
+            self._wave.close()
+            self._wave = None
+
+
+# ----------------------- CALIBRATION -----------------------
+class Calibration:
+    """Noise floor and speech threshold, kept up to date and saved to disk.
+
+    The noise floor follows the energy of non-speech frames (exponential
+    moving average) and the threshold sits ``ratio`` times above it, so the
+    first press after a restart needs no calibration pause.
+    """
+
+    def __init__(self, path=None, ratio=2.5, min_threshold=120.0, smoothing=0.02):
+        self.path = path or cache_path(CALIBRATION_FILE)
+        self.ratio = ratio
+        self.min_threshold = min_threshold
+        self.smoothing = smoothing
+        self.noise_floor = None
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self.noise_floor = float(json.load(f)["noise_floor"])
+        except (OSError, ValueError, KeyError, TypeError):
+            self.noise_floor = None
+
+    def save(self):
+        if self.noise_floor is None:
+            return
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"noise_floor": self.noise_floor, "updated": time.time()}, f)
+        os.replace(tmp, self.path)
+
+    @property
+    def calibrated(self):
+        return self.noise_floor is not None
+
+    @property
+    def threshold(self):
+        return max(self.min_threshold, (self.noise_floor or 0.0) * self.ratio)
+
+    def calibrate(self, energies):
+        """Set the noise floor from a short sample of background frames"""
+        if energies:
+            self.noise_floor = sum(energies) / len(energies)
+
+    def observe_noise(self, energy):
+        if self.noise_floor is None:
+            self.noise_floor = energy
+        else:
+            self.noise_floor += (energy - self.noise_floor) * self.smoothing
+
+
+# ----------------------- SEGMENTATION -----------------------
+class Segment:
+    def __init__(self, data, sample_rate, sample_width, start, end, ended_at):
+        self.data = data
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.start = start  # seconds into the stream, including pre-roll
+        self.end = end  # last loud frame, before the trailing silence
+        self.ended_at = ended_at  # perf_counter when the end was detected
+
+    @property
+    def duration(self):
+        return self.end - self.start
+
+
+class VoiceActivitySegmenter:
+    """Energy-based voice activity detection that cuts a stream into phrases.
+
+    Speech starts after ``start_ms`` of consecutive loud frames (with
+    ``pre_roll_ms`` of audio kept from before the onset) and ends after
+    ``hangover_ms`` of silence. Phrases shorter than ``min_speech_ms`` are
+    dropped as clicks; phrases longer than ``max_segment_s`` are cut so
+    recognition never waits for a pause that does not come.
+    """
+
+    def __init__(
+        self,
+        sample_rate,
+        sample_width,
+        frame_ms=30,
+        start_ms=90,
+        hangover_ms=600,
+        pre_roll_ms=300,
+        min_speech_ms=250,
+        max_segment_s=15.0,
+    ):
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.frame_s = frame_ms / 1000
+        self.start_frames = max(1, start_ms // frame_ms)
+        self.hangover_frames = max(1, hangover_ms // frame_ms)
+        self.min_speech_frames = max(1, min_speech_ms // frame_ms)
+        self.max_frames = int(max_segment_s / self.frame_s)
+        self._pre_roll = deque(maxlen=max(1, pre_roll_ms // frame_ms))
+        self._frames = []
+        self._speech_frames = 0
+        self._silence = 0
+        self._onset = 0
+        self._position = 0  # frames seen
+        self.in_speech = False
+
+    def feed(self, frame, is_speech):
+        """Add one frame; returns a finished Segment or None"""
+        self._position += 1
+        if not self.in_speech:
+            self._pre_roll.append(frame)
+            self._onset = self._onset + 1 if is_speech else 0
+            if self._onset >= self.start_frames:
+                self.in_speech = True
+                self._frames = list(self._pre_roll)
+                self._pre_roll.clear()
+                self._speech_frames = self._onset
+                self._silence = 0
+            return None
+
+        self._frames.append(frame)
+        if is_speech:
+            self._speech_frames += 1
+            self._silence = 0
+        else:
+            self._silence += 1
+        if (
+            self._silence >= self.hangover_frames
+            or len(self._frames) >= self.max_frames
+        ):
+            return self._finish()
+        return None
+
+    def advance(self, frames=1):
+        """Account for frames read but not fed (calibration, paused)"""
+        self._position += frames
+
+    def flush(self):
+        """End any phrase in progress (end of stream or stop)"""
+        return self._finish() if self.in_speech else None
+
+    def _finish(self):
+        frames = self._frames
+        speech = self._speech_frames
+        silence = self._silence
+        self.in_speech = False
+        self._frames = []
+        self._onset = 0
+        self._speech_frames = 0
+        self._silence = 0
+        if speech < self.min_speech_frames:
+            return None
+        end = self._position * self.frame_s
+        return Segment(
+            b"".join(frames),
+            self.sample_rate,
+            self.sample_width,
+            end - len(frames) * self.frame_s,
+            end - silence * self.frame_s,
+            time.perf_counter(),
+        )
+
+
+# ----------------------- PIPELINE -----------------------
+class VoicePipeline:
+    """Continuous capture: VAD segments are recognized as soon as they end.
+
+    One background thread keeps the audio source open and classifies each
+    frame against the calibrated threshold; background frames keep the
+    noise floor current. While active, finished phrases go to
+    ``recognize(segment)`` on a small pool and ``on_text(text, segment)`` is
+    called in phrase order. ``stop`` pauses delivery but keeps the stream
+    open for ``idle_timeout`` seconds so the next start is instant.
+    ``open_source`` returns a MicrophoneSource, WavFileSource or any object
+    with ``open``/``read``/``close``.
+    """
+
+    def __init__(
+        self,
+        open_source,
+        recognize,
+        on_text,
+        on_error=None,
+        on_listening=None,
+        calibration=None,
+        frame_ms=30,
+        calibration_s=0.5,
+        idle_timeout=120.0,
+        recognizer_workers=2,
+        **segmenter_options,
+    ):
+        self.open_source = open_source
+        self.recognize = recognize
+        self.on_text = on_text
+        self.on_error = on_error or (lambda e: print(f"Voice input error: {e}"))
+        self.on_listening = on_listening or (lambda: None)
+        self.calibration = calibration if calibration is not None else Calibration()
+        self.frame_ms = frame_ms
+        self.calibration_s = calibration_s
+        self.idle_timeout = idle_timeout
+        self.segmenter_options = segmenter_options
+
+        self.active = False
+        self._inactive_since = time.monotonic()
+        self._closed = False
+        self._thread = None
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=recognizer_workers, thread_name_prefix="stt"
+        )
+        self._next_sequence = 0
+        self._deliver_sequence = 0
+        self._ready = {}
+
+        # Counters
+        self.segments = 0
+        self.recognized = 0
+        self.latencies = []  # end of speech -> text, seconds
+
+    def start(self):
+        """Start (or resume) delivering recognized phrases"""
+        with self._lock:
+            self.active = True
+            if self._thread is None or not self._thread.is_alive():
+                self._closed = False
+                self._thread = threading.Thread(target=self._capture, daemon=True)
+                self._thread.start()
+            elif self.calibration.calibrated:
+                self.on_listening()
+
+    def stop(self):
+        """Stop delivering phrases; the stream stays open until idle_timeout"""
+        with self._lock:
+            self.active = False
+            self._inactive_since = time.monotonic()
+
+    def close(self):
+        with self._lock:
+            self.active = False
+            self._closed = True
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout=2)
+        self._executor.shutdown(wait=False)
+        try:
+            self.calibration.save()
+        except OSError as e:
+            print(f"Could not save voice calibration: {e}")
+
+    def join(self, timeout=None):
+        """Wait for the capture thread and pending recognitions (WAV input)"""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        self._executor.shutdown(wait=True)
+
+    def _capture(self):
+        source = self.open_source()
+        try:
+            source.open()
+        except Exception as e:
+            self._unregister()
+            self.on_error(e)
+            return
+
+        try:
+            frames_per_read = int(source.sample_rate * self.frame_ms / 1000)
+            frame_bytes = frames_per_read * source.sample_width
+            segmenter = VoiceActivitySegmenter(
+                source.sample_rate,
+                source.sample_width,
+                frame_ms=self.frame_ms,
+                **self.segmenter_options,
+            )
+
+            if not self.calibration.calibrated:
+                # First run only; later runs reuse the saved noise floor
+                energies = []
+                for _ in range(int(self.calibration_s * 1000 / self.frame_ms)):
+                    frame = source.read(frames_per_read)
+                    if len(frame) < frame_bytes:
+                        break
+                    energies.append(frame_energy(frame, source.sample_width))
+                self.calibration.calibrate(energies)
+                segmenter.advance(len(energies))
+            self.on_listening()
+
+            while not self._closed:
+                if not self.active:
+                    if segmenter.in_speech:
+                        segmenter.flush()  # drop a phrase cut off by stop
+                    if time.monotonic() - self._inactive_since > self.idle_timeout:
+                        # Decided under the lock: a start() from now on sees
+                        # no capture thread and starts a new one
+                        with self._lock:
+                            if not self.active:
+                                self._thread = None
+                                break
+                frame = source.read(frames_per_read)
+                if len(frame) < frame_bytes:
+                    # End of a recorded file
+                    segment = segmenter.flush()
+                    if segment is not None and self.active:
+                        self._submit(segment)
+                    break
+
+                energy = frame_energy(frame, source.sample_width)
+                is_speech = energy > self.calibration.threshold
+                if not is_speech and not segmenter.in_speech:
+                    self.calibration.observe_noise(energy)
+                if not self.active:
+                    segmenter.advance()
+                    continue
+                segment = segmenter.feed(frame, is_speech)
+                if segment is not None:
+                    self._submit(segment)
+        except Exception as e:
+            self.on_error(e)
+        finally:
+            self._unregister()
+            source.close()
+
+    def _unregister(self):
+        """Mark capture stopped, unless start() has already replaced this thread"""
+        with self._lock:
+            if self._thread is threading.current_thread():
+                self._thread = None
+                self.active = False
+
+    def _submit(self, segment):
+        with self._lock:
+            sequence = self._next_sequence
+            self._next_sequence += 1
+            self.segments += 1
+        self._executor.submit(self._recognize, sequence, segment)
+
+    def _recognize(self, sequence, segment):
+        try:
+            text = self.recognize(segment)
+        except Exception as e:
+            text = None
+            if type(e).__name__ != "UnknownValueError":
+                # Unintelligible phrases (coughs, noise) are dropped quietly
+                self.on_error(e)
+        self._deliver(sequence, segment, text)
+
+    def _deliver(self, sequence, segment, text):
+        # Hand results over in phrase order even if recognitions overtake
+        with self._lock:
+            self._ready[sequence] = (segment, text)
+            ready = []
+            while self._deliver_sequence in self._ready:
+                ready.append(self._ready.pop(self._deliver_sequence))
+                self._deliver_sequence += 1
+        for segment, text in ready:
+            if text and text.strip():
+                self.recognized += 1
+                self.latencies.append(time.perf_counter() - segment.ended_at)
+                self.on_text(text, segment)
+
+    def stats(self):
+        latencies = sorted(self.latencies)
+        return {
+            "segments": self.segments,
+            "recognized": self.recognized,
+            "noise_floor": self.calibration.noise_floor,
+            "threshold": self.calibration.threshold,
+            "p50_end_to_text": latencies[len(latencies) // 2] if latencies else None,
+        }